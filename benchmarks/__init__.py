@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""학습 기록 프로그램 벤치마크 모음.
+
+workload.py 는 모든 벤치마크가 함께 쓰는 임의 기록 생성기이고, 나머지
+bench_*.py 는 저장소 루트에서 `python benchmarks/bench_xxx.py` 로 실행합니다.
+
+- bench_pipeline.py: 크기별 전체 파이프라인 시간, JSON 보고서, 기준선 회귀 검사
+- bench_startup.py: 첫 메뉴까지의 콜드 스타트 시간
+- bench_memory.py: 읽기 경로별 메모리 사용량
+- bench_sunburst.py: 선버스트 배열 생성
+- bench_reports.py: 학생별 보고서 처리량
+- bench_writers.py, bench_record_writer.py: 기록 추가 처리량
+"""
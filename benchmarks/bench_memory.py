@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""화면별 읽기 경로의 메모리 사용량 비교.
+
+임의의 학습 기록 CSV 를 임시 폴더에 만들고, 전체 기록을 읽는 load_data(), 같은
+기록을 메모리를 적게 쓰는 타입으로 읽는 load_compact_data(), 화면이 실제로 쓰는
+읽기(과목별·날짜별 누적 통계, 선버스트 배열)를 차례로 불러 결과의 크기와 읽는
+동안의 최대 할당량(tracemalloc)을 봅니다. 결과 크기는
+DataFrame 이면 memory_usage(deep=True), 아니면 JSON 으로 썼을 때의 바이트입니다.
+
+    python benchmarks/bench_memory.py --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sss  # noqa: E402
+import study_store  # noqa: E402
+from benchmarks.workload import write_synthetic_log  # noqa: E402
+
+
+def result_bytes(result):
+    if hasattr(result, "memory_usage"):
+        return int(result.memory_usage(deep=True).sum())
+    return len(json.dumps(result, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def measure(load):
+    """(결과 바이트, 최대 할당 바이트, 읽기 시간 초)."""
+    # tracemalloc 은 읽기를 느리게 하므로 시간은 따로 한 번 더 잽니다.
+    study_store._MEMO.clear()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    size = result_bytes(result)
+    del result
+    study_store._MEMO.clear()
+    tracemalloc.start()
+    load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, peak, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sss.DATA_FILE = os.path.join(tmp, "study_log.csv")
+        sss.STORE_DIR = study_store.store_dir_for(sss.DATA_FILE)
+        write_synthetic_log(sss.DATA_FILE, args.rows)
+        # 저장소를 먼저 만들어 두고 순수한 읽기만 잽니다.
+        study_store.sync_csv(sss.DATA_FILE, sss.STORE_DIR)
+        loaders = [
+            ("load_data()", sss.load_data),
+            (
+                "load_compact_data(with_content=True)",
+                lambda: sss.load_compact_data(with_content=True),
+            ),
+            ("load_compact_data()", sss.load_compact_data),
+            ("load_subject_stats()", sss.load_subject_stats),
+            ("load_daily_stats()", sss.load_daily_stats),
+            ("sunburst_payload()", sss.sunburst_payload),
+        ]
+        print(f"기록 수: {args.rows:,}")
+        baseline = None
+        for name, load in loaders:
+            size, peak, elapsed = measure(load)
+            baseline = baseline or size
+            print(
+                f"  {name:<38} 결과 {size / 2**20:8.1f} MiB"
+                f" ({size / baseline:5.1%}), 최대 할당 {peak / 2**20:8.1f} MiB,"
+                f" {elapsed * 1000:8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""학습 기록 파이프라인 전체 벤치마크: 크기별 단계 시간과 기준선 대비 회귀 검사.
+
+크기마다 임의의 기록(workload.write_synthetic_log)과 주간 목표를 임시 폴더에
+만들고, 메뉴 기능이 화면 입력 뒤에 하는 일을 화면 없이 차례로 잽니다.
+
+- load_data_cold: 저장소가 없을 때 load_data() (CSV 를 읽어 저장소를 만듦)
+- load_data: 저장소가 있을 때 load_data() (메모리 캐시는 비움)
+- add_record: add_study_record 의 저장 단계, 기록 한 건당 시간
+- load_data_after_add: 기록을 덧붙인 뒤 load_data() (덧붙은 부분만 따라잡음)
+- generate_feedback, check_goal_achievement: 메뉴 3, 5 (출력은 버림)
+- chart_sunburst: show_visualizations 1번 (선버스트 HTML 파일 쓰기까지)
+- chart_trend: show_visualizations 2번 (Agg 로 PNG 저장까지)
+- delete_record: delete_study_record 의 조회·삭제 표시 단계
+- load_data_after_delete: 삭제 표시 뒤 load_data()
+
+크기마다 --runs 번 새로 만들어 재고, 단계마다 그 중앙값을 씁니다. 결과는 JSON
+보고서로 저장하고, --baseline 을 주면 기준선과 비교해 같은 크기·단계의 시간이
+tolerance 넘게 늘어난 항목을 회귀로 보고하고 종료 코드 1 을 돌려줍니다. 값 없이
+--baseline 만 주면 저장소에 함께 두는 benchmarks/baseline.json 과 비교합니다.
+이 기준선은 한 기계에서 잰 값이므로, 다른 기계에서는 먼저 같은 기계의 보고서를
+만들어 그것과 비교합니다.
+
+    python benchmarks/bench_pipeline.py --sizes 10k 100k
+    python benchmarks/bench_pipeline.py --runs 5 --report benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --baseline
+    python benchmarks/bench_pipeline.py --sizes 10k --baseline bench.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from importlib import metadata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console  # noqa: E402
+
+import sss  # noqa: E402
+import study_records  # noqa: E402
+import study_store  # noqa: E402
+from benchmarks import workload  # noqa: E402
+
+DEFAULT_SIZES = ["10k", "100k"]
+BASELINE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baseline.json"
+)
+ADD_RECORDS = 100
+# 크기마다 재는 횟수. 단계별 시간은 그 중앙값입니다.
+DEFAULT_RUNS = 3
+# 기준선 대비 이만큼(비율) 넘게 느려지면 회귀로 봅니다.
+REGRESSION_TOLERANCE = 0.5
+# 이보다 짧은 단계는 측정 잡음이 커서 회귀 판정에서 뺍니다.
+MIN_COMPARE_SECONDS = 0.005
+PACKAGES = ["pandas", "numpy", "matplotlib", "plotly", "pyarrow", "rich"]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def _load_data():
+    # 같은 프로세스의 메모리 캐시 대신 저장소를 읽는 시간을 잽니다.
+    study_store._MEMO.clear()
+    return sss.load_data()
+
+
+def _add_records(count):
+    record = {
+        "날짜": datetime.now().strftime("%Y-%m-%d"),
+        "과목": "수학1",
+        "공부 시간(분)": 50.0,
+        "공부 내용": "벤치마크",
+        "집중도": 4,
+    }
+    for _ in range(count):
+        study_records.append_csv_records(sss.DATA_FILE, [record])
+
+
+def _sunburst_chart(chart_dir):
+    payload = sss.sunburst_payload()
+    return sss.write_chart_html(
+        lambda: sss.sunburst_figure(payload), payload, "study_chart", chart_dir
+    )
+
+
+def _trend_chart(path):
+    import matplotlib.pyplot as plt
+
+    resolution, totals = sss.trend_window()
+    fig = sss.trend_figure(sss.daily_study_stats(totals), resolution)
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def _delete_record(record_id):
+    record = study_store.lookup_record(sss.DATA_FILE, record_id)
+    study_store.delete_records(sss.DATA_FILE, [record["기록 ID"]])
+    study_store.needs_compaction(sss.DATA_FILE)
+
+
+def run_size(directory, rows, seed):
+    """기록 rows 건으로 모든 단계를 재고 {"rows", "csv_bytes", "timings"} 를 돌려줍니다."""
+    sss.DATA_FILE = os.path.join(directory, "study_log.csv")
+    sss.GOAL_FILE = os.path.join(directory, "study_goals.csv")
+    sss.STORE_DIR = study_store.store_dir_for(sss.DATA_FILE)
+    generate_s, _ = timed(
+        lambda: workload.write_synthetic_log(sss.DATA_FILE, rows, seed)
+    )
+    workload.write_synthetic_goals(sss.GOAL_FILE, rows, seed)
+    csv_bytes = os.path.getsize(sss.DATA_FILE)
+
+    timings = {}
+    timings["load_data_cold"], _ = timed(_load_data)
+    timings["load_data"], _ = timed(_load_data)
+    add_s, _ = timed(lambda: _add_records(ADD_RECORDS))
+    timings["add_record"] = add_s / ADD_RECORDS
+    timings["load_data_after_add"], _ = timed(_load_data)
+    timings["generate_feedback"], _ = timed(sss.generate_feedback)
+    timings["check_goal_achievement"], _ = timed(sss.check_goal_achievement)
+    chart_dir = os.path.join(directory, "charts")
+    timings["chart_sunburst"], _ = timed(lambda: _sunburst_chart(chart_dir))
+    png_path = os.path.join(directory, "study_trend.png")
+    timings["chart_trend"], _ = timed(lambda: _trend_chart(png_path))
+    timings["delete_record"], _ = timed(lambda: _delete_record(rows // 2))
+    timings["load_data_after_delete"], _ = timed(_load_data)
+    return {
+        "rows": rows,
+        "csv_bytes": csv_bytes,
+        "generate_seconds": generate_s,
+        "timings": timings,
+    }
+
+
+def _package_versions():
+    versions = {}
+    for name in PACKAGES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def run_size_median(rows, seed, runs):
+    """run_size 를 runs 번(매번 새 임시 폴더에서) 돌려 단계별 중앙값을 돌려줍니다."""
+    results = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as tmp:
+            results.append(run_size(tmp, rows, seed))
+    result = dict(results[0], runs=runs)
+    result["generate_seconds"] = statistics.median(
+        r["generate_seconds"] for r in results
+    )
+    result["timings"] = {
+        step: statistics.median(r["timings"][step] for r in results)
+        for step in results[0]["timings"]
+    }
+    return result
+
+
+def run_suite(sizes, seed=0, runs=DEFAULT_RUNS):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    sss.console = Console(file=io.StringIO())
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "packages": _package_versions(),
+        "seed": seed,
+        "results": {},
+    }
+    for size in sizes:
+        report["results"][size] = run_size_median(workload.parse_size(size), seed, runs)
+    return report
+
+
+def compare_reports(report, baseline, tolerance=REGRESSION_TOLERANCE):
+    """두 보고서에 모두 있는 크기·단계의 시간 비율과 회귀 여부 목록."""
+    rows = []
+    for size, result in report["results"].items():
+        base_result = baseline.get("results", {}).get(size)
+        if base_result is None:
+            continue
+        for step, seconds in result["timings"].items():
+            base_seconds = base_result["timings"].get(step)
+            if base_seconds is None:
+                continue
+            ratio = seconds / base_seconds if base_seconds else float("inf")
+            rows.append(
+                {
+                    "size": size,
+                    "step": step,
+                    "baseline": base_seconds,
+                    "seconds": seconds,
+                    "ratio": ratio,
+                    "regression": ratio > 1 + tolerance
+                    and max(seconds, base_seconds) >= MIN_COMPARE_SECONDS,
+                }
+            )
+    return rows
+
+
+def print_report(report, comparison=None):
+    by_step = {(row["size"], row["step"]): row for row in comparison or []}
+    for size, result in report["results"].items():
+        print(
+            f"[{size}] 기록 {result['rows']:,}건, CSV {result['csv_bytes'] / 2**20:.1f} MiB"
+        )
+        for step, seconds in result["timings"].items():
+            line = f"  {step:<24} {seconds * 1000:10.2f} ms"
+            row = by_step.get((size, step))
+            if row is not None:
+                mark = "  회귀!" if row["regression"] else ""
+                line += f"  (기준선 대비 {row['ratio']:5.2f}배){mark}"
+            print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="기록 수 (예: 10k 100k 1m 10m)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", help="결과 JSON 을 저장할 경로")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument(
+        "--baseline",
+        nargs="?",
+        const=BASELINE_FILE,
+        help="비교할 기준선 JSON 경로 (값 없이 주면 benchmarks/baseline.json)",
+    )
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.seed, args.runs)
+    comparison = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            comparison = compare_reports(report, json.load(f), args.tolerance)
+        report["comparison"] = comparison
+    print_report(report, comparison)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    regressions = [row for row in comparison or [] if row["regression"]]
+    if regressions:
+        print(f"실패: 회귀 {len(regressions)}건")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
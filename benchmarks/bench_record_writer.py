@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""기록 일괄 추가 처리량(기록/초): 한 줄짜리 DataFrame 방식과 study_records 비교.
+
+- 예전 방식: 기록마다 pd.DataFrame 을 만들어 to_csv(mode="a") (잠금·fsync 없음)
+- append_csv_records: 기록마다 잠금·저널·fsync 를 거쳐 한 건씩 덧붙이기
+- RecordWriter: 검사한 기록을 batch_size 건씩 모아 한 번에 덧붙이기
+
+    python benchmarks/bench_record_writer.py --records 2000 --batch-sizes 100 1000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sss  # noqa: E402
+import study_records  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def raw_records(count):
+    subjects = list(sss.SUBJECT_TO_CATEGORY_MAP)
+    return [
+        {
+            "날짜": f"2026-01-{i % 28 + 1:02d}",
+            "과목": subjects[i % len(subjects)],
+            "공부 시간(분)": str(10 + i % 120),
+            "공부 내용": f"공부 내용 {i % 500}, 복습",
+            "집중도": str(i % 5 + 1),
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_add(csv_path, raws):
+    """예전 add_study_record 의 저장 방식(비교용)."""
+    import pandas as pd
+
+    for record_id, raw in enumerate(raws, 1):
+        record = study_records.parse_record(raw, sss.SUBJECT_TO_CATEGORY_MAP)
+        df = pd.DataFrame([{study_records.RECORD_ID: record_id, **record}])
+        is_new_file = not os.path.exists(csv_path)
+        df.to_csv(
+            csv_path,
+            mode="a",
+            header=is_new_file,
+            index=False,
+            encoding="utf-8-sig" if is_new_file else "utf-8",
+        )
+
+
+def single_add(csv_path, raws):
+    for raw in raws:
+        record = study_records.parse_record(raw, sss.SUBJECT_TO_CATEGORY_MAP)
+        study_records.append_csv_records(csv_path, [record])
+
+
+def batched_add(csv_path, raws, batch_size):
+    with study_records.RecordWriter(
+        csv_path, sss.SUBJECT_TO_CATEGORY_MAP, batch_size
+    ) as writer:
+        for raw in raws:
+            writer.add(raw)
+
+
+def import_seconds(module):
+    """새 인터프리터에서 module 을 불러오는 데 걸리는 시간."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", f"import {module}"], cwd=REPO_ROOT, check=True
+    )
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 1000])
+    args = parser.parse_args(argv)
+
+    raws = raw_records(args.records)
+    cases = [("예전 방식(DataFrame)", legacy_add), ("append_csv_records", single_add)]
+    cases += [
+        (
+            f"RecordWriter({size})",
+            lambda path, raws, size=size: batched_add(path, raws, size),
+        )
+        for size in args.batch_sizes
+    ]
+    print(f"기록 수: {args.records:,}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (name, add) in enumerate(cases):
+            csv_path = os.path.join(tmp, f"log{i}.csv")
+            start = time.perf_counter()
+            add(csv_path, raws)
+            elapsed = time.perf_counter() - start
+            print(f"  {name:<24} {args.records / elapsed:12,.0f} 기록/초")
+    print(
+        f"import 시간: study_records {import_seconds('study_records') * 1000:.0f} ms,"
+        f" pandas {import_seconds('pandas') * 1000:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""study_reports.run_reports 의 작업자 수별 처리량(학생/초) 측정.
+
+학생마다 임의의 학습 기록과 주간 목표 파일을 만들고, 저장소가 없는 첫 실행
+(cold)과 저장소가 만들어진 뒤의 실행(warm)을 작업자 수별로 잽니다.
+
+    python benchmarks/bench_reports.py --students 200 --rows 5000 --workers 1 2 4
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sss  # noqa: E402
+import study_reports  # noqa: E402
+from benchmarks.workload import write_synthetic_log  # noqa: E402
+
+
+def make_students(directory, students, rows):
+    week_start = sss.week_start_of(datetime.now().date())
+    for i in range(students):
+        csv_path = os.path.join(directory, f"student{i:05d}.csv")
+        write_synthetic_log(csv_path, rows, seed=i)
+        with open(sss.goal_file_for(csv_path), "w", encoding="utf-8-sig") as f:
+            f.write(f"주 시작일,목표 시간(시간)\n{week_start:%Y-%m-%d},{10 + i % 20}\n")
+
+
+def timed_run(csv_paths, workers, chunksize):
+    start = time.perf_counter()
+    reports = study_reports.run_reports(csv_paths, workers, chunksize)
+    elapsed = time.perf_counter() - start
+    failed = [r for r in reports if "error" in r]
+    assert not failed, failed[:3]
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunksize", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source")
+        os.makedirs(source)
+        make_students(source, args.students, args.rows)
+        print(
+            f"학생 {args.students:,}명 × 기록 {args.rows:,}개,"
+            f" chunksize {args.chunksize}, CPU {os.cpu_count()}개"
+        )
+        for workers in args.workers:
+            # 작업자 수마다 저장소가 없는 새 사본에서 시작합니다.
+            run_dir = os.path.join(tmp, f"run{workers}")
+            shutil.copytree(source, run_dir)
+            csv_paths = study_reports.find_student_logs([run_dir])
+            cold = timed_run(csv_paths, workers, args.chunksize)
+            warm = timed_run(csv_paths, workers, args.chunksize)
+            print(
+                f"  작업자 {workers:>2}: cold {args.students / cold:8.1f} 학생/초"
+                f" ({cold:6.2f} s), warm {args.students / warm:8.1f} 학생/초"
+                f" ({warm:6.2f} s)"
+            )
+            shutil.rmtree(run_dir)
+
+
+if __name__ == "__main__":
+    main()
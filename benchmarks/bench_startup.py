@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""sss.py 의 콜드 스타트(첫 메뉴 패널 출력까지) 시간을 측정합니다.
+
+`python -X importtime` 출력을 파싱해 모듈별 import 시간을 보고하고,
+전체 시간이 예산을 넘거나 메뉴 전에 무거운 라이브러리가 불러와지면
+종료 코드 1 로 실패합니다.
+
+    python benchmarks/bench_startup.py --budget-ms 400
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_BUDGET_MS = 400
+# 첫 메뉴가 뜨기 전에는 불러오면 안 되는 패키지
+FORBIDDEN_AT_STARTUP = ["pandas", "numpy", "matplotlib", "plotly", "pyarrow"]
+STARTUP_SNIPPET = "import sss; sss.print_main_menu()"
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력에서 (모듈, 자체 시간 us, 누적 시간 us) 목록을 뽑습니다."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        # "| " 다음의 공백 개수가 import 깊이를 나타냅니다.
+        rows.append((name.rstrip()[1:], int(self_us), int(cumulative_us)))
+    return rows
+
+
+def top_level_report(rows, limit):
+    """최상위 패키지별 누적 import 시간을 큰 순서로 정리합니다."""
+    totals = {}
+    for name, _, cumulative_us in rows:
+        # 들여쓰기가 없는 줄이 최상위 import 입니다.
+        if name.startswith(" "):
+            continue
+        package = name.strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + cumulative_us
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    return [{"package": name, "ms": us / 1000} for name, us in ranked[:limit]]
+
+
+def measure_startup(runs):
+    best_ms = None
+    rows = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_SNIPPET],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if best_ms is None or elapsed_ms < best_ms:
+            best_ms = elapsed_ms
+            rows = parse_importtime(result.stderr)
+    return best_ms, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", help="보고서를 JSON 파일로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    elapsed_ms, rows = measure_startup(args.runs)
+    imported = {name.strip().split(".")[0] for name, _, _ in rows}
+    forbidden = [name for name in FORBIDDEN_AT_STARTUP if name in imported]
+    report = {
+        "startup_ms": round(elapsed_ms, 1),
+        "budget_ms": args.budget_ms,
+        "forbidden_imports": forbidden,
+        "top_imports": top_level_report(rows, args.top),
+    }
+
+    print(
+        f"콜드 스타트(첫 메뉴까지): {elapsed_ms:.1f} ms (예산 {args.budget_ms:.0f} ms)"
+    )
+    for item in report["top_imports"]:
+        print(f"  {item['package']:<24} {item['ms']:8.1f} ms")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    failed = False
+    if forbidden:
+        print(f"실패: 메뉴 전에 불러온 무거운 패키지 {', '.join(forbidden)}")
+        failed = True
+    if elapsed_ms > args.budget_ms:
+        print("실패: 시작 시간이 예산을 넘었습니다.")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
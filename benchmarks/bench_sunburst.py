@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""선버스트 차트 배열 생성: 예전 iterrows 방식과 sss.sunburst_payload 비교.
+
+임의의 학습 기록 CSV 를 임시 폴더에 만들고 저장소를 맞춘 뒤, 예전 방식(전체
+기록을 읽어 iterrows 로 배열 생성)과 sunburst_payload 를 잽니다. sunburst_payload
+는 세그먼트별 공부 내용 요약을 처음 만드는 경우(cold)와 저장해 둔 요약을 합치기만
+하는 경우(warm)를 따로 봅니다. cold 는 요약이 없는 세그먼트를 묶어 한 번에 요약하므로
+기록이 많을 때 예전 방식과 비슷하거나 빠르고, warm 은 기록 수와 거의 관계없습니다.
+
+    python benchmarks/bench_sunburst.py --rows 1000000
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sss  # noqa: E402
+import study_store  # noqa: E402
+from benchmarks.workload import write_synthetic_log  # noqa: E402
+
+
+def legacy_sunburst_payload():
+    """show_visualizations 의 예전 구현(비교용). 전체 기록을 읽어 만듭니다."""
+    df = sss.load_data()
+    df["대분류"] = df["과목"].map(sss.SUBJECT_TO_CATEGORY_MAP)
+    df_leaves = (
+        df.groupby(["대분류", "과목"])
+        .agg(
+            total_time=("공부 시간(분)", "sum"),
+            contents=("공부 내용", lambda x: "<br>- ".join(x.dropna().unique())),
+        )
+        .reset_index()
+    )
+    df_parents_agg = (
+        df.groupby("대분류")
+        .agg(
+            total_time=("공부 시간(분)", "sum"),
+            subject_list=("과목", lambda x: "<br>- ".join(sorted(x.unique()))),
+        )
+        .reset_index()
+    )
+    ids, labels, parents, values, hovertexts = [], [], [], [], []
+    for index, row in df_parents_agg.iterrows():
+        ids.append(row["대분류"])
+        labels.append(row["대분류"])
+        parents.append("")
+        values.append(row["total_time"])
+        time_display = sss.format_time_display(row["total_time"])
+        hovertexts.append(
+            f"<b>{row['대분류']}</b><br><br><b>총 공부 시간:</b> {time_display}<br><br><b>기록된 세부 과목:</b><br>- {row['subject_list']}"
+        )
+    for index, row in df_leaves.iterrows():
+        ids.append(f"{row['대분류']}-{row['과목']}")
+        labels.append(row["과목"])
+        parents.append(row["대분류"])
+        values.append(row["total_time"])
+        time_display = sss.format_time_display(row["total_time"])
+        hovertexts.append(
+            f"<b>{row['과목']}</b><br><br><b>총 공부 시간:</b> {time_display}<br><br><b>공부 내용:</b><br>- {row['contents']}"
+        )
+    return {
+        "ids": ids,
+        "labels": labels,
+        "parents": parents,
+        "values": values,
+        "hovertext": hovertexts,
+    }
+
+
+def drop_content_summaries():
+    """세그먼트 옆에 저장된 공부 내용 요약을 지워 다음 호출이 새로 만들게 합니다."""
+    pattern = os.path.join(sss.STORE_DIR, f"*{study_store.CONTENT_SUMMARY_SUFFIX}")
+    for path in glob.glob(pattern):
+        os.remove(path)
+
+
+def timed(func, repeat, before=None):
+    best = None
+    for _ in range(repeat):
+        study_store._MEMO.clear()
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        payload = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, payload
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sss.DATA_FILE = os.path.join(tmp, "study_log.csv")
+        sss.STORE_DIR = study_store.store_dir_for(sss.DATA_FILE)
+        write_synthetic_log(sss.DATA_FILE, args.rows)
+        # 저장소를 먼저 만들어 두고 배열 생성만 잽니다.
+        study_store.sync_csv(sss.DATA_FILE, sss.STORE_DIR)
+        legacy_s, legacy = timed(legacy_sunburst_payload, args.repeat)
+        cold_s, new = timed(sss.sunburst_payload, args.repeat, drop_content_summaries)
+        warm_s, _ = timed(sss.sunburst_payload, args.repeat)
+
+    assert legacy["ids"] == new["ids"]
+    assert np.allclose(legacy["values"], new["values"])
+    legacy_bytes = sum(len(text.encode("utf-8")) for text in legacy["hovertext"])
+    new_bytes = sum(len(text.encode("utf-8")) for text in new["hovertext"])
+
+    print(f"기록 수: {args.rows:,}")
+    print(
+        f"  예전 방식(iterrows)       {legacy_s * 1000:10.1f} ms, hover {legacy_bytes:,} B"
+    )
+    print(
+        f"  sunburst_payload (cold)   {cold_s * 1000:10.1f} ms, hover {new_bytes:,} B"
+    )
+    print(f"  sunburst_payload (warm)   {warm_s * 1000:10.1f} ms")
+    print(f"  속도 향상 cold {legacy_s / cold_s:.1f}배, warm {legacy_s / warm_s:.1f}배")
+
+
+if __name__ == "__main__":
+    main()
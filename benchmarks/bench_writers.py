@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""여러 작성자가 동시에 append_csv_records 를 부를 때의 처리량(기록/초)과 fsync 수.
+
+스레드 작성자는 한 프로세스 안에서 그룹 커밋으로 묶이고, 프로세스 작성자는
+파일 잠금으로 차례를 지킵니다(프로세스끼리는 묶지 않습니다). 기록 한 건은 저널
+없이 덧붙여 fsync 한 번, 묶인 여러 건은 저널과 CSV 에 한 번씩 fsync 합니다.
+끝나면 기록 ID 가 빠짐없이 유일한지 검사합니다.
+
+    python benchmarks/bench_writers.py --writers 1 4 16 --records 200
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import study_store  # noqa: E402
+
+RECORD = {
+    "날짜": "2026-01-05",
+    "과목": "수학1",
+    "공부 시간(분)": 50.0,
+    "공부 내용": "미적분, 극한",
+    "집중도": 4,
+}
+
+
+def write_records(csv_path, records):
+    for _ in range(records):
+        study_store.append_csv_records(csv_path, [RECORD])
+
+
+def run_threads(csv_path, writers, records):
+    threads = [
+        threading.Thread(target=write_records, args=(csv_path, records))
+        for _ in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_processes(csv_path, writers, records):
+    processes = [
+        multiprocessing.Process(target=write_records, args=(csv_path, records))
+        for _ in range(writers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+def check_log(csv_path, expected):
+    ids = pd.read_csv(csv_path, encoding="utf-8-sig", usecols=["기록 ID"])["기록 ID"]
+    assert len(ids) == expected, (len(ids), expected)
+    assert ids.is_unique and ids.max() == expected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--records", type=int, default=200, help="작성자당 기록 수")
+    args = parser.parse_args(argv)
+
+    # 이 프로세스 안의 fsync 만 셉니다(프로세스 작성자의 fsync 는 세지 않음).
+    fsyncs = [0]
+    real_fsync = os.fsync
+
+    def counting_fsync(fd):
+        fsyncs[0] += 1
+        real_fsync(fd)
+
+    os.fsync = counting_fsync
+    print(f"작성자당 기록 {args.records:,}개")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, runner in (("스레드", run_threads), ("프로세스", run_processes)):
+            for writers in args.writers:
+                csv_path = os.path.join(tmp, f"{mode}{writers}.csv")
+                total = writers * args.records
+                fsyncs[0] = 0
+                start = time.perf_counter()
+                runner(csv_path, writers, args.records)
+                elapsed = time.perf_counter() - start
+                check_log(csv_path, total)
+                line = f"  {mode} {writers:3d}개  {total / elapsed:10,.0f} 기록/초"
+                if runner is run_threads:
+                    line += f", 기록당 fsync {fsyncs[0] / total:.2f}회"
+                print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""벤치마크용 임의 학습 기록 생성기.
+
+seed 가 같으면 언제나 같은 기록을 만듭니다. write_synthetic_log 는 실제 기록과
+비슷하게 대분류마다 비중을 달리하고, 공부 내용은 과목별 단원 이름이 자주 쓰는
+것 위주로 되풀이되게 만듭니다. 천만 건도 메모리에 한꺼번에 올리지 않도록
+조각 단위로 CSV 에 씁니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+import sss
+import study_goals
+import study_records
+
+# 대분류별 기록 비중 (SUBJECT_CATEGORIES 순서)
+CATEGORY_WEIGHTS = {
+    "국어": 0.2,
+    "수학": 0.3,
+    "영어": 0.2,
+    "사회탐구": 0.15,
+    "과학탐구": 0.15,
+}
+# 집중도 1~5 의 비중
+CONCENTRATION_WEIGHTS = [0.05, 0.15, 0.35, 0.3, 0.15]
+# 과목마다 쓰이는 공부 내용(단원) 수와 기록 기간
+UNITS_PER_SUBJECT = 200
+LOG_START = "2023-01-01"
+MAX_LOG_DAYS = 3 * 365
+WRITE_CHUNK_ROWS = 1_000_000
+
+# 크기 이름 → 기록 수
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+
+
+def parse_size(text):
+    """'10k', '1m', '2500' 같은 크기를 기록 수로 바꿉니다."""
+    text = text.lower().replace("_", "")
+    if text in SIZES:
+        return SIZES[text]
+    for suffix, scale in (("k", 1_000), ("m", 1_000_000)):
+        if text.endswith(suffix):
+            return int(float(text[: -len(suffix)]) * scale)
+    return int(text)
+
+
+def synthetic_records(rows, seed=0, distinct_contents=5000):
+    """SUBJECT_CATEGORIES 전체에 고르게 퍼진 임의의 학습 기록을 만듭니다."""
+    rng = np.random.default_rng(seed)
+    subjects = np.array(list(sss.SUBJECT_TO_CATEGORY_MAP))
+    contents = np.array([f"공부 내용 {i}" for i in range(distinct_contents)])
+    df = pd.DataFrame(
+        {
+            "과목": subjects[rng.integers(0, len(subjects), rows)],
+            "공부 시간(분)": rng.gamma(2.0, 25.0, rows),
+            "공부 내용": contents[rng.integers(0, len(contents), rows)],
+            "집중도": rng.integers(1, 6, rows),
+        }
+    )
+    df["대분류"] = df["과목"].map(sss.SUBJECT_TO_CATEGORY_MAP)
+    return df
+
+
+def _subject_weights():
+    subjects, weights = [], []
+    for category, names in sss.SUBJECT_CATEGORIES.items():
+        subjects.extend(names)
+        weights.extend([CATEGORY_WEIGHTS[category] / len(names)] * len(names))
+    return np.array(subjects), np.array(weights) / sum(weights)
+
+
+def log_days(rows):
+    """rows 건의 기록이 걸쳐 있는 날 수. 하루 4건 꼴로 늘리되 3년을 넘지 않습니다."""
+    return int(min(MAX_LOG_DAYS, max(28, rows // 4)))
+
+
+def _chunk(rng, rows, days, subjects, subject_p):
+    subject_codes = rng.choice(len(subjects), rows, p=subject_p)
+    # 자주 하는 단원이 되풀이되도록 Zipf 분포로 단원 번호를 고릅니다.
+    units = np.minimum(rng.zipf(1.3, rows), UNITS_PER_SUBJECT)
+    subject_names = subjects[subject_codes]
+    return pd.DataFrame(
+        {
+            "날짜": (np.datetime64(LOG_START) + days)
+            .astype("datetime64[D]")
+            .astype(str),
+            "과목": subject_names,
+            "공부 시간(분)": np.maximum(rng.gamma(2.0, 25.0, rows), 1.0).round(1),
+            "공부 내용": pd.Series(subject_names)
+            + " "
+            + pd.Series(units).astype(str)
+            + "단원",
+            "집중도": rng.choice(np.arange(1, 6), rows, p=CONCENTRATION_WEIGHTS),
+        }
+    )
+
+
+def write_synthetic_log(csv_path, rows, seed=0):
+    """rows 건의 학습 기록 CSV 를 날짜순으로 만듭니다(기록 ID 1..rows)."""
+    rng = np.random.default_rng(seed)
+    subjects, subject_p = _subject_weights()
+    days = np.sort(rng.integers(0, log_days(rows), rows))
+    with open(csv_path, "w", encoding="utf-8-sig", newline="") as f:
+        for first in range(0, rows, WRITE_CHUNK_ROWS):
+            chunk_days = days[first : first + WRITE_CHUNK_ROWS]
+            df = _chunk(rng, len(chunk_days), chunk_days, subjects, subject_p)
+            df.insert(
+                0, study_records.RECORD_ID, np.arange(first + 1, first + len(df) + 1)
+            )
+            df.to_csv(f, index=False, header=first == 0)
+
+
+def write_synthetic_goals(goal_path, rows, seed=0, student=""):
+    """write_synthetic_log(rows) 기록 기간의 모든 주에 주간 목표를 만듭니다."""
+    rng = np.random.default_rng(seed)
+    first_week = sss.week_start_of(pd.Timestamp(LOG_START).date())
+    weeks = pd.date_range(first_week, periods=log_days(rows) // 7 + 1, freq="7D")
+    goals = pd.DataFrame(
+        {
+            study_goals.STUDENT: student,
+            study_goals.WEEK_START: weeks.strftime("%Y-%m-%d"),
+            study_goals.GOAL_HOURS: rng.integers(5, 40, len(weeks)).astype(float),
+            study_goals.SET_AT: "",
+        }
+    )
+    goals.to_csv(goal_path, index=False, encoding="utf-8-sig")
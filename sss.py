@@ -1,8 +1,7 @@
 # -*- coding: utf-8 -*-
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
+import hashlib
+import json
 import os
 from datetime import datetime, timedelta
 import time
@@ -15,13 +14,11 @@ from rich.prompt import Prompt, FloatPrompt, IntPrompt
 from rich.rule import Rule
 from rich.progress_bar import ProgressBar
 
-import plotly.graph_objects as go
-import plotly.io as pio
+import platform
 
-pio.renderers.default = "vscode"
+import study_profile
 
-import platform
-import matplotlib.font_manager as fm
+# pandas, matplotlib, plotly 는 시작 시간을 줄이기 위해 필요한 메뉴에서만 불러옵니다.
 
 # (과목 데이터는 이전과 동일)
 SUBJECT_CATEGORIES = {
@@ -66,43 +63,147 @@ SUBJECT_TO_CATEGORY_MAP = {
 }
 
 console = Console()
-DATA_FILE = "study_log.csv"
-GOAL_FILE = "study_goals.csv"
+DEFAULT_DATA_FILE = "study_log.csv"
+DEFAULT_GOAL_FILE = "study_goals.csv"
+# 다른 이름의 기록 파일 `<이름>.csv` 의 주간 목표 파일은 `<이름>_goals.csv` 입니다.
+GOAL_FILE_SUFFIX = "_goals"
+DATA_FILE = DEFAULT_DATA_FILE
+GOAL_FILE = DEFAULT_GOAL_FILE
+STORE_DIR = "study_log_store"
+FONT_CACHE_FILE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "study_log",
+    "korean_font.json",
+)
+LINUX_FONT_DIRS = [
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    "~/.local/share/fonts",
+    "~/.fonts",
+]
+# load_compact_data 의 날짜 번호 기준일(0번 날)
+DAY_NUMBER_EPOCH = "1970-01-01"
+RECORD_PAGE_SIZE = 20
+CHART_DIR = "charts"
+# 추이 그래프의 막대가 이보다 많아지면 한 단계 굵은 단위(일 → 주 → 월)로 묶습니다.
+TREND_MAX_BARS = 90
+# 추이 그래프 단위 → (pandas 기간 단위, 제목에 쓰는 이름, 한 기간의 대략적인 날 수)
+TREND_RESOLUTIONS = {
+    "day": ("D", "날짜별", 1),
+    "week": ("W-SUN", "주별", 7),
+    "month": ("M", "월별", 30),
+}
+# 이 환경 변수를 두면 화면이 있어도 차트를 창·브라우저 대신 파일로만 만듭니다.
+HEADLESS_ENV = "STUDY_HEADLESS"
+# 선버스트 hover 에 보여 줄 세부 과목별 공부 내용 수와 글자 수 상한
+HOVER_CONTENT_LIMIT = 10
+HOVER_CONTENT_CHARS = 40
+# 주간 목표 기록 표에 보여 줄 최근 주 수와 달성률 추세(이동 평균)의 주 수
+GOAL_REPORT_WEEKS = 8
+GOAL_TREND_WEEKS = 4
 
 
 # --- ## 1. 새로운 시간 표시 형식 변환 함수 추가 ## ---
 def format_time_display(decimal_minutes):
     """소수점 형태의 분(minutes)을 'M분 S초' 문자열로 변환합니다."""
-    if pd.isna(decimal_minutes) or decimal_minutes < 0:
+    # NaN 은 자기 자신과 같지 않습니다(pandas 없이 결측값 확인).
+    if decimal_minutes is None or decimal_minutes != decimal_minutes:
+        return "0분 0초"
+    if decimal_minutes < 0:
         return "0분 0초"
     total_seconds = int(decimal_minutes * 60)
     minutes, seconds = divmod(total_seconds, 60)
     return f"{minutes}분 {seconds}초"
 
 
+def format_time_display_series(decimal_minutes):
+    """format_time_display 의 벡터 버전입니다. 분 Series 를 'M분 S초' Series 로 바꿉니다."""
+    total_seconds = (decimal_minutes.fillna(0).clip(lower=0) * 60).astype("int64")
+    minutes, seconds = total_seconds // 60, total_seconds % 60
+    return minutes.astype(str) + "분 " + seconds.astype(str) + "초"
+
+
 # --- ## 추가 끝 ## ---
 
 
+def _font_dirs_signature():
+    """폰트 폴더의 (폴더 수, 가장 최근 수정 시각). 폰트가 설치·삭제되면 바뀝니다."""
+    dir_count, latest_mtime = 0, 0
+    for font_dir in LINUX_FONT_DIRS:
+        for dirpath, _, _ in os.walk(os.path.expanduser(font_dir)):
+            dir_count += 1
+            latest_mtime = max(latest_mtime, os.stat(dirpath).st_mtime_ns)
+    return [dir_count, latest_mtime]
+
+
+def _find_linux_korean_font():
+    """나눔고딕의 (이름, 파일 경로)를 찾습니다. 결과는 캐시 파일에 저장해 재사용합니다."""
+    signature = _font_dirs_signature()
+    try:
+        with open(FONT_CACHE_FILE, encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache["signature"] == signature and (
+            cache["path"] is None or os.path.exists(cache["path"])
+        ):
+            return cache["name"], cache["path"]
+    except (OSError, ValueError, KeyError):
+        pass
+    import matplotlib.font_manager as fm
+
+    font = next(
+        (font for font in fm.fontManager.ttflist if "NanumGothic" in font.name), None
+    )
+    font_name, font_path = ("NanumGothic", font.fname) if font else (None, None)
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_FILE), exist_ok=True)
+        with open(FONT_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"name": font_name, "path": font_path, "signature": signature}, f)
+    except OSError:
+        pass
+    return font_name, font_path
+
+
+_korean_font_ready = False
+
+
 def setup_korean_font():
+    """matplotlib 한글 폰트를 설정합니다. 차트를 처음 그릴 때 한 번만 실행됩니다.
+
+    Linux 에서는 캐시에 적어 둔 폰트 파일을 fontManager 에 바로 등록하고, pyplot 은
+    그 뒤에 차트를 그리는 쪽에서 불러옵니다.
+    """
+    global _korean_font_ready
+    if _korean_font_ready:
+        return
+    import matplotlib
+
     os_name = platform.system()
+    font_name = None
     if os_name == "Windows":
         font_name = "Malgun Gothic"
     elif os_name == "Darwin":
         font_name = "AppleGothic"
     elif os_name == "Linux":
-        if any("NanumGothic" in font.name for font in fm.fontManager.ttflist):
-            font_name = "NanumGothic"
-        else:
+        font_name, font_path = _find_linux_korean_font()
+        if font_name is None:
             console.print(
                 "[yellow]한글 폰트(나눔고딕)가 없어 일부 글자가 깨질 수 있습니다.[/yellow]"
             )
-            font_name = None
+        elif font_path:
+            from matplotlib import font_manager
+
+            font_manager.fontManager.addfont(font_path)
     if font_name:
-        plt.rc("font", family=font_name)
-    plt.rc("axes", unicode_minus=False)
+        matplotlib.rc("font", family=font_name)
+    matplotlib.rc("axes", unicode_minus=False)
+    _korean_font_ready = True
 
 
+@study_profile.profiled("menu:add_study_record")
 def add_study_record():
+    # 기록 하나를 덧붙이는 데 pandas 는 필요 없으므로 study_records 만 씁니다.
+    import study_records
+
     console.print(Rule("[bold cyan]학습 기록 추가[/bold cyan]"))
     date_input = Prompt.ask(
         "- 날짜 (YYYY-MM-DD, 비워두면 오늘)",
@@ -176,117 +277,571 @@ def add_study_record():
     concentration = IntPrompt.ask(
         "- 집중도 (1~5)", choices=["1", "2", "3", "4", "5"], show_choices=False
     )
-    new_record = {
-        "날짜": [date_input],
-        "과목": [selected_subject],
-        "공부 시간(분)": [study_time],
-        "공부 내용": [content],
-        "집중도": [concentration],
-    }
-    df_new = pd.DataFrame(new_record)
-    if not os.path.exists(DATA_FILE):
-        df_new.to_csv(DATA_FILE, index=False, encoding="utf-8-sig")
+    try:
+        new_record = study_records.parse_record(
+            {
+                "날짜": date_input,
+                "과목": selected_subject,
+                "공부 시간(분)": study_time,
+                "공부 내용": content,
+                "집중도": concentration,
+            },
+            SUBJECT_TO_CATEGORY_MAP,
+        )
+    except ValueError as e:
+        console.print(f"[bold red]❌ 기록을 저장하지 않았습니다: {e}[/bold red]")
+        return
+    is_new_file = not os.path.exists(DATA_FILE)
+    # 저장소는 다음 load_data() 때 덧붙여진 행만 읽어 따라잡습니다.
+    study_records.append_csv_records(DATA_FILE, [new_record])
+    if is_new_file:
         console.print(
             "[bold green]✅ 새 데이터 파일을 생성하고 기록을 저장했습니다.[/bold green]"
         )
     else:
-        df_new.to_csv(
-            DATA_FILE, mode="a", header=False, index=False, encoding="utf-8-sig"
-        )
         console.print(
             "[bold green]✅ 기존 파일에 학습 기록을 추가했습니다.[/bold green]"
         )
 
 
-def load_data():
+@study_profile.profiled("load_data")
+def load_data(columns=None, start=None, end=None):
+    """학습 기록을 불러옵니다. columns 를 주면 해당 컬럼만 읽습니다.
+
+    start/end(날짜, 양 끝 포함)를 주면 그 기간의 월 파티션만 엽니다. 기록 ID 가
+    없는 예전 CSV 는 고쳐 쓰지 않고, 읽은 기록에만 행 순서대로 ID 를 붙입니다.
+    """
+    import study_store
+
+    if not os.path.exists(DATA_FILE):
+        return None
+    # CSV 가 바뀌지 않았으면 다시 파싱하지 않고 저장소(와 메모리 캐시)를 씁니다.
+    # 삭제 표시된 기록은 읽으면서 걸러 냅니다.
+    return study_store.load_records(DATA_FILE, STORE_DIR, columns, start, end)
+
+
+def compact_records(df, with_content=False):
+    """load_data() 결과를 메모리를 적게 쓰는 타입으로 바꿉니다.
+
+    과목은 SUBJECT_TO_CATEGORY_MAP 순서의 Categorical(목록에 없는 과목은 뒤에
+    덧붙임)이고, 과목에서 나온 대분류 Categorical 을 함께 둡니다. 기록 ID·날짜는
+    int32(날짜는 DAY_NUMBER_EPOCH 부터의 일수), 집중도는 int8, 공부 시간은
+    float32 입니다. 공부 내용은 with_content 일 때만 Categorical 로 남깁니다.
+    """
+    import numpy as np
+    import pandas as pd
+
+    compact = pd.DataFrame(index=df.index)
+    if "기록 ID" in df:
+        compact["기록 ID"] = df["기록 ID"].astype("int32")
+    if "날짜" in df:
+        compact["날짜"] = to_day_numbers(df["날짜"])
+    if "과목" in df:
+        # factorize 로 한 번만 정수 코드를 얻고, 이후는 작은 표를 배열 인덱싱으로 옮깁니다.
+        # 표의 마지막 칸(-1)은 과목이 비어 있는 행(코드 -1)을 위한 것입니다.
+        codes, values = pd.factorize(df["과목"])
+        extra = sorted(v for v in values if v not in SUBJECT_TO_CATEGORY_MAP)
+        subjects = list(SUBJECT_TO_CATEGORY_MAP) + extra
+        subject_index = {subject: i for i, subject in enumerate(subjects)}
+        to_subject = np.array([subject_index[v] for v in values] + [-1], dtype="int16")
+        subject_codes = to_subject[codes]
+        compact["과목"] = pd.Categorical.from_codes(subject_codes, categories=subjects)
+        category_index = {name: i for i, name in enumerate(SUBJECT_CATEGORIES)}
+        to_category = np.array(
+            [category_index.get(SUBJECT_TO_CATEGORY_MAP.get(s), -1) for s in subjects]
+            + [-1],
+            dtype="int8",
+        )
+        compact["대분류"] = pd.Categorical.from_codes(
+            to_category[subject_codes], categories=list(SUBJECT_CATEGORIES)
+        )
+    if "공부 시간(분)" in df:
+        compact["공부 시간(분)"] = df["공부 시간(분)"].astype("float32")
+    if with_content and "공부 내용" in df:
+        codes, values = pd.factorize(df["공부 내용"])
+        compact["공부 내용"] = pd.Categorical.from_codes(codes, categories=values)
+    if "집중도" in df:
+        compact["집중도"] = df["집중도"].astype("int8")
+    return compact
+
+
+def to_day_numbers(dates):
+    """날짜 Series 를 DAY_NUMBER_EPOCH 부터의 일수(int32)로 바꿉니다."""
+    import numpy as np
+
+    days = dates.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    return (days - np.datetime64(DAY_NUMBER_EPOCH, "D")).astype("int32")
+
+
+@study_profile.profiled("load_compact_data")
+def load_compact_data(start=None, end=None, with_content=False):
+    """학습 기록을 compact_records 형식으로 불러옵니다.
+
+    큰 기록에서 메모리를 아끼도록 원래 타입의 프레임은 캐시에 남기지 않습니다.
+    """
+    import study_store
+
+    if not os.path.exists(DATA_FILE):
+        return None
+    columns = [c for c in study_store.COLUMNS if with_content or c != "공부 내용"]
+    df = study_store.load_records(DATA_FILE, STORE_DIR, columns, start, end, memo=False)
+    return compact_records(df, with_content)
+
+
+@study_profile.profiled("load_subject_stats")
+def load_subject_stats():
+    """과목별 누적 통계(기록 수, 공부 시간 합, 집중도 합, 효율성 점수 합)를 읽습니다.
+
+    저장소에 유지되는 값을 쓰므로 기록이 많아도 전체를 다시 읽지 않습니다.
+    """
+    import pandas as pd
+    import study_store
+
     if not os.path.exists(DATA_FILE):
         return None
-    df = pd.read_csv(DATA_FILE, encoding="utf-8-sig")
-    df["날짜"] = pd.to_datetime(df["날짜"])
-    return df
+    stats = study_store.subject_stats(DATA_FILE, STORE_DIR)
+    return pd.DataFrame.from_dict(
+        stats, orient="index", columns=study_store.SUBJECT_STAT_COLUMNS
+    ).sort_index()
+
+
+@study_profile.profiled("load_daily_stats")
+def load_daily_stats():
+    """날짜별 누적 통계(기록 수, 공부 시간 합, 집중도 합)를 날짜순으로 읽습니다."""
+    import pandas as pd
+    import study_store
+
+    if not os.path.exists(DATA_FILE):
+        return None
+    daily = pd.DataFrame.from_dict(
+        study_store.daily_stats(DATA_FILE, STORE_DIR),
+        orient="index",
+        columns=study_store.DAILY_STAT_COLUMNS,
+    )
+    daily.index = pd.to_datetime(daily.index)
+    daily.index.name = "날짜"
+    return daily.sort_index()
 
 
+def _join_hover_items(items, keys):
+    """keys 별로 items 문자열을 '<br>- ' 로 이어 붙입니다(그룹마다 한 번의 연산)."""
+    separator = "<br>- "
+    joined = (separator + items.astype(str)).groupby(keys, sort=False).sum()
+    return joined.str.slice(len(separator))
+
+
+@study_profile.profiled("chart:sunburst_payload")
+def sunburst_payload(start=None, end=None):
+    """start~end 기록으로 선버스트 배열을 만듭니다. 그릴 기록이 없으면 None.
+
+    저장소의 세그먼트별 공부 내용 요약을 합쳐 만들므로 기록 전체를 메모리에
+    올리지 않고, 기록이 덧붙어도 새 세그먼트만 요약합니다.
+    """
+    import study_store
+
+    if not os.path.exists(DATA_FILE):
+        return None
+    summaries = study_store.content_summaries(DATA_FILE, STORE_DIR, start, end)
+    summaries = {
+        subject: summary
+        for subject, summary in summaries.items()
+        if subject in SUBJECT_TO_CATEGORY_MAP
+    }
+    if not summaries:
+        return None
+    return _sunburst_payload(summaries)
+
+
+def _content_hover_text(summary):
+    """세부 과목 요약(study_contents)으로 hover 의 공부 내용 목록을 만듭니다."""
+    import study_contents
+
+    # 요약이 어림값이면 남은 시간은 실제보다 작을 수 있어 "이상" 을 붙입니다.
+    at_least = "" if summary["exact"] else " 이상"
+    lines = []
+    for content, _, minutes in study_contents.top_contents(
+        summary, HOVER_CONTENT_LIMIT
+    ):
+        if len(content) > HOVER_CONTENT_CHARS:
+            content = content[:HOVER_CONTENT_CHARS] + "…"
+        lines.append(f"{content} ({format_time_display(minutes)}{at_least})")
+    text = "<br>- ".join(lines)
+    distinct, exact = study_contents.distinct_contents(summary)
+    if distinct > len(lines):
+        text += f"<br>… 외 {'' if exact else '약 '}{distinct - len(lines)}개"
+    return text
+
+
+def _sunburst_payload(summaries):
+    """과목별 공부 내용 요약으로 선버스트 배열을 만듭니다."""
+    import pandas as pd
+
+    subjects = sorted(summaries)
+    leaves = pd.DataFrame(
+        {
+            "과목": subjects,
+            "total_time": [summaries[subject]["minutes"] for subject in subjects],
+            "contents": [
+                _content_hover_text(summaries[subject]) for subject in subjects
+            ],
+        }
+    )
+    leaves.insert(0, "대분류", leaves["과목"].map(SUBJECT_TO_CATEGORY_MAP))
+    leaves = leaves.sort_values(["대분류", "과목"], ignore_index=True)
+
+    parents = leaves.groupby("대분류", observed=True)["total_time"].sum().reset_index()
+    subject_lists = leaves.sort_values("과목")
+    subject_lists = _join_hover_items(
+        subject_lists["과목"], subject_lists["대분류"]
+    ).rename("subject_list")
+    parents = parents.join(subject_lists, on="대분류")
+
+    parent_hover = (
+        "<b>"
+        + parents["대분류"].astype(str)
+        + "</b><br><br><b>총 공부 시간:</b> "
+        + format_time_display_series(parents["total_time"])
+        + "<br><br><b>기록된 세부 과목:</b><br>- "
+        + parents["subject_list"]
+    )
+    leaf_hover = (
+        "<b>"
+        + leaves["과목"].astype(str)
+        + "</b><br><br><b>총 공부 시간:</b> "
+        + format_time_display_series(leaves["total_time"])
+        + "<br><br><b>공부 내용:</b><br>- "
+        + leaves["contents"]
+    )
+    leaf_ids = leaves["대분류"].astype(str) + "-" + leaves["과목"].astype(str)
+    return {
+        "ids": parents["대분류"].astype(str).tolist() + leaf_ids.tolist(),
+        "labels": parents["대분류"].astype(str).tolist()
+        + leaves["과목"].astype(str).tolist(),
+        "parents": [""] * len(parents) + leaves["대분류"].astype(str).tolist(),
+        "values": parents["total_time"].tolist() + leaves["total_time"].tolist(),
+        "hovertext": parent_hover.tolist() + leaf_hover.tolist(),
+    }
+
+
+@study_profile.profiled("chart:sunburst_figure")
+def sunburst_figure(payload):
+    """sunburst_payload 배열로 plotly 선버스트 Figure 를 만듭니다(대화형·CLI·일괄 렌더링 공용)."""
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    pio.renderers.default = "vscode"
+
+    fig = go.Figure(
+        go.Sunburst(
+            ids=payload["ids"],
+            labels=payload["labels"],
+            parents=payload["parents"],
+            values=payload["values"],
+            branchvalues="total",
+            insidetextorientation="radial",
+            hovertext=payload["hovertext"],
+            hoverinfo="text",
+        )
+    )
+    fig.update_layout(
+        margin=dict(t=40, l=20, r=20, b=20),
+        title_text="과목별 공부 시간 분포 (클릭하여 세부 항목 보기)",
+        title_x=0.5,
+    )
+    return fig
+
+
+def ensure_plotly_js(chart_dir=CHART_DIR):
+    """차트 폴더에 공용 plotly.js 파일을 (없을 때만) 만들고 파일 이름을 돌려줍니다."""
+    import plotly
+    from plotly.offline import get_plotlyjs
+
+    js_name = f"plotly-{plotly.__version__}.min.js"
+    js_path = os.path.join(chart_dir, js_name)
+    if not os.path.exists(js_path):
+        os.makedirs(chart_dir, exist_ok=True)
+        with open(f"{js_path}.tmp", "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+        os.replace(f"{js_path}.tmp", js_path)
+    return js_name
+
+
+@study_profile.profiled("chart:write_html")
+def write_chart_html(build_figure, data, name, chart_dir=CHART_DIR):
+    """data 의 해시로 이름 붙인 HTML 차트를 만들고 (경로, 재사용 여부)를 돌려줍니다.
+
+    같은 data 로 만든 파일이 이미 있으면 build_figure 를 부르지 않고 그대로 씁니다.
+    HTML 은 차트 폴더의 공용 plotly.js 를 참조하므로 인터넷 연결 없이 열립니다.
+    """
+    js_name = ensure_plotly_js(chart_dir)
+    digest = hashlib.sha256(
+        json.dumps([js_name, data], ensure_ascii=False, default=str).encode("utf-8")
+    ).hexdigest()[:16]
+    chart_path = os.path.join(chart_dir, f"{name}-{digest}.html")
+    if os.path.exists(chart_path):
+        return chart_path, True
+    build_figure().write_html(f"{chart_path}.tmp", include_plotlyjs=js_name)
+    os.replace(f"{chart_path}.tmp", chart_path)
+    _remove_old_charts(chart_dir, name, digest, [".html"])
+    return chart_path, False
+
+
+def _remove_old_charts(chart_dir, name, digest, extensions):
+    """같은 이름의 예전 차트(`<name>-<다른 해시><확장자>`)를 지워 폴더가 계속 커지지 않게 합니다."""
+    for old_name in os.listdir(chart_dir):
+        stem, ext = os.path.splitext(old_name)
+        old_digest = stem[len(name) + 1 :]
+        if (
+            ext in extensions
+            and stem.startswith(f"{name}-")
+            and len(old_digest) == len(digest)
+            and old_digest != digest
+            and all(c in "0123456789abcdef" for c in old_digest)
+        ):
+            os.remove(os.path.join(chart_dir, old_name))
+
+
+@study_profile.profiled("chart:write_image")
+def write_chart_image(build_figure, data, name, formats=("png",), chart_dir=CHART_DIR):
+    """data 의 해시로 이름 붙인 matplotlib 이미지(png/svg)를 만듭니다.
+
+    (경로 목록, 재사용 여부)를 돌려줍니다. 모든 형식의 파일이 이미 있으면
+    build_figure 를 부르지 않습니다. 화면 없이 그리므로 호출하기 전에 Agg 같은
+    비대화형 backend 를 정해 두어야 합니다.
+    """
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    digest = hashlib.sha256(
+        json.dumps(
+            [matplotlib.__version__, data], ensure_ascii=False, default=str
+        ).encode("utf-8")
+    ).hexdigest()[:16]
+    paths = [os.path.join(chart_dir, f"{name}-{digest}.{fmt}") for fmt in formats]
+    if all(os.path.exists(path) for path in paths):
+        return paths, True
+    os.makedirs(chart_dir, exist_ok=True)
+    fig = build_figure()
+    try:
+        with study_profile.phase("chart:savefig"):
+            for fmt, path in zip(formats, paths):
+                fig.savefig(f"{path}.tmp", format=fmt)
+                os.replace(f"{path}.tmp", path)
+    finally:
+        plt.close(fig)
+    _remove_old_charts(chart_dir, name, digest, [f".{fmt}" for fmt in formats])
+    return paths, False
+
+
+def trend_chart_data(daily_stats, resolution="day"):
+    """daily_study_stats 결과를 차트 해시용 목록(단위, 날짜와 각 컬럼 값)으로 바꿉니다."""
+    return [
+        resolution,
+        daily_stats.index.strftime("%Y-%m-%d").tolist(),
+        *(daily_stats[column].round(6).tolist() for column in daily_stats),
+    ]
+
+
+def is_headless():
+    """차트를 창·브라우저로 띄울 수 없는 환경인지 확인합니다.
+
+    HEADLESS_ENV 가 있거나, Linux 에서 DISPLAY·WAYLAND_DISPLAY 가 없으면 True.
+    """
+    if os.environ.get(HEADLESS_ENV):
+        return True
+    if platform.system() == "Linux":
+        return not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    return False
+
+
+_TREND_CACHE = {}
+
+
+def _group_daily(daily, resolution):
+    """날짜별 누적 통계를 resolution 단위로 더합니다. 인덱스는 각 기간의 첫날입니다."""
+    if resolution == "day":
+        return daily
+    periods = daily.index.to_period(TREND_RESOLUTIONS[resolution][0])
+    grouped = daily.groupby(periods.start_time).sum()
+    grouped.index.name = daily.index.name
+    return grouped
+
+
+@study_profile.profiled("trend_aggregates")
+def trend_aggregates():
+    """일·주·월 단위 누적 통계 {단위: DataFrame}. 기록이 없으면 None.
+
+    날짜별 누적 통계를 단위마다 한 번만 묶어 두고, 기록·삭제 표시 파일이 바뀌기
+    전까지는 그대로 씁니다. 기간을 바꿔 다시 그려도 기록을 다시 읽지 않습니다.
+    돌려준 표는 여러 호출이 함께 쓰므로 고치지 말고 복사해서 쓰세요.
+    """
+    import study_records
+
+    key = os.path.abspath(DATA_FILE)
+    stamp = (
+        _file_stamp(DATA_FILE),
+        _file_stamp(study_records.tombstone_path_for(DATA_FILE)),
+    )
+    cached = _TREND_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    daily = load_daily_stats()
+    if daily is None or daily.empty:
+        _TREND_CACHE.pop(key, None)
+        return None
+    aggregates = {
+        resolution: _group_daily(daily, resolution) for resolution in TREND_RESOLUTIONS
+    }
+    _TREND_CACHE[key] = (stamp, aggregates)
+    return aggregates
+
+
+def choose_trend_resolution(first_day, last_day):
+    """막대가 TREND_MAX_BARS 개를 넘지 않는 가장 촘촘한 단위."""
+    span_days = (last_day - first_day).days + 1
+    for resolution, (_, _, days) in TREND_RESOLUTIONS.items():
+        if span_days / days <= TREND_MAX_BARS:
+            return resolution
+    return resolution
+
+
+def trend_window(start=None, end=None, resolution=None):
+    """start~end(양 끝 포함) 추이 그래프용 (단위, 누적 통계 표). 기록이 없으면 None.
+
+    resolution 을 주지 않으면 기록이 걸친 기간의 길이로 정합니다. 범위 안에
+    통째로 든 주·월은 미리 묶어 둔 값을 그대로 쓰고, 범위에 걸친 처음·마지막
+    주·월만 그 안의 날짜별 값으로 다시 더합니다.
+    """
+    import pandas as pd
+
+    aggregates = trend_aggregates()
+    if aggregates is None:
+        return None
+    daily = aggregates["day"].loc[start:end]
+    if daily.empty:
+        return None
+    resolution = resolution or choose_trend_resolution(daily.index[0], daily.index[-1])
+    if resolution == "day":
+        return resolution, daily.copy()
+    periods = daily.index.to_period(TREND_RESOLUTIONS[resolution][0])
+    window = aggregates[resolution].loc[periods[0].start_time : periods[-1].start_time]
+    partial = [
+        period
+        for period in dict.fromkeys([periods[0], periods[-1]])
+        if (start is not None and period.start_time < start)
+        or (end is not None and period.end_time.normalize() > end)
+    ]
+    if partial:
+        in_partial = periods.isin(partial)
+        edges = daily[in_partial].groupby(periods[in_partial].start_time).sum()
+        window = pd.concat([window.drop(edges.index), edges]).sort_index()
+    return resolution, window.copy()
+
+
+def daily_study_stats(daily):
+    """기간별 총 공부 시간과 평균·최저·최고 집중도를 구합니다.
+
+    daily 는 load_daily_stats·trend_window 가 돌려주는 누적 통계 표입니다.
+    """
+    import numpy as np
+    import study_store
+
+    levels = np.array(study_store.CONCENTRATION_LEVELS)
+    seen = daily[[f"집중도 {level}" for level in levels]].to_numpy() > 0
+    return daily.assign(
+        total_time=daily["공부 시간(분)"],
+        avg_concentration=daily["집중도 합"] / daily["기록 수"],
+        min_concentration=levels[seen.argmax(axis=1)],
+        max_concentration=levels[len(levels) - 1 - seen[:, ::-1].argmax(axis=1)],
+    )[["total_time", "avg_concentration", "min_concentration", "max_concentration"]]
+
+
+@study_profile.profiled("chart:trend_figure")
+def trend_figure(daily_stats, resolution="day"):
+    """기간별 총 공부 시간(막대)과 평균 집중도(선), 최저~최고 집중도(띠) 그래프를 그립니다.
+
+    daily_stats 의 인덱스는 각 기간의 첫날이고, 막대·선은 기간의 가운데에 놓입니다.
+    """
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    study_profile.note_rows(len(daily_stats))
+    setup_korean_font()
+    _, title, days = TREND_RESOLUTIONS[resolution]
+    x = daily_stats.index + pd.Timedelta(days=(days - 1) / 2)
+    fig, ax1 = plt.subplots(figsize=(12, 6))
+    ax1.bar(
+        x,
+        daily_stats["total_time"],
+        width=days * 0.8,
+        color="skyblue",
+        label="총 공부 시간(분)",
+    )
+    ax1.set_xlabel("날짜")
+    ax1.set_ylabel("총 공부 시간(분)", color="skyblue")
+    ax1.tick_params(axis="y", labelcolor="skyblue")
+    ax2 = ax1.twinx()
+    ax2.fill_between(
+        x,
+        daily_stats["min_concentration"],
+        daily_stats["max_concentration"],
+        color="salmon",
+        alpha=0.2,
+        label="최저~최고 집중도",
+    )
+    ax2.plot(
+        x,
+        daily_stats["avg_concentration"],
+        color="salmon",
+        marker="o",
+        linestyle="--",
+        label="평균 집중도",
+    )
+    ax2.set_ylabel("평균 집중도", color="salmon")
+    ax2.tick_params(axis="y", labelcolor="salmon")
+    ax2.set_ylim(0, 6)
+    plt.title(f"{title} 총 공부 시간 및 평균 집중도 변화 추이", fontsize=16)
+    fig.tight_layout()
+    return fig
+
+
+@study_profile.profiled("menu:show_visualizations")
 def show_visualizations():
-    df = load_data()
-    if df is None or df.empty:
+    # 단위별 누적 통계를 여기서 한 번 묶어 두면 기간을 바꿔 그려도 다시 묶지 않습니다.
+    if trend_aggregates() is None:
         console.print("[yellow]분석할 데이터가 충분하지 않습니다.[/yellow]")
         return
     console.print(Rule("[bold cyan]통계 시각화[/bold cyan]"))
     console.print("1. 과목별 공부 시간 (대화형 원형 그래프)")
-    console.print("2. 날짜별 총 공부 시간 및 집중도 변화 (막대+선 그래프)")
+    console.print(
+        "2. 기간별 총 공부 시간 및 집중도 변화 (막대+선 그래프, 기간이 길면 주·월 단위)"
+    )
     choice = Prompt.ask(
         "보고 싶은 시각화 자료를 선택하세요", choices=["1", "2"], default="1"
     )
+    date_range = _ask_date_range()
+    if date_range is None:
+        return
+    start, end = date_range
     if choice == "1":
-        df["대분류"] = df["과목"].map(SUBJECT_TO_CATEGORY_MAP)
-        df.dropna(subset=["대분류"], inplace=True)
-        if df.empty:
+        # --- ## 4. 그래프 정보(Hover) 표시 변경 ## ---
+        payload = sunburst_payload(start, end)
+        if payload is None:
             console.print("[yellow]분석할 데이터가 없습니다.[/yellow]")
             return
 
-        # --- ## 4. 그래프 정보(Hover) 표시 변경 ## ---
-        df_leaves = (
-            df.groupby(["대분류", "과목"])
-            .agg(
-                total_time=("공부 시간(분)", "sum"),
-                contents=("공부 내용", lambda x: "<br>- ".join(x.dropna().unique())),
-            )
-            .reset_index()
-        )
-        df_parents_agg = (
-            df.groupby("대분류")
-            .agg(
-                total_time=("공부 시간(분)", "sum"),
-                subject_list=("과목", lambda x: "<br>- ".join(sorted(x.unique()))),
-            )
-            .reset_index()
-        )
-
-        ids, labels, parents, values, hovertexts = [], [], [], [], []
-
-        for index, row in df_parents_agg.iterrows():
-            ids.append(row["대분류"])
-            labels.append(row["대분류"])
-            parents.append("")
-            values.append(row["total_time"])
-            time_display = format_time_display(row["total_time"])
-            hovertexts.append(
-                f"<b>{row['대분류']}</b><br><br><b>총 공부 시간:</b> {time_display}<br><br><b>기록된 세부 과목:</b><br>- {row['subject_list']}"
-            )
-
-        for index, row in df_leaves.iterrows():
-            ids.append(f"{row['대분류']}-{row['과목']}")
-            labels.append(row["과목"])
-            parents.append(row["대분류"])
-            values.append(row["total_time"])
-            time_display = format_time_display(row["total_time"])
-            hovertexts.append(
-                f"<b>{row['과목']}</b><br><br><b>총 공부 시간:</b> {time_display}<br><br><b>공부 내용:</b><br>- {row['contents']}"
-            )
-
-        fig = go.Figure(
-            go.Sunburst(
-                ids=ids,
-                labels=labels,
-                parents=parents,
-                values=values,
-                branchvalues="total",
-                insidetextorientation="radial",
-                hovertext=hovertexts,
-                hoverinfo="text",
-            )
-        )
-        fig.update_layout(
-            margin=dict(t=40, l=20, r=20, b=20),
-            title_text="과목별 공부 시간 분포 (클릭하여 세부 항목 보기)",
-            title_x=0.5,
+        chart_filename, reused = write_chart_html(
+            lambda: sunburst_figure(payload), payload, "study_chart"
         )
-        chart_filename = "study_chart.html"
-        fig.write_html(chart_filename, include_plotlyjs="inline")
+        if is_headless():
+            saved = "기존 그래프가 있습니다" if reused else "그래프를 저장했습니다"
+            console.print(f"\n[green]'{chart_filename}' 이름으로 {saved}.[/green]")
+            return
+        saved = "기존 그래프를 다시 열고" if reused else "그래프를 저장하고"
         try:
-            webbrowser.open_new_tab(chart_filename)
+            webbrowser.open_new_tab(os.path.abspath(chart_filename))
             console.print(
-                f"\n[green]'{chart_filename}' 이름으로 그래프를 저장하고, 웹 브라우저에 표시했습니다.[/green]"
+                f"\n[green]'{chart_filename}' 이름으로 {saved}, 웹 브라우저에 표시했습니다.[/green]"
             )
         except webbrowser.Error:
             console.print(
@@ -294,44 +849,70 @@ def show_visualizations():
             )
 
     elif choice == "2":
-        daily_stats = (
-            df.groupby("날짜")
-            .agg(
-                total_time=("공부 시간(분)", "sum"),
-                avg_concentration=("집중도", "mean"),
+        window = trend_window(start, end)
+        if window is None:
+            console.print("[yellow]분석할 데이터가 없습니다.[/yellow]")
+            return
+        resolution, totals = window
+        stats = daily_study_stats(totals)
+        if is_headless():
+            import matplotlib
+
+            # 창을 띄울 수 없으므로 Agg 로 그려 PNG 파일만 만듭니다.
+            matplotlib.use("Agg")
+            paths, reused = write_chart_image(
+                lambda: trend_figure(stats, resolution),
+                trend_chart_data(stats, resolution),
+                "study_trend",
             )
-            .sort_index()
-        )
-        fig, ax1 = plt.subplots(figsize=(12, 6))
-        ax1.bar(
-            daily_stats.index,
-            daily_stats["total_time"],
-            color="skyblue",
-            label="총 공부 시간(분)",
-        )
-        ax1.set_xlabel("날짜")
-        ax1.set_ylabel("총 공부 시간(분)", color="skyblue")
-        ax1.tick_params(axis="y", labelcolor="skyblue")
-        ax2 = ax1.twinx()
-        ax2.plot(
-            daily_stats.index,
-            daily_stats["avg_concentration"],
-            color="salmon",
-            marker="o",
-            linestyle="--",
-            label="평균 집중도",
-        )
-        ax2.set_ylabel("평균 집중도", color="salmon")
-        ax2.tick_params(axis="y", labelcolor="salmon")
-        ax2.set_ylim(0, 6)
-        plt.title("날짜별 총 공부 시간 및 평균 집중도 변화 추이", fontsize=16)
-        fig.tight_layout()
+            saved = "기존 그래프가 있습니다" if reused else "그래프를 저장했습니다"
+            console.print(f"\n[green]'{paths[0]}' 이름으로 {saved}.[/green]")
+            return
+        import matplotlib.pyplot as plt
+
+        trend_figure(stats, resolution)
         plt.show()
 
 
+def analyze_feedback(stats):
+    """과목별 누적 통계(load_subject_stats)로 학습 피드백 항목을 계산합니다(화면 출력 없음)."""
+    feedback = {
+        "records": int(stats["기록 수"].sum()),
+        "lowest_concentration": None,
+        "imbalanced_subjects": [],
+        "most_efficient_subject": None,
+    }
+    avg_concentration_by_subject = (stats["집중도 합"] / stats["기록 수"]).sort_values(
+        kind="stable"
+    )
+    if (
+        not avg_concentration_by_subject.empty
+        and avg_concentration_by_subject.iloc[0] < 3
+    ):
+        feedback["lowest_concentration"] = {
+            "subject": avg_concentration_by_subject.index[0],
+            "average": float(avg_concentration_by_subject.iloc[0]),
+        }
+    total_study_time = stats["공부 시간(분)"].sum()
+    if total_study_time > 0:
+        subject_proportion = (stats["공부 시간(분)"] / total_study_time) * 100
+        imbalanced_subjects = subject_proportion[subject_proportion < 10]
+        feedback["imbalanced_subjects"] = [
+            {"subject": subject, "percent": float(percent)}
+            for subject, percent in imbalanced_subjects.items()
+        ]
+    efficiency_by_subject = (stats["효율성 점수 합"] / stats["기록 수"]).sort_values(
+        ascending=False, kind="stable"
+    )
+    if not efficiency_by_subject.empty:
+        feedback["most_efficient_subject"] = efficiency_by_subject.index[0]
+    return feedback
+
+
+@study_profile.profiled("menu:generate_feedback")
 def generate_feedback():
-    df = load_data()
-    if df is None or len(df) < 3:
+    stats = load_subject_stats()
+    if stats is None or stats["기록 수"].sum() < 3:
         console.print(
             Panel(
                 "[yellow]피드백을 생성하기에 데이터가 부족합니다.\n최소 3개 이상의 기록을 추가해주세요.[/yellow]",
@@ -348,37 +929,26 @@ def generate_feedback():
     )
     table.add_column("분석 항목", style="cyan", width=20)
     table.add_column("결과 및 조언")
-    avg_concentration_by_subject = df.groupby("과목")["집중도"].mean().sort_values()
-    if (
-        not avg_concentration_by_subject.empty
-        and avg_concentration_by_subject.iloc[0] < 3
-    ):
-        lowest_conc_subj = avg_concentration_by_subject.index[0]
-        lowest_conc_val = avg_concentration_by_subject.iloc[0]
+    feedback = analyze_feedback(stats)
+    lowest = feedback["lowest_concentration"]
+    if lowest is not None:
         table.add_row(
             "⚠️ 집중도 취약 과목",
-            f"과목 '[bold yellow]{lowest_conc_subj}[/bold yellow]'의 평균 집중도({lowest_conc_val:.1f})가 낮습니다.\n[italic]→ 기초 개념을 복습하거나, 학습 환경을 바꿔보세요.[/italic]",
+            f"과목 '[bold yellow]{lowest['subject']}[/bold yellow]'의 평균 집중도({lowest['average']:.1f})가 낮습니다.\n[italic]→ 기초 개념을 복습하거나, 학습 환경을 바꿔보세요.[/italic]",
         )
-    total_study_time = df["공부 시간(분)"].sum()
-    if total_study_time > 0:
-        subject_proportion = (
-            df.groupby("과목")["공부 시간(분)"].sum() / total_study_time
-        ) * 100
-        imbalanced_subjects = subject_proportion[subject_proportion < 10]
-        if not imbalanced_subjects.empty:
-            subjects_str = ", ".join(
-                [f"'[bold yellow]{s}[/bold yellow]'" for s in imbalanced_subjects.index]
-            )
-            table.add_row(
-                "📊 과목 불균형",
-                f"과목 {subjects_str}의 학습 비중이 전체의 10% 미만입니다.\n[italic]→ 장기적인 성장을 위해 균형 있는 학습 계획이 필요합니다.[/italic]",
-            )
-    df["효율성 점수"] = df["집중도"] * df["공부 시간(분)"]
-    efficiency_by_subject = (
-        df.groupby("과목")["효율성 점수"].mean().sort_values(ascending=False)
-    )
-    if not efficiency_by_subject.empty:
-        most_efficient_subject = efficiency_by_subject.index[0]
+    if feedback["imbalanced_subjects"]:
+        subjects_str = ", ".join(
+            [
+                f"'[bold yellow]{item['subject']}[/bold yellow]'"
+                for item in feedback["imbalanced_subjects"]
+            ]
+        )
+        table.add_row(
+            "📊 과목 불균형",
+            f"과목 {subjects_str}의 학습 비중이 전체의 10% 미만입니다.\n[italic]→ 장기적인 성장을 위해 균형 있는 학습 계획이 필요합니다.[/italic]",
+        )
+    most_efficient_subject = feedback["most_efficient_subject"]
+    if most_efficient_subject is not None:
         table.add_row(
             "💡 최고 효율 과목",
             f"과목 '[bold green]{most_efficient_subject}[/bold green]'를 공부할 때 가장 높은 효율을 보입니다.\n[italic]→ 이 과목을 공부할 때의 성공 요인(시간, 장소, 방법 등)을 다른 과목에도 적용해보세요.[/italic]",
@@ -395,53 +965,182 @@ def generate_feedback():
         console.print(table)
 
 
+def goal_file_for(csv_path):
+    """학습 기록 CSV 에 대응하는 주간 목표 CSV 경로.
+
+    기본 기록 파일(study_log.csv)은 같은 폴더의 study_goals.csv 를, 다른 기록
+    파일은 같은 폴더의 `<이름>_goals.csv` 를 씁니다.
+    """
+    directory, name = os.path.split(csv_path)
+    if name == DEFAULT_DATA_FILE:
+        return os.path.join(directory, DEFAULT_GOAL_FILE)
+    base, ext = os.path.splitext(name)
+    return os.path.join(directory, f"{base}{GOAL_FILE_SUFFIX}{ext}")
+
+
+def week_start_of(day):
+    """day 가 속한 주의 월요일(date)."""
+    return day - timedelta(days=day.weekday())
+
+
+def save_weekly_goal(goal_hours, week_start=None, student=""):
+    """week_start(기본: 이번 주) 주간 목표를 저장합니다. 같은 주의 목표는 바꿉니다."""
+    import study_goals
+
+    week_start = week_start or week_start_of(datetime.now().date())
+    # 목표 파일에 한 행만 덧붙입니다. 같은 주의 예전 목표는 이력으로 남습니다.
+    study_goals.set_goal(GOAL_FILE, week_start, goal_hours, student)
+    return week_start
+
+
+@study_profile.profiled("menu:set_weekly_goal")
 def set_weekly_goal():
     console.print(Rule("[bold cyan]주간 목표 설정[/bold cyan]"))
     goal_hours = FloatPrompt.ask("- 이번 주 목표 공부 시간을 입력하세요 (시간 단위)")
-    today = datetime.now().date()
-    start_of_week = today - timedelta(days=today.weekday())
-    new_goal = {
-        "주 시작일": [start_of_week.strftime("%Y-%m-%d")],
-        "목표 시간(시간)": [goal_hours],
-    }
-    df_new_goal = pd.DataFrame(new_goal)
-    if not os.path.exists(GOAL_FILE):
-        df_new_goal.to_csv(GOAL_FILE, index=False, encoding="utf-8-sig")
-    else:
-        df_goals = pd.read_csv(GOAL_FILE, encoding="utf-8-sig")
-        df_goals = df_goals[df_goals["주 시작일"] != start_of_week.strftime("%Y-%m-%d")]
-        df_goals = pd.concat([df_goals, df_new_goal], ignore_index=True)
-        df_goals.to_csv(GOAL_FILE, index=False, encoding="utf-8-sig")
+    save_weekly_goal(goal_hours)
     console.print(
         f"[bold green]✅ 이번 주 목표({goal_hours}시간)가 설정되었습니다.[/bold green]"
     )
 
 
+def goal_achievement(week_start=None, student=""):
+    """week_start(기본: 이번 주) 주간 목표 달성 현황을 dict 로 돌려줍니다.
+
+    status 는 목표 파일이 없으면 "no_goal_file", 그 주 목표가 없으면 "no_goal",
+    계산했으면 "ok" 입니다. student 는 목표 파일 안의 학생 이름입니다.
+    """
+    import pandas as pd
+    import study_goals
+
+    week_start = week_start or week_start_of(datetime.now().date())
+    result = {"status": "ok", "week_start": week_start.strftime("%Y-%m-%d")}
+    if not os.path.exists(GOAL_FILE):
+        return {**result, "status": "no_goal_file"}
+    goal_hours = study_goals.get_goal(GOAL_FILE, week_start, student)
+    if goal_hours is None:
+        return {**result, "status": "no_goal"}
+    study_minutes = 0.0
+    daily = load_daily_stats()
+    if daily is not None:
+        # 주의 시작(월요일)부터 일요일까지 7일치 날짜별 합계만 더합니다.
+        week_begin = pd.Timestamp(week_start)
+        in_week = (daily.index >= week_begin) & (
+            daily.index < week_begin + pd.Timedelta(days=7)
+        )
+        study_minutes = float(daily.loc[in_week, "공부 시간(분)"].sum())
+    study_hours = study_minutes / 60
+    achievement_rate = (study_hours / goal_hours) * 100 if goal_hours > 0 else 0
+    return {
+        **result,
+        "goal_hours": goal_hours,
+        "study_hours": study_hours,
+        "achievement_rate": achievement_rate,
+    }
+
+
+# (기록 파일, 목표 파일, 학생) → (파일 상태, 주간 목표 기록 표)
+_GOAL_REPORT_CACHE = {}
+
+
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+@study_profile.profiled("goal_history_report")
+def goal_history_report(student=""):
+    """목표가 있는 모든 주의 달성률·연속 달성 주 수·추세를 한 번에 계산합니다.
+
+    날짜별 누적 통계를 주(월요일 시작) 단위로 묶어 목표와 주 시작일로 맞춥니다.
+    계산량은 날짜 수 + 목표 주 수에 비례하고, 기록·삭제 표시·목표 파일이 바뀌기
+    전까지는 계산해 둔 표를 그대로 돌려줍니다. 목표 파일이 없으면 None.
+    """
+    import pandas as pd
+    import study_goals
+    import study_records
+
+    if not os.path.exists(GOAL_FILE):
+        return None
+    key = (os.path.abspath(DATA_FILE), os.path.abspath(GOAL_FILE), student)
+    stamp = (
+        _file_stamp(DATA_FILE),
+        _file_stamp(study_records.tombstone_path_for(DATA_FILE)),
+        _file_stamp(GOAL_FILE),
+    )
+    cached = _GOAL_REPORT_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1].copy()
+
+    goals = study_goals.weekly_goals(GOAL_FILE, student)
+    weeks = pd.DatetimeIndex(list(goals), name="주 시작일")
+    goal_hours = pd.Series(list(goals.values()), index=weeks, dtype="float64")
+    study_hours = pd.Series(0.0, index=weeks)
+    daily = load_daily_stats()
+    if daily is not None and not daily.empty:
+        # 날짜를 그 주의 월요일로 옮겨 묶으면 week_start_of 와 같은 주가 됩니다.
+        week_of_day = daily.index - pd.to_timedelta(daily.index.weekday, unit="D")
+        weekly = daily["공부 시간(분)"].groupby(week_of_day).sum() / 60
+        study_hours = weekly.reindex(weeks, fill_value=0.0)
+
+    rate = (study_hours / goal_hours * 100).where(goal_hours > 0, 0.0)
+    achieved = rate >= 100
+    # 달성하지 못한 주나 목표가 없는 주를 건너뛰면 연속 달성이 끊깁니다.
+    consecutive = weeks.to_series().diff() == pd.Timedelta(days=7)
+    run_id = (~achieved | ~consecutive).cumsum()
+    report = pd.DataFrame(
+        {
+            "목표 시간(시간)": goal_hours,
+            "공부 시간(시간)": study_hours,
+            "달성률(%)": rate,
+            "달성": achieved,
+            "연속 달성(주)": achieved.astype("int64").groupby(run_id).cumsum(),
+            "달성률 추세(%)": rate.rolling(GOAL_TREND_WEEKS, min_periods=1).mean(),
+        },
+        index=weeks,
+    )
+    _GOAL_REPORT_CACHE[key] = (stamp, report)
+    return report.copy()
+
+
+def goal_report_summary(report):
+    """goal_history_report 결과를 요약합니다. 추세는 주당 달성률 변화(%p)입니다."""
+    import numpy as np
+
+    if report is None or report.empty:
+        return {"weeks": 0}
+    trend = None
+    if len(report) >= 2:
+        week_numbers = (report.index - report.index[0]).days.to_numpy() / 7
+        trend = float(np.polyfit(week_numbers, report["달성률(%)"].to_numpy(), 1)[0])
+    return {
+        "weeks": len(report),
+        "achieved_weeks": int(report["달성"].sum()),
+        "average_achievement_rate": float(report["달성률(%)"].mean()),
+        "current_streak": int(report["연속 달성(주)"].iloc[-1]),
+        "longest_streak": int(report["연속 달성(주)"].max()),
+        "trend_per_week": trend,
+    }
+
+
+@study_profile.profiled("menu:check_goal_achievement")
 def check_goal_achievement():
     console.print(Rule("[bold cyan]주간 목표 달성률 확인[/bold cyan]"))
-    df_study = load_data()
-    if not os.path.exists(GOAL_FILE):
+    achievement = goal_achievement()
+    if achievement["status"] == "no_goal_file":
         console.print(
             "[yellow]설정된 목표가 없습니다. 먼저 주간 목표를 설정해주세요.[/yellow]"
         )
         return
-    df_goals = pd.read_csv(GOAL_FILE, encoding="utf-8-sig")
-    df_goals["주 시작일"] = pd.to_datetime(df_goals["주 시작일"])
-    today = datetime.now()
-    start_of_week = today - timedelta(days=today.weekday())
-    current_goal = df_goals[df_goals["주 시작일"].dt.date == start_of_week.date()]
-    if current_goal.empty:
+    if achievement["status"] == "no_goal":
         console.print("[yellow]이번 주 목표가 설정되지 않았습니다.[/yellow]")
+        _print_goal_history()
         return
-    goal_hours = current_goal["목표 시간(시간)"].iloc[0]
-    study_minutes_this_week = 0
-    if df_study is not None:
-        this_week_data = df_study[df_study["날짜"] >= start_of_week]
-        study_minutes_this_week = this_week_data["공부 시간(분)"].sum()
-    study_hours_this_week = study_minutes_this_week / 60
-    achievement_rate = (
-        (study_hours_this_week / goal_hours) * 100 if goal_hours > 0 else 0
-    )
+    goal_hours = achievement["goal_hours"]
+    study_hours_this_week = achievement["study_hours"]
+    achievement_rate = achievement["achievement_rate"]
     table = Table(show_header=False, box=None, padding=0)
     table.add_column(width=20)
     table.add_column()
@@ -454,74 +1153,208 @@ def check_goal_achievement():
     console.print("\n[bold]🏆 달성률: {:.2f} %[/bold]".format(achievement_rate))
     progress = ProgressBar(total=100, completed=min(achievement_rate, 100), width=50)
     console.print(progress)
+    _print_goal_history()
 
 
-def delete_study_record():
-    console.print(Rule("[bold red]학습 기록 삭제[/bold red]"))
-    df = load_data()
-    if df is None or df.empty:
-        console.print("[yellow]삭제할 기록이 없습니다.[/yellow]")
+def _print_goal_history():
+    """최근 주간 목표 기록과 연속 달성 주 수, 달성률 추세를 보여 줍니다."""
+    report = goal_history_report()
+    if report is None or report.empty:
         return
-    table = Table(title="전체 학습 기록", show_header=True, header_style="bold magenta")
-    table.add_column("번호", style="dim", width=6)
+    summary = goal_report_summary(report)
+    table = Table(
+        title=f"최근 {GOAL_REPORT_WEEKS}주 목표 기록",
+        show_header=True,
+        header_style="bold magenta",
+    )
+    table.add_column("주 시작일", style="cyan")
+    table.add_column("목표", justify="right")
+    table.add_column("공부", justify="right")
+    table.add_column("달성률", justify="right")
+    table.add_column("연속 달성", justify="right")
+    recent = report.tail(GOAL_REPORT_WEEKS)
+    for week, goal, hours, rate, achieved, streak in zip(
+        recent.index,
+        recent["목표 시간(시간)"],
+        recent["공부 시간(시간)"],
+        recent["달성률(%)"],
+        recent["달성"],
+        recent["연속 달성(주)"],
+    ):
+        color = "green" if achieved else "red"
+        table.add_row(
+            week.strftime("%Y-%m-%d"),
+            f"{goal:.1f}시간",
+            f"{hours:.1f}시간",
+            f"[{color}]{rate:.1f}%[/{color}]",
+            f"{streak}주",
+        )
+    console.print()
+    console.print(table)
+    console.print(
+        f"🔥 연속 달성: [bold]{summary['current_streak']}주[/bold]"
+        f" (최장 {summary['longest_streak']}주),"
+        f" 달성한 주 {summary['achieved_weeks']}/{summary['weeks']}"
+    )
+    if summary["trend_per_week"] is not None:
+        trend = summary["trend_per_week"]
+        arrow = "📈" if trend >= 0 else "📉"
+        console.print(f"{arrow} 달성률 추세: 주당 {trend:+.1f}%p")
+
+
+def _ask_date_range():
+    """날짜 범위를 입력받아 (시작, 끝) 을 돌려줍니다. 비운 쪽은 None, 잘못되면 None."""
+    start = Prompt.ask("- 시작 날짜 (YYYY-MM-DD, 비워두면 처음부터)", default="")
+    end = Prompt.ask("- 끝 날짜 (YYYY-MM-DD, 비워두면 오늘까지)", default="")
+    try:
+        return (
+            datetime.strptime(start, "%Y-%m-%d") if start else None,
+            datetime.strptime(end, "%Y-%m-%d") if end else None,
+        )
+    except ValueError:
+        console.print("[red]오류: 날짜는 YYYY-MM-DD 형식으로 입력해주세요.[/red]")
+        return None
+
+
+def _ask_record_filters():
+    """기록 목록 필터(날짜 범위, 과목, 집중도 범위)를 입력받습니다."""
+    filters = {}
+    date_range = _ask_date_range()
+    if date_range is None:
+        return {}
+    subject = Prompt.ask("- 과목 이름에 포함된 글자 (비워두면 전체)", default="")
+    concentration = Prompt.ask("- 집중도 범위 (예: 1-3, 비워두면 전체)", default="")
+    filters["start"], filters["end"] = date_range
+    try:
+        if concentration:
+            low, _, high = concentration.partition("-")
+            filters["concentration"] = (int(low), int(high or low))
+    except ValueError:
+        console.print(
+            "[red]오류: 입력 형식이 올바르지 않아 필터를 적용하지 않습니다.[/red]"
+        )
+        return {}
+    if subject:
+        filters["subject"] = subject
+    return filters
+
+
+def _record_page_table(page_df, page, page_count, total):
+    """기록 목록의 한 페이지만 표로 만듭니다."""
+    table = Table(
+        title=f"학습 기록 (최신순, {page + 1}/{page_count} 페이지, 총 {total}건)",
+        show_header=True,
+        header_style="bold magenta",
+    )
+    table.add_column("기록 ID", style="dim", width=8)
     table.add_column("날짜", style="cyan")
     table.add_column("과목", style="green")
     table.add_column("공부 시간", justify="right")
     table.add_column("집중도", justify="right")
-
-    for index, row in df.iterrows():
+    for record_id, date, subject, minutes, concentration in zip(
+        page_df["기록 ID"],
+        page_df["날짜"].dt.strftime("%Y-%m-%d"),
+        page_df["과목"],
+        page_df["공부 시간(분)"],
+        page_df["집중도"],
+    ):
         # --- ## 3. 삭제 목록 표시 변경 ## ---
-        time_display = format_time_display(row["공부 시간(분)"])
         table.add_row(
-            str(index),
-            row["날짜"].strftime("%Y-%m-%d"),
-            row["과목"],
-            time_display,
-            str(row["집중도"]),
+            str(record_id),
+            date,
+            subject,
+            format_time_display(minutes),
+            str(concentration),
         )
+    return table
 
-    console.print(table)
-    console.print("[yellow]삭제를 원하지 않으면 'c'를 입력하세요.[/yellow]")
+
+@study_profile.profiled("menu:delete_study_record")
+def delete_study_record():
+    import study_store
+
+    console.print(Rule("[bold red]학습 기록 삭제[/bold red]"))
+    if not os.path.exists(DATA_FILE):
+        console.print("[yellow]삭제할 기록이 없습니다.[/yellow]")
+        return
+    # 삭제 표시는 기록 ID 로 남기므로 ID 가 없는 예전 CSV 는 여기서 한 번 고쳐 씁니다.
+    study_store.ensure_record_ids(DATA_FILE)
+    columns = ["기록 ID", "날짜", "과목", "공부 시간(분)", "집중도"]
+    filters = {}
+    page = 0
     while True:
+        # 화면에 보일 한 페이지만 꺼내서 표로 만듭니다.
+        page_df, total = study_store.query_records(
+            DATA_FILE,
+            STORE_DIR,
+            page=page,
+            page_size=RECORD_PAGE_SIZE,
+            columns=columns,
+            **filters,
+        )
+        if total == 0 and not filters:
+            console.print("[yellow]삭제할 기록이 없습니다.[/yellow]")
+            return
+        page_count = max(1, -(-total // RECORD_PAGE_SIZE))
+        console.print(_record_page_table(page_df, page, page_count, total))
+        console.print(
+            "[yellow]기록 ID 를 입력하면 바로 그 기록으로 이동합니다. "
+            "n: 다음 쪽, p: 이전 쪽, f: 필터, c: 취소[/yellow]"
+        )
+        choice = Prompt.ask("삭제할 기록의 '기록 ID' 또는 명령을 입력하세요").lower()
+        if choice == "c":
+            console.print("[green]삭제를 취소했습니다.[/green]")
+            return
+        if choice == "n":
+            page = min(page + 1, page_count - 1)
+            continue
+        if choice == "p":
+            page = max(page - 1, 0)
+            continue
+        if choice == "f":
+            filters = _ask_record_filters()
+            page = 0
+            continue
         try:
-            choice = Prompt.ask("삭제할 기록의 '번호'를 입력하세요")
-            if choice.lower() == "c":
-                console.print("[green]삭제를 취소했습니다.[/green]")
-                return
             record_to_delete = int(choice)
-            if record_to_delete in df.index:
-                break
-            else:
-                console.print(
-                    "[red]오류: 목록에 없는 번호입니다. 다시 입력해주세요.[/red]"
-                )
         except ValueError:
-            console.print("[red]오류: 숫자 또는 'c'만 입력해주세요.[/red]")
+            console.print("[red]오류: 기록 ID 또는 n, p, f, c 만 입력해주세요.[/red]")
+            continue
+        # 기록 ID 색인으로 해당 행만 바로 찾아 확인합니다.
+        record = study_store.lookup_record(DATA_FILE, record_to_delete)
+        if record is not None:
+            break
+        console.print("[red]오류: 목록에 없는 번호입니다. 다시 입력해주세요.[/red]")
     confirm = Prompt.ask(
-        f"정말로 [bold red]'{df.loc[record_to_delete, '과목']}'[/bold red] 기록을 삭제하시겠습니까?",
+        f"정말로 [bold red]'{record['과목']}'[/bold red] 기록({record['날짜']}, "
+        f"{format_time_display(record['공부 시간(분)'])})을 삭제하시겠습니까?",
         choices=["y", "n"],
         default="n",
     )
     if confirm.lower() == "y":
-        df.drop(record_to_delete, inplace=True)
-        df.reset_index(drop=True, inplace=True)
-        df.to_csv(DATA_FILE, index=False, encoding="utf-8-sig")
+        # CSV 를 다시 쓰지 않고 삭제 표시만 남깁니다. 표시가 쌓이면 백그라운드에서 압축합니다.
+        study_store.delete_records(DATA_FILE, [record_to_delete])
+        if study_store.needs_compaction(DATA_FILE):
+            study_store.compact_in_background(DATA_FILE, STORE_DIR)
         console.print("[bold green]✅ 기록이 성공적으로 삭제되었습니다.[/bold green]")
     else:
         console.print("[green]삭제를 취소했습니다.[/green]")
 
 
+def print_main_menu():
+    console.print(
+        Panel(
+            "[bold]1.[/bold] 공부 기록 추가\n[bold]2.[/bold] 통계 및 시각화 보기\n[bold]3.[/bold] 학습 피드백 받기\n[bold]4.[/bold] 주간 목표 설정\n[bold]5.[/bold] 주간 목표 달성률 확인\n[bold red]6.[/bold red] 학습 기록 삭제\n[bold]7.[/bold] 프로그램 종료",
+            title="📊 [bold green]학습 관리 및 분석 프로그램[/bold green] 📊",
+            subtitle="원하는 기능의 번호를 입력하세요",
+            border_style="blue",
+        )
+    )
+
+
 def main():
-    setup_korean_font()
     while True:
-        console.print(
-            Panel(
-                "[bold]1.[/bold] 공부 기록 추가\n[bold]2.[/bold] 통계 및 시각화 보기\n[bold]3.[/bold] 학습 피드백 받기\n[bold]4.[/bold] 주간 목표 설정\n[bold]5.[/bold] 주간 목표 달성률 확인\n[bold red]6.[/bold red] 학습 기록 삭제\n[bold]7.[/bold] 프로그램 종료",
-                title="📊 [bold green]학습 관리 및 분석 프로그램[/bold green] 📊",
-                subtitle="원하는 기능의 번호를 입력하세요",
-                border_style="blue",
-            )
-        )
+        print_main_menu()
         choice = Prompt.ask("선택", choices=["1", "2", "3", "4", "5", "6", "7"])
         if choice == "1":
             add_study_record()
@@ -543,4 +1376,25 @@ def main():
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="학습 관리 및 분석 프로그램")
+    parser.add_argument(
+        "--profile", action="store_true", help="단계별 실행 시간·메모리를 기록"
+    )
+    parser.add_argument(
+        "--profile-trace",
+        metavar="TRACE",
+        help="추적 파일 경로 (기본: study_profile.jsonl, 주면 --profile 도 켬)",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="차트를 창·브라우저로 띄우지 않고 charts 폴더에 파일로만 저장",
+    )
+    args = parser.parse_args()
+    if args.headless:
+        os.environ[HEADLESS_ENV] = "1"
+    if args.profile or args.profile_trace:
+        study_profile.enable(args.profile_trace)
     main()
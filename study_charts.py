@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""학생별·기간별 차트를 화면 없이(headless) 프로세스 풀로 한꺼번에 만듭니다.
+
+학생(`<이름>.csv`)과 기간(전체·월·주)마다 과목별 선버스트(plotly HTML)와 날짜별
+추이(matplotlib Agg 로 PNG/SVG)를 차트 폴더에 씁니다. 파일 이름에 입력 집계의
+해시가 붙으므로, 집계가 바뀌지 않은 차트는 다시 그리지 않고 기존 파일을 씁니다.
+창이나 브라우저를 띄우지 않으므로 디스플레이 없는 보고서 서버에서 돌릴 수 있습니다.
+
+    python study_cli.py chart batch logs/ --period month --format png svg --workers 8
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from rich.console import Console
+
+import sss
+import study_reports
+
+CHART_PERIODS = ["all", "month", "week"]
+IMAGE_FORMATS = ["png", "svg"]
+
+
+def chart_periods(dates, period="all"):
+    """날짜(정렬된 DatetimeIndex)가 걸친 기간을 (이름, 시작, 끝) 목록으로 나눕니다.
+
+    끝은 그 기간의 마지막 날(포함)이고, "all" 은 ("all", None, None) 하나입니다.
+    주는 월요일에 시작하며 이름은 ISO 주 번호(2026-W03)입니다.
+    """
+    if period == "all":
+        return [("all", None, None)]
+    if period not in CHART_PERIODS:
+        raise ValueError(f"알 수 없는 기간 단위입니다: {period}")
+    periods = []
+    for p in dates.to_period("M" if period == "month" else "W-SUN").unique():
+        if period == "month":
+            label = str(p)
+        else:
+            iso = p.start_time.isocalendar()
+            label = f"{iso.year}-W{iso.week:02d}"
+        periods.append((label, p.start_time, p.end_time.normalize()))
+    return periods
+
+
+def student_charts(csv_path, chart_dir, period="all", formats=("png",)):
+    """학생 한 명의 기간별 차트를 만들고 {"student", "charts"} 를 돌려줍니다.
+
+    charts 의 항목은 {"period", "kind", "paths", "reused"} 입니다. 호출하기 전에
+    matplotlib backend 를 Agg 로 정해 두어야 합니다(_init_worker).
+    """
+    student = study_reports.student_name(csv_path)
+    result = {"student": student, "charts": []}
+    try:
+        with study_reports.student_files(csv_path):
+            aggregates = sss.trend_aggregates()
+            if aggregates is None:
+                return result
+            for label, start, end in chart_periods(aggregates["day"].index, period):
+                window = sss.trend_window(start, end)
+                if window is None:
+                    continue
+                resolution, totals = window
+                name = f"{student}-{label}"
+                payload = sss.sunburst_payload(start, end)
+                if payload is not None:
+                    path, reused = sss.write_chart_html(
+                        lambda: sss.sunburst_figure(payload),
+                        payload,
+                        f"{name}-sunburst",
+                        chart_dir,
+                    )
+                    result["charts"].append(
+                        {
+                            "period": label,
+                            "kind": "sunburst",
+                            "paths": [path],
+                            "reused": reused,
+                        }
+                    )
+                stats = sss.daily_study_stats(totals)
+                paths, reused = sss.write_chart_image(
+                    lambda: sss.trend_figure(stats, resolution),
+                    sss.trend_chart_data(stats, resolution),
+                    f"{name}-trend",
+                    formats,
+                    chart_dir,
+                )
+                result["charts"].append(
+                    {"period": label, "kind": "trend", "paths": paths, "reused": reused}
+                )
+    except (OSError, ValueError, KeyError) as e:
+        # 한 학생의 파일이 잘못되어도 나머지 학생의 차트는 계속 만듭니다.
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _init_worker():
+    import matplotlib
+
+    matplotlib.use("Agg")
+    # 표준출력은 JSON 결과만 쓰도록 폰트 경고 등은 표준에러로 보냅니다.
+    sss.console = Console(stderr=True)
+
+
+def _chart_task(task):
+    return student_charts(*task)
+
+
+def run_charts(
+    csv_paths, chart_dir, period="all", formats=("png",), workers=None, chunksize=1
+):
+    """학생별 차트를 만듭니다. 결과 순서는 csv_paths 순서와 같습니다.
+
+    workers, chunksize 는 study_reports.run_reports 와 같습니다. 모든 HTML 이
+    함께 쓰는 plotly.js 는 작업자들이 동시에 쓰지 않도록 먼저 만들어 둡니다.
+    """
+    sss.ensure_plotly_js(chart_dir)
+    tasks = [(csv_path, chart_dir, period, tuple(formats)) for csv_path in csv_paths]
+    if workers == 1:
+        _init_worker()
+        return [_chart_task(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(_chart_task, tasks, chunksize=chunksize))
+
+
+def summarize_charts(results, seconds):
+    """학생별 결과를 합쳐 차트 수·새로 그린 수·초당 처리량을 요약합니다."""
+    charts = [chart for result in results for chart in result["charts"]]
+    rendered = sum(not chart["reused"] for chart in charts)
+    return {
+        "students": len(results),
+        "failed": [result["student"] for result in results if "error" in result],
+        "charts": len(charts),
+        "rendered": rendered,
+        "reused": len(charts) - rendered,
+        "files": sum(len(chart["paths"]) for chart in charts),
+        "seconds": round(seconds, 3),
+        "charts_per_sec": len(charts) / seconds if seconds else None,
+        "rendered_per_sec": rendered / seconds if seconds else None,
+    }
+
+
+def render_batch(csv_paths, chart_dir, period="all", formats=("png",), **pool_options):
+    """run_charts 를 실행하고 (요약, 학생별 결과)를 돌려줍니다."""
+    start = time.perf_counter()
+    results = run_charts(csv_paths, chart_dir, period, formats, **pool_options)
+    return summarize_charts(results, time.perf_counter() - start), results
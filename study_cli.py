@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""학습 관리 프로그램의 비대화형(batch) 명령줄 도구.
+
+sss.py 의 기능을 하위 명령으로 실행하고 결과를 JSON 으로 출력합니다.
+cron 이나 일괄 작업에서 사용합니다.
+
+    python study_cli.py add --subject 수학1 --minutes 50 --concentration 4
+    python study_cli.py import sessions.jsonl --format jsonl
+    python study_cli.py report feedback
+    python study_cli.py goal set --hours 20
+    python study_cli.py goal check
+    python study_cli.py goal report
+    python study_cli.py goal history --student 김철수
+    python study_cli.py chart sunburst
+    python study_cli.py chart trend --output trend.png
+    python study_cli.py chart batch logs/ --period month --format png svg
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+from datetime import datetime
+
+from rich.console import Console
+
+import sss
+import study_profile
+import study_records
+
+
+def read_raw_records(stream, fmt):
+    """입력 스트림의 행을 차례로 돌려줍니다. JSONL 은 해석 전 문자열 그대로입니다."""
+    if fmt == "jsonl":
+        yield from (line for line in stream if line.strip())
+    else:
+        yield from csv.DictReader(stream)
+
+
+def cmd_add(args):
+    record = study_records.parse_record(
+        {
+            "날짜": args.date,
+            "과목": args.subject,
+            "공부 시간(분)": args.minutes,
+            "공부 내용": args.content,
+            "집중도": args.concentration,
+        },
+        sss.SUBJECT_TO_CATEGORY_MAP,
+    )
+    record_ids = study_records.append_csv_records(sss.DATA_FILE, [record])
+    return {"ids": record_ids}
+
+
+def open_input(path):
+    """입력 파일을 엽니다. "-" 면 표준입력이며, 어느 쪽이든 맨 앞 BOM 은 뗍니다."""
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+    return open(path, encoding="utf-8-sig", newline="")
+
+
+def cmd_import(args):
+    errors = []
+    # --skip-invalid 면 검사를 통과한 행을 WRITE_BATCH_SIZE 건씩 바로 덧붙여 메모리에
+    # 모두 두지 않습니다. 아니면 모든 행을 검사한 뒤 한 번의 쓰기(fsync 1회)로 저장합니다.
+    writer = study_records.RecordWriter(
+        sss.DATA_FILE,
+        sss.SUBJECT_TO_CATEGORY_MAP,
+        study_records.WRITE_BATCH_SIZE if args.skip_invalid else None,
+        # 일괄 입력은 지난 기록이므로 날짜가 빠진 행을 오늘로 넣지 않습니다.
+        require_date=True,
+    )
+    with open_input(args.file) as stream:
+        for line_no, raw in enumerate(read_raw_records(stream, args.format), 1):
+            try:
+                if args.format == "jsonl":
+                    raw = json.loads(raw)
+                writer.add(raw)
+            except (TypeError, ValueError) as e:
+                errors.append({"line": line_no, "error": str(e)})
+    if errors and not args.skip_invalid:
+        writer.discard()
+        return {"imported": 0, "errors": errors}, 1
+    writer.close()
+    record_ids = writer.record_ids
+    result = {"imported": len(record_ids), "errors": errors}
+    if record_ids:
+        result["first_id"], result["last_id"] = record_ids[0], record_ids[-1]
+    return result
+
+
+def cmd_report_feedback(args):
+    stats = sss.load_subject_stats()
+    if stats is None or stats.empty:
+        return {"records": 0}
+    return sss.analyze_feedback(stats)
+
+
+def cmd_report_batch(args):
+    import study_reports
+
+    csv_paths = study_reports.find_student_logs(args.logs)
+    reports = study_reports.run_reports(
+        csv_paths, args.workers, args.chunksize, _parse_week(args.week)
+    )
+    return {"summary": study_reports.summarize_reports(reports), "reports": reports}
+
+
+def _parse_week(value):
+    if value is None:
+        return None
+    return sss.week_start_of(datetime.strptime(value, "%Y-%m-%d").date())
+
+
+def cmd_goal_set(args):
+    week_start = sss.save_weekly_goal(args.hours, _parse_week(args.week), args.student)
+    return {"week_start": week_start.strftime("%Y-%m-%d"), "goal_hours": args.hours}
+
+
+def cmd_goal_check(args):
+    return sss.goal_achievement(_parse_week(args.week), args.student)
+
+
+def cmd_goal_report(args):
+    report = sss.goal_history_report(args.student)
+    if report is None:
+        return {"weeks": []}
+    weeks = report.reset_index()
+    weeks["주 시작일"] = weeks["주 시작일"].dt.strftime("%Y-%m-%d")
+    return {
+        "summary": sss.goal_report_summary(report),
+        "weeks": weeks.to_dict(orient="records"),
+    }
+
+
+def cmd_goal_history(args):
+    import study_goals
+
+    history = study_goals.goal_history(
+        sss.GOAL_FILE,
+        args.student,
+        _parse_week(args.start),
+        _parse_week(args.end),
+    )
+    return {"history": history}
+
+
+def _parse_date(value):
+    return None if value is None else datetime.strptime(value, "%Y-%m-%d")
+
+
+def cmd_chart_sunburst(args):
+    payload = sss.sunburst_payload(_parse_date(args.start), _parse_date(args.end))
+    if payload is None:
+        return {"path": None}
+    path, reused = sss.write_chart_html(
+        lambda: sss.sunburst_figure(payload), payload, "study_chart"
+    )
+    return {"path": path, "reused": reused}
+
+
+def cmd_chart_trend(args):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    window = sss.trend_window(
+        _parse_date(args.start),
+        _parse_date(args.end),
+        None if args.resolution == "auto" else args.resolution,
+    )
+    if window is None:
+        return {"path": None}
+    resolution, totals = window
+    fig = sss.trend_figure(sss.daily_study_stats(totals), resolution)
+    with study_profile.phase("chart:savefig"):
+        fig.savefig(args.output)
+    return {"path": args.output, "resolution": resolution, "bars": len(totals)}
+
+
+def cmd_chart_batch(args):
+    import study_charts
+    import study_reports
+
+    summary, results = study_charts.render_batch(
+        study_reports.find_student_logs(args.logs),
+        args.out,
+        args.period,
+        args.format,
+        workers=args.workers,
+        chunksize=args.chunksize,
+    )
+    return {"summary": summary, "students": results}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="학습 관리 프로그램 batch 명령")
+    parser.add_argument("--data", default=sss.DATA_FILE, help="학습 기록 CSV 파일")
+    parser.add_argument(
+        "--goals", help="주간 목표 CSV 파일 (기본: 학습 기록 파일에 맞는 목표 파일)"
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="단계별 실행 시간·메모리를 기록"
+    )
+    parser.add_argument(
+        "--profile-trace",
+        metavar="TRACE",
+        help="추적 파일 경로 (기본: study_profile.jsonl, 주면 --profile 도 켬)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="학습 기록 한 건 추가")
+    add.add_argument("--date", help="YYYY-MM-DD (기본: 오늘)")
+    add.add_argument("--subject", required=True)
+    add.add_argument("--minutes", type=float, required=True)
+    add.add_argument("--content", default="")
+    add.add_argument("--concentration", type=int, required=True)
+    add.set_defaults(func=cmd_add)
+
+    bulk = commands.add_parser("import", help="CSV/JSONL 학습 기록 일괄 추가")
+    bulk.add_argument("file", nargs="?", default="-", help="파일 경로 (기본: 표준입력)")
+    bulk.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    bulk.add_argument(
+        "--skip-invalid", action="store_true", help="잘못된 행은 건너뛰고 저장"
+    )
+    bulk.set_defaults(func=cmd_import)
+
+    report = commands.add_parser("report", help="분석 보고서")
+    reports = report.add_subparsers(dest="report", required=True)
+    reports.add_parser("feedback", help="학습 피드백").set_defaults(
+        func=cmd_report_feedback
+    )
+    batch = reports.add_parser(
+        "batch", help="학생별 기록 파일의 피드백·주간 목표 보고서를 한꺼번에"
+    )
+    batch.add_argument("logs", nargs="+", help="학생별 CSV 파일, 폴더 또는 glob 패턴")
+    batch.add_argument("--workers", type=int, help="작업자 프로세스 수 (기본: CPU 수)")
+    batch.add_argument(
+        "--chunksize", type=int, default=1, help="작업자에게 한 번에 넘길 학생 수"
+    )
+    batch.add_argument("--week", help="그 주에 속한 날짜 (기본: 이번 주)")
+    batch.set_defaults(func=cmd_report_batch)
+
+    goal = commands.add_parser("goal", help="주간 목표")
+    goals = goal.add_subparsers(dest="goal", required=True)
+    goal_set = goals.add_parser("set", help="주간 목표 설정")
+    goal_set.add_argument("--hours", type=float, required=True)
+    goal_set.add_argument("--week", help="그 주에 속한 날짜 (기본: 이번 주)")
+    goal_set.set_defaults(func=cmd_goal_set)
+    goal_check = goals.add_parser("check", help="주간 목표 달성률")
+    goal_check.add_argument("--week", help="그 주에 속한 날짜 (기본: 이번 주)")
+    goal_check.set_defaults(func=cmd_goal_check)
+    goal_report = goals.add_parser(
+        "report", help="목표가 있는 모든 주의 달성률·연속 달성·추세"
+    )
+    goal_report.set_defaults(func=cmd_goal_report)
+    for goal_parser in (goal_set, goal_check, goal_report):
+        goal_parser.add_argument(
+            "--student", default="", help="목표 파일 안의 학생 이름"
+        )
+    goal_history = goals.add_parser("history", help="주간 목표 변경 이력")
+    goal_history.add_argument("--student", help="이 학생의 이력만 (기본: 모두)")
+    goal_history.add_argument("--start", help="이 날짜가 속한 주부터")
+    goal_history.add_argument("--end", help="이 날짜가 속한 주까지")
+    goal_history.set_defaults(func=cmd_goal_history)
+
+    chart = commands.add_parser("chart", help="차트 파일 생성")
+    charts = chart.add_subparsers(dest="chart", required=True)
+    sunburst = charts.add_parser("sunburst", help="과목별 공부 시간 HTML")
+    sunburst.set_defaults(func=cmd_chart_sunburst)
+    trend = charts.add_parser("trend", help="날짜별 추이 이미지")
+    trend.add_argument("--output", default="study_trend.png")
+    trend.add_argument(
+        "--resolution",
+        choices=["auto", *sss.TREND_RESOLUTIONS],
+        default="auto",
+        help="막대 하나의 기간 (기본: 기간 길이에 따라 자동)",
+    )
+    trend.set_defaults(func=cmd_chart_trend)
+    for chart_parser in (sunburst, trend):
+        chart_parser.add_argument("--start", help="시작 날짜 YYYY-MM-DD (포함)")
+        chart_parser.add_argument("--end", help="끝 날짜 YYYY-MM-DD (포함)")
+    chart_batch = charts.add_parser(
+        "batch", help="학생별·기간별 차트를 화면 없이 한꺼번에 (바뀐 것만 다시 그림)"
+    )
+    chart_batch.add_argument(
+        "logs", nargs="+", help="학생별 CSV 파일, 폴더 또는 glob 패턴"
+    )
+    chart_batch.add_argument("--out", default=sss.CHART_DIR, help="차트 폴더")
+    chart_batch.add_argument(
+        "--period",
+        choices=["all", "month", "week"],
+        default="all",
+        help="차트를 나눌 기간 단위",
+    )
+    chart_batch.add_argument(
+        "--format",
+        nargs="+",
+        choices=["png", "svg"],
+        default=["png"],
+        help="추이 차트 이미지 형식",
+    )
+    chart_batch.add_argument(
+        "--workers", type=int, help="작업자 프로세스 수 (기본: CPU 수)"
+    )
+    chart_batch.add_argument(
+        "--chunksize", type=int, default=1, help="작업자에게 한 번에 넘길 학생 수"
+    )
+    chart_batch.set_defaults(func=cmd_chart_batch)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # 표준출력은 JSON 결과만 쓰도록 안내 메시지는 표준에러로 보냅니다.
+    sss.console = Console(stderr=True)
+    sss.DATA_FILE = args.data
+    sss.GOAL_FILE = args.goals or sss.goal_file_for(args.data)
+    sss.STORE_DIR = study_records.store_dir_for(args.data)
+    if args.profile or args.profile_trace:
+        study_profile.enable(args.profile_trace)
+    try:
+        with study_profile.phase(f"cli:{args.func.__name__[len('cmd_'):]}"):
+            result = args.func(args)
+    except (OSError, ValueError) as e:
+        result = ({"error": str(e)}, 1)
+    exit_code = 0
+    if isinstance(result, tuple):
+        result, exit_code = result
+    print(json.dumps(result, ensure_ascii=False, default=str))
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
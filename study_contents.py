@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""세부 과목별 공부 내용 요약: 공부 시간이 많은 내용 몇 개와 서로 다른 내용 수.
+
+요약은 {과목: 요약} dict 이고, 과목 하나의 요약은 다음 값을 담습니다.
+
+- records, minutes: 그 과목의 기록 수와 공부 시간 합. 언제나 정확합니다.
+- contents: 공부 내용 → [기록 수, 공부 시간 합]. 서로 다른 내용이 SKETCH_SIZE 개
+  이하이면 모든 내용의 정확한 값입니다(exact). 넘으면 Misra-Gries 방식으로 모든
+  내용의 시간에서 같은 만큼을 덜어 SKETCH_SIZE 개만 남깁니다. 남은 시간은 실제보다
+  작을 수 있지만, 과목 공부 시간의 1/(SKETCH_SIZE+1) 보다 많이 공부한 내용은 반드시
+  남습니다.
+- hashes: exact 가 아닐 때 서로 다른 내용 수를 어림하는 데 쓰는, 내용 해시 중 가장
+  작은 DISTINCT_SKETCH_SIZE 개(KMV). 해시가 그보다 적으면 그 수가 정확한 값입니다.
+- subtracted: exact 가 아닌 요약에서 삭제된 기록을 뺀 적이 있으면 True.
+
+요약끼리는 더할 수 있으므로(merge) 저장소 세그먼트나 기록 조각마다 만든 요약을
+합쳐 전체 요약을 만들고, 메모리는 과목 수 × SKETCH_SIZE 에 비례합니다.
+"""
+
+import hashlib
+
+SKETCH_SIZE = 64
+DISTINCT_SKETCH_SIZE = 256
+CONTENT_COLUMNS = ["과목", "공부 내용", "공부 시간(분)"]
+
+
+def content_hash(content):
+    """프로세스·버전과 관계없이 같은 64비트 해시."""
+    digest = hashlib.blake2b(content.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def summarize(df):
+    """기록 프레임(CONTENT_COLUMNS)의 과목별 요약. 공부 내용이 빈 기록은 시간만 셉니다."""
+    return summarize_parts(df, [0] * len(df)).get(0, {})
+
+
+def summarize_parts(df, parts):
+    """기록마다 parts 로 묶은 부분별 요약 {부분: 요약}. 모든 부분을 한 번에 셉니다.
+
+    세그먼트 여러 개를 한 프레임으로 읽어 세그먼트마다 summarize 한 것과 같은 값을
+    만듭니다. 과목·공부 내용을 정수 코드로 바꿔 np.bincount 로 세므로 문자열
+    groupby 를 되풀이하지 않습니다.
+    """
+    import numpy as np
+    import pandas as pd
+
+    parts = np.asarray(parts)
+    subject_codes, subjects = pd.factorize(df["과목"], sort=True)
+    # 과목이 빈 기록은 세지 않습니다.
+    valid = subject_codes >= 0
+    if not valid.all():
+        df, parts, subject_codes = df[valid], parts[valid], subject_codes[valid]
+    if df.empty:
+        return {}
+    minutes = df["공부 시간(분)"].astype("float64").fillna(0.0).to_numpy()
+    content_codes, contents = pd.factorize(df["공부 내용"])
+    part_codes, part_values = pd.factorize(parts, sort=True)
+    part_values, subjects = part_values.tolist(), subjects.tolist()
+    # (부분, 과목) 을 정렬된 정수 키 하나로 묶습니다.
+    group_codes, group_keys = pd.factorize(
+        part_codes * len(subjects) + subject_codes, sort=True
+    )
+    records = np.bincount(group_codes)
+    totals = np.bincount(group_codes, weights=minutes)
+
+    has_content = content_codes >= 0
+    pair_codes, pair_keys = pd.factorize(
+        group_codes[has_content] * len(contents) + content_codes[has_content]
+    )
+    pairs = pd.DataFrame(
+        {
+            "group": pair_keys // len(contents),
+            "content": pair_keys % len(contents),
+            "size": np.bincount(pair_codes),
+            "sum": np.bincount(pair_codes, weights=minutes[has_content]),
+        }
+    ).sort_values(
+        ["group", "sum", "size"], ascending=[True, False, False], kind="stable"
+    )
+    rank = pairs.groupby("group").cumcount()
+    # 내용이 넘치는 과목은 (SKETCH_SIZE+1) 번째 시간을 모든 내용에서 덜어 냅니다.
+    threshold = pairs[rank == SKETCH_SIZE].set_index("group")["sum"]
+    kept = pairs[rank < SKETCH_SIZE]
+    kept = kept.assign(
+        sum=kept["sum"] - kept["group"].map(threshold).fillna(0.0).to_numpy()
+    )
+    kept = kept[~kept["group"].isin(threshold.index) | (kept["sum"] > 0)]
+    contents = [str(content) for content in contents.tolist()]
+    overflow = pairs[pairs["group"].isin(threshold.index)]
+    hashes = _smallest_hashes(
+        overflow["group"].to_numpy(), overflow["content"].to_numpy(), contents
+    )
+
+    # 결과 dict 는 행마다 만들어야 하므로 파이썬 리스트로 한 번씩만 훑습니다.
+    summaries = {}
+    groups = []
+    overflowed = set(threshold.index.tolist())
+    for number, key in enumerate(group_keys.tolist()):
+        part, subject = divmod(key, len(subjects))
+        summary = {
+            "records": int(records[number]),
+            "minutes": float(totals[number]),
+            "contents": {},
+            "exact": number not in overflowed,
+        }
+        summaries.setdefault(part_values[part], {})[subjects[subject]] = summary
+        groups.append(summary)
+    for number, content, count, total in zip(
+        kept["group"].tolist(),
+        kept["content"].tolist(),
+        kept["size"].tolist(),
+        kept["sum"].tolist(),
+    ):
+        groups[number]["contents"][contents[content]] = [count, total]
+    for number, values in hashes.items():
+        groups[number]["hashes"] = values
+    return summaries
+
+
+def _smallest_hashes(groups, content_codes, contents):
+    """(group, 내용 코드) 쌍에서 group 마다 가장 작은 내용 해시 DISTINCT_SKETCH_SIZE 개."""
+    import numpy as np
+
+    if not len(groups):
+        return {}
+    # 같은 내용은 과목이 달라도 한 번만 해시합니다.
+    values = np.zeros(len(contents), dtype=np.uint64)
+    for code in np.unique(content_codes).tolist():
+        values[code] = content_hash(contents[code])
+    hashes = values[content_codes]
+    order = np.lexsort((hashes, groups))
+    groups, hashes = groups[order], hashes[order]
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    ends = np.r_[starts[1:], len(groups)]
+    return {
+        int(groups[first]): hashes[
+            first : min(last, first + DISTINCT_SKETCH_SIZE)
+        ].tolist()
+        for first, last in zip(starts.tolist(), ends.tolist())
+    }
+
+
+def _hashes(summary):
+    if summary["exact"]:
+        return sorted(content_hash(content) for content in summary["contents"])
+    return summary["hashes"]
+
+
+def _prune(summary):
+    """내용이 SKETCH_SIZE 개를 넘으면 (SKETCH_SIZE+1) 번째 시간만큼 덜어 냅니다."""
+    contents = summary["contents"]
+    if len(contents) <= SKETCH_SIZE:
+        return
+    ranked = sorted(contents.items(), key=lambda item: (-item[1][1], -item[1][0]))
+    threshold = ranked[SKETCH_SIZE][1][1]
+    summary["contents"] = {
+        content: [count, total - threshold]
+        for content, (count, total) in ranked[:SKETCH_SIZE]
+        if total - threshold > 0
+    }
+
+
+def _merge_all(summaries):
+    """한 과목의 요약 여러 개를 더하고, 넘치는 내용은 마지막에 한 번만 덜어 냅니다."""
+    contents = {}
+    for summary in summaries:
+        for content, (count, total) in summary["contents"].items():
+            entry = contents.setdefault(content, [0, 0.0])
+            entry[0] += count
+            entry[1] += total
+    merged = {
+        "records": sum(summary["records"] for summary in summaries),
+        "minutes": sum(summary["minutes"] for summary in summaries),
+        "contents": contents,
+        "exact": len(contents) <= SKETCH_SIZE
+        and all(summary["exact"] for summary in summaries),
+    }
+    if not merged["exact"]:
+        hashes = set()
+        for summary in summaries:
+            hashes.update(_hashes(summary))
+        merged["hashes"] = sorted(hashes)[:DISTINCT_SKETCH_SIZE]
+    if any(summary.get("subtracted") for summary in summaries):
+        merged["subtracted"] = True
+    _prune(merged)
+    return merged
+
+
+def merge(parts):
+    """요약 목록을 하나로 더합니다. 넘겨준 요약은 고치지 않습니다."""
+    by_subject = {}
+    for part in parts:
+        for subject, summary in part.items():
+            by_subject.setdefault(subject, []).append(summary)
+    return {subject: _merge_all(summaries) for subject, summaries in by_subject.items()}
+
+
+def subtract(summaries, subject, content, minutes):
+    """삭제된 기록 한 건을 요약에서 뺍니다.
+
+    exact 요약에서는 정확히 빠집니다. 아닌 요약에서는 남아 있는 내용의 값만 빼고,
+    그 내용이 모두 지워졌는지 알 수 없으므로 서로 다른 내용 수는 어림값이 됩니다.
+    """
+    summary = summaries.get(subject)
+    if summary is None:
+        return
+    if not summary["exact"]:
+        summary["subtracted"] = True
+    summary["records"] -= 1
+    summary["minutes"] -= minutes
+    if summary["records"] <= 0:
+        del summaries[subject]
+        return
+    entry = summary["contents"].get(content) if content else None
+    if entry is None:
+        return
+    entry[0] -= 1
+    entry[1] -= minutes
+    if entry[0] <= 0 or (not summary["exact"] and entry[1] <= 0):
+        del summary["contents"][content]
+
+
+def top_contents(summary, limit):
+    """공부 시간이 많은 순(같으면 기록 수가 많은 순)으로 limit 개의 (내용, 기록 수, 시간)."""
+    ranked = sorted(
+        summary["contents"].items(),
+        key=lambda item: (-item[1][1], -item[1][0], item[0]),
+    )
+    return [(content, count, total) for content, (count, total) in ranked[:limit]]
+
+
+def distinct_contents(summary):
+    """서로 다른 공부 내용 수와 그 값이 정확한지 여부."""
+    if summary["exact"]:
+        return len(summary["contents"]), True
+    hashes = summary["hashes"]
+    if len(hashes) < DISTINCT_SKETCH_SIZE:
+        return len(hashes), not summary.get("subtracted", False)
+    # k 번째로 작은 해시가 h 이면 서로 다른 값은 약 (k-1)·2^64/h 개입니다(KMV).
+    return round((DISTINCT_SKETCH_SIZE - 1) * 2**64 / (hashes[-1] + 1)), False
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""주간 목표 저장소: (학생, 주 시작일) → 목표 시간(시간).
+
+study_goals.csv 는 목표를 정할 때마다 한 행을 덧붙이기만 하는 기록이고, 같은
+키의 마지막 행이 현재 목표입니다. 목표를 바꿔도 다른 행은 다시 쓰지 않으며
+예전 행은 변경 이력으로 남습니다. 읽은 내용은 파일과 함께 메모리에 두었다가
+뒤에 덧붙은 부분만 이어서 읽으므로, 한 주의 목표를 찾는 일은 dict 조회입니다.
+
+학생 컬럼이 없는 예전 목표 파일(주 시작일, 목표 시간)도 그대로 읽으며, 학생은
+빈 문자열("")로 봅니다. 처음 목표를 덧붙일 때 학생·설정 시각 컬럼이 있는
+형식으로 한 번 고쳐 씁니다. 손으로 고친 파일처럼 마지막 행이 줄바꿈 없이 끝나면,
+읽을 때 잠근 뒤 줄바꿈을 채워 그 행도 읽습니다.
+"""
+
+import csv
+import io
+import os
+from datetime import date, datetime
+
+import study_records
+
+STUDENT = "학생"
+WEEK_START = "주 시작일"
+GOAL_HOURS = "목표 시간(시간)"
+SET_AT = "설정 시각"
+GOAL_COLUMNS = [STUDENT, WEEK_START, GOAL_HOURS, SET_AT]
+
+# 목표 파일 경로 → {"inode", "offset", "header", "latest", "history"}
+_GOAL_CACHE = {}
+
+
+def _encode_rows(rows, header=False):
+    text = io.StringIO()
+    writer = csv.writer(text, lineterminator=os.linesep)
+    if header:
+        text.write("\ufeff")
+        writer.writerow(GOAL_COLUMNS)
+    writer.writerows(rows)
+    return text.getvalue().encode("utf-8")
+
+
+def _goal_entry(header, fields):
+    record = dict(zip(header, fields))
+    return {
+        "student": record.get(STUDENT, ""),
+        # 예전 파일의 "2025-08-11 00:00:00" 같은 값도 날짜 부분만 씁니다.
+        "week_start": date.fromisoformat(record[WEEK_START].strip()[:10]),
+        "goal_hours": float(record[GOAL_HOURS]),
+        "set_at": record.get(SET_AT) or None,
+    }
+
+
+def _read_goals(goal_path):
+    """목표 파일의 캐시 항목을 돌려줍니다. 지난번 뒤에 덧붙은 행만 새로 읽습니다.
+
+    파일이 없으면 None. 파일이 줄었거나 다른 파일로 바뀌었으면 처음부터 읽습니다.
+    """
+    key = os.path.abspath(goal_path)
+    try:
+        stat = os.stat(goal_path)
+    except FileNotFoundError:
+        _GOAL_CACHE.pop(key, None)
+        return None
+    cached = _GOAL_CACHE.get(key)
+    if (
+        cached is None
+        or cached["inode"] != stat.st_ino
+        or cached["offset"] > stat.st_size
+    ):
+        cached = _GOAL_CACHE[key] = {
+            "inode": stat.st_ino,
+            "offset": 0,
+            "header": None,
+            "latest": {},
+            "history": [],
+        }
+    if cached["offset"] == stat.st_size:
+        return cached
+    with open(goal_path, "rb") as f:
+        f.seek(cached["offset"])
+        data = f.read(stat.st_size - cached["offset"])
+    complete = data.rfind(b"\n") + 1
+    if complete < len(data):
+        # 줄바꿈 없이 끝난 마지막 행은 덧붙이는 중일 수도, 손으로 고친 파일의 끝일
+        # 수도 있습니다. 잠가서 쓰기가 끝나기를 기다린 뒤 줄바꿈을 채우고 다시 읽습니다.
+        with study_records.locked(goal_path):
+            _end_last_row(goal_path)
+        return _read_goals(goal_path)
+    rows = csv.reader(io.StringIO(data.decode("utf-8-sig")))
+    if cached["header"] is None:
+        cached["header"] = next(rows, None)
+    for fields in rows:
+        if not fields:
+            continue
+        entry = _goal_entry(cached["header"], fields)
+        cached["history"].append(entry)
+        cached["latest"][entry["student"], entry["week_start"]] = entry["goal_hours"]
+    cached["offset"] += len(data)
+    return cached
+
+
+def _end_last_row(goal_path):
+    """목표 파일이 줄바꿈 없이 끝나면 줄바꿈을 붙입니다. locked(goal_path) 안에서 부릅니다.
+
+    목표는 저널을 거쳐 덧붙이므로 잠근 뒤에도 줄바꿈이 없으면 덜 쓰인 행이 아니라
+    밖에서(엑셀 등) 저장한 파일의 마지막 행입니다. 그대로 두면 그 행을 읽지 못하고,
+    다음 행이 같은 줄에 덧붙습니다.
+    """
+    with open(goal_path, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        if not size:
+            return
+        f.seek(size - 1)
+        last = f.read(1)
+        if last == b"\n":
+            return
+        f.write(b"\n" if last == b"\r" else os.linesep.encode("ascii"))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _upgrade_goal_file(goal_path):
+    """학생·설정 시각 컬럼이 없는 예전 목표 파일을 새 형식으로 한 번 고쳐 씁니다."""
+    cached = _read_goals(goal_path)
+    if cached is None or cached["header"] in (None, GOAL_COLUMNS):
+        return
+    rows = [
+        [
+            entry["student"],
+            entry["week_start"].isoformat(),
+            entry["goal_hours"],
+            entry["set_at"] or "",
+        ]
+        for entry in cached["history"]
+    ]
+    tmp_path = f"{goal_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_encode_rows(rows, header=True))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, goal_path)
+
+
+def set_goal(goal_path, week_start, goal_hours, student=""):
+    """(student, week_start) 의 목표를 goal_hours 로 정합니다(upsert).
+
+    다른 행은 건드리지 않고 한 행만 덧붙입니다. 같은 키의 예전 목표는 이력에 남습니다.
+    """
+    row = [
+        student,
+        week_start.isoformat(),
+        float(goal_hours),
+        datetime.now().isoformat(timespec="seconds"),
+    ]
+    with study_records.locked(goal_path):
+        _upgrade_goal_file(goal_path)
+        new_file = not os.path.exists(goal_path) or not os.path.getsize(goal_path)
+        study_records.append_csv_bytes(goal_path, _encode_rows([row], new_file))
+
+
+def get_goal(goal_path, week_start, student=""):
+    """(student, week_start) 의 현재 목표 시간. 없으면 None."""
+    cached = _read_goals(goal_path)
+    if cached is None:
+        return None
+    return cached["latest"].get((student, week_start))
+
+
+def weekly_goals(goal_path, student=""):
+    """student 의 주 시작일 → 현재 목표 시간 dict (주 순서)."""
+    cached = _read_goals(goal_path)
+    if cached is None:
+        return {}
+    return {
+        week: hours
+        for (name, week), hours in sorted(cached["latest"].items())
+        if name == student
+    }
+
+
+def goal_history(goal_path, student=None, start=None, end=None):
+    """목표를 정한 이력을 정한 순서대로 돌려줍니다. 바뀌기 전의 목표도 포함합니다.
+
+    student 를 주면 그 학생만, start/end(date, 양 끝 포함)를 주면 그 기간에
+    시작하는 주만 돌려줍니다.
+    """
+    cached = _read_goals(goal_path)
+    if cached is None:
+        return []
+    return [
+        dict(entry)
+        for entry in cached["history"]
+        if (student is None or entry["student"] == student)
+        and (start is None or entry["week_start"] >= start)
+        and (end is None or entry["week_start"] <= end)
+    ]
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""메뉴 기능·기록 읽기·차트 쓰기의 단계별 실행 시간 측정(선택 사항).
+
+STUDY_PROFILE 환경 변수를 두거나(값이 "1" 이 아니면 추적 파일 경로로 씀)
+`python sss.py --profile` 로 실행하면 켜집니다. 꺼져 있을 때 profiled 로 감싼
+함수는 플래그 하나만 확인하고 그대로 호출합니다.
+
+켜져 있으면 단계(phase)마다 걸린 시간, 처리한 행 수, 그 단계 동안 늘어난 최대
+메모리(tracemalloc)를 추적 파일(JSONL)에 한 줄씩 덧붙입니다. 파일이
+TRACE_MAX_BYTES 를 넘으면 `<파일>.1` 로 넘기고 새로 시작합니다. 단계 안에서
+다른 단계를 부르면 parent 로 이어지고, 자체 시간(self)은 하위 단계를 뺀
+시간입니다(화면 그리기 등). 사용자 입력을 기다린 시간은 input 단계로 따로
+잡혀 메뉴 단계의 자체 시간에 섞이지 않습니다. 프로그램이 끝날 때 단계별 요약
+표를 표준에러에 출력합니다.
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+PROFILE_ENV = "STUDY_PROFILE"
+TRACE_FILE = "study_profile.jsonl"
+TRACE_MAX_BYTES = 1024 * 1024
+
+_state = {"enabled": False, "trace_path": TRACE_FILE, "session": None}
+# 단계 이름 → [호출 수, 총 시간, 자체 시간, 최대 시간, 행 수, 최대 메모리]
+_summary = {}
+_summary_lock = threading.Lock()
+# 스레드마다 지금 실행 중인 단계 목록(바깥 → 안쪽)
+_local = threading.local()
+
+
+def enabled():
+    return _state["enabled"]
+
+
+def enable(trace_path=None):
+    """측정을 켭니다. 추적 파일 경로를 주지 않으면 TRACE_FILE 을 씁니다."""
+    if _state["enabled"]:
+        return
+    _state.update(
+        enabled=True,
+        trace_path=os.path.abspath(trace_path or TRACE_FILE),
+        session=f"{datetime.now():%Y%m%dT%H%M%S}-{os.getpid()}",
+    )
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    # rich 의 Prompt 들은 모두 Console.input 으로 입력을 받습니다.
+    from rich.console import Console
+
+    Console.input = profiled("input")(Console.input)
+    atexit.register(print_summary)
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def note_rows(rows):
+    """지금 실행 중인 단계가 처리한 행 수를 더합니다(꺼져 있으면 무시)."""
+    stack = _stack() if _state["enabled"] else None
+    if stack:
+        stack[-1]["rows"] = (stack[-1]["rows"] or 0) + int(rows)
+
+
+@contextlib.contextmanager
+def phase(name):
+    """with 블록 하나를 name 단계로 잽니다."""
+    if not _state["enabled"]:
+        yield
+        return
+    stack = _stack()
+    current, peak = tracemalloc.get_traced_memory()
+    if stack:
+        # 바깥 단계의 최대 메모리를 남겨 둔 뒤 이 단계의 최대값을 새로 잽니다.
+        stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+    tracemalloc.reset_peak()
+    entry = {
+        "name": name,
+        "rows": None,
+        "start_memory": current,
+        "peak": current,
+        "children": 0.0,
+    }
+    stack.append(entry)
+    error = None
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        stack.pop()
+        entry["peak"] = max(entry["peak"], tracemalloc.get_traced_memory()[1])
+        if stack:
+            stack[-1]["peak"] = max(stack[-1]["peak"], entry["peak"])
+            stack[-1]["children"] += seconds
+        _record(entry, seconds, stack[-1]["name"] if stack else None, error)
+
+
+def _record(entry, seconds, parent, error):
+    self_seconds = max(seconds - entry["children"], 0.0)
+    peak_bytes = entry["peak"] - entry["start_memory"]
+    trace = {
+        "time": datetime.now().isoformat(timespec="milliseconds"),
+        "session": _state["session"],
+        "phase": entry["name"],
+        "parent": parent,
+        "seconds": round(seconds, 6),
+        "self_seconds": round(self_seconds, 6),
+        "rows": entry["rows"],
+        "peak_bytes": peak_bytes,
+    }
+    if error is not None:
+        trace["error"] = error
+    with _summary_lock:
+        totals = _summary.setdefault(entry["name"], [0, 0.0, 0.0, 0.0, 0, 0])
+        totals[0] += 1
+        totals[1] += seconds
+        totals[2] += self_seconds
+        totals[3] = max(totals[3], seconds)
+        totals[4] += entry["rows"] or 0
+        totals[5] = max(totals[5], peak_bytes)
+        _write_trace(trace)
+
+
+def _write_trace(trace):
+    path = _state["trace_path"]
+    try:
+        if os.path.getsize(path) > TRACE_MAX_BYTES:
+            os.replace(path, f"{path}.1")
+    except FileNotFoundError:
+        pass
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(trace, ensure_ascii=False) + "\n")
+
+
+def _count_rows(result):
+    # DataFrame·Series 처럼 shape 가 있는 결과만 행 수로 셉니다.
+    return len(result) if hasattr(result, "shape") else None
+
+
+def profiled(name):
+    """함수 호출 하나를 name 단계로 재는 데코레이터. 결과가 DataFrame 이면 행 수도 적습니다."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state["enabled"]:
+                return func(*args, **kwargs)
+            with phase(name):
+                result = func(*args, **kwargs)
+                rows = _count_rows(result)
+                if rows is not None:
+                    note_rows(rows)
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def summary_rows():
+    """(단계, 호출 수, 총 시간, 자체 시간, 최대 시간, 행 수, 최대 메모리) 목록, 총 시간순."""
+    with _summary_lock:
+        rows = [(name, *totals) for name, totals in _summary.items()]
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+def print_summary():
+    """단계별 요약 표를 표준에러에 출력합니다."""
+    rows = summary_rows()
+    if not rows:
+        return
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(
+        title=f"단계별 실행 시간 (추적 파일: {_state['trace_path']})",
+        show_header=True,
+        header_style="bold magenta",
+    )
+    table.add_column("단계", style="cyan", no_wrap=True)
+    for column in ["호출", "총 시간", "자체 시간", "최대 1회", "행 수", "최대 메모리"]:
+        table.add_column(column, justify="right")
+    for name, calls, total, self_total, longest, rows_done, peak in rows:
+        table.add_row(
+            name,
+            f"{calls}",
+            f"{total * 1000:.1f} ms",
+            f"{self_total * 1000:.1f} ms",
+            f"{longest * 1000:.1f} ms",
+            f"{rows_done:,}" if rows_done else "-",
+            f"{peak / 2**20:.1f} MiB",
+        )
+    Console(stderr=True).print(table)
+
+
+if os.environ.get(PROFILE_ENV):
+    value = os.environ[PROFILE_ENV]
+    enable(None if value == "1" else value)
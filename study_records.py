@@ -0,0 +1,500 @@
+# -*- coding: utf-8 -*-
+"""학습 기록 CSV 에 새 기록을 덧붙이는 pandas 없는 기록 작성기.
+
+기록 한 건을 추가할 때마다 한 줄짜리 DataFrame 을 만들지 않도록, 입력 검사와
+CSV 행 인코딩은 csv 모듈로 하고 파일 잠금·저널·기록 ID 색인·삭제 표시처럼
+덧붙이기에 필요한 파일 다루기도 이 모듈에 둡니다. study_store 는 이 함수들을
+가져다 쓰며, 대화형 기록 추가와 `study_cli.py add` 는 pandas 를 불러오지 않습니다.
+
+여러 기록을 이어서 넣을 때는 RecordWriter 가 검사한 기록을 모아 두었다가
+batch_size 건마다 한 번의 쓰기·fsync 로 덧붙입니다(`study_cli.py import`).
+
+group commit 은 같은 프로세스의 스레드끼리만 묶습니다. 다른 프로세스(터미널 두 개,
+일괄 입력과 대화형 프로그램)의 덧붙이기는 파일 잠금으로 차례를 지킬 뿐 묶이지
+않으므로, 덧붙이기 한 번마다 fsync 가 한 번 듭니다. 기록이 많으면 한 번에
+넘기거나 RecordWriter 로 모아서 넘겨야 fsync 수가 줄어듭니다.
+"""
+
+import contextlib
+import csv
+import io
+import json
+import os
+import struct
+import threading
+from datetime import datetime
+
+import study_profile
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+RECORD_ID = "기록 ID"
+# CSV 에 기록 ID 다음으로 저장되는 컬럼 (입력 기록 dict 의 키)
+RECORD_FIELDS = ["날짜", "과목", "공부 시간(분)", "공부 내용", "집중도"]
+CSV_HEADER = [RECORD_ID] + RECORD_FIELDS
+
+# RecordWriter 가 한 번에 덧붙이는 기본 기록 수
+WRITE_BATCH_SIZE = 1000
+
+# 색인 파일: 맨 앞 8바이트는 색인에 반영된 CSV 크기, 그 뒤로 ID 마다 8바이트 위치
+INDEX_SLOT = struct.Struct("<Q")
+
+
+def store_dir_for(csv_path):
+    """CSV 경로에 대응하는 저장소 폴더 경로를 돌려줍니다."""
+    base, _ = os.path.splitext(csv_path)
+    return f"{base}_store"
+
+
+def tombstone_path_for(csv_path):
+    """CSV 경로에 대응하는 삭제 표시(tombstone) 파일 경로를 돌려줍니다."""
+    base, _ = os.path.splitext(csv_path)
+    return f"{base}.tombstones"
+
+
+def index_path_for(csv_path):
+    """CSV 경로에 대응하는 기록 ID 색인 파일 경로를 돌려줍니다."""
+    base, _ = os.path.splitext(csv_path)
+    return f"{base}.idx"
+
+
+def lock_path_for(path):
+    """CSV(또는 목표 파일) 경로에 대응하는 잠금 파일 경로를 돌려줍니다."""
+    base, _ = os.path.splitext(path)
+    return f"{base}.lock"
+
+
+def journal_path_for(csv_path):
+    """CSV 경로에 대응하는 덧붙이기 저널 파일 경로를 돌려줍니다."""
+    base, _ = os.path.splitext(csv_path)
+    return f"{base}.journal"
+
+
+def _lock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue  # LK_LOCK 은 10초쯤 기다린 뒤 포기하므로 다시 시도합니다.
+
+
+def _unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# 같은 프로세스 안의 스레드(백그라운드 압축 등)끼리 막는 잠금 파일 경로별 잠금과,
+# 이 프로세스가 잡고 있는 파일 잠금(잠금 파일 경로 → [열린 파일, 중첩 깊이])
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+_held_file_locks = {}
+
+
+@contextlib.contextmanager
+def locked(path):
+    """path(CSV 또는 목표 파일)와 딸린 파일을 다른 스레드·프로세스와 겹치지 않게 잠급니다.
+
+    같은 스레드에서 겹쳐 잠가도 되고, 다른 파일의 잠금과는 서로 기다리지 않습니다.
+    처음 잠글 때 끝나지 못한 저널이 있으면 CSV 를 복구하고, 저널 없이 덧붙이다
+    멈춘 마지막 행을 정리합니다.
+    """
+    key = os.path.abspath(lock_path_for(path))
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(key, threading.RLock())
+    with thread_lock:
+        held = _held_file_locks.get(key)
+        if held is None:
+            lock_file = open(key, "a+b")
+            _lock_file(lock_file)
+            held = _held_file_locks[key] = [lock_file, 0]
+        held[1] += 1
+        try:
+            if held[1] == 1:
+                _recover_journal(path)
+                _repair_torn_row(path)
+            yield
+        finally:
+            held[1] -= 1
+            if held[1] == 0:
+                del _held_file_locks[key]
+                _unlock_file(held[0])
+                held[0].close()
+
+
+def _write_csv_bytes(csv_path, offset, payload):
+    """CSV 를 offset 바이트로 자르고 그 뒤에 payload 를 씁니다(fsync)."""
+    with open(csv_path, "r+b" if os.path.exists(csv_path) else "w+b") as f:
+        f.truncate(offset)
+        f.seek(offset)
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _recover_journal(csv_path):
+    """끝나지 못한 덧붙이기가 저널에 있으면 CSV 를 그 직전 크기로 자르고 다시 씁니다."""
+    journal_path = journal_path_for(csv_path)
+    try:
+        with open(journal_path, "rb") as f:
+            header = f.readline()
+            payload = f.read()
+    except FileNotFoundError:
+        return
+    try:
+        meta = json.loads(header)
+        complete = len(payload) == meta["length"]
+    except (ValueError, KeyError):
+        complete = False
+    # 저널 자체가 덜 쓰였다면 CSV 는 아직 건드리지 않은 것이므로 버리기만 합니다.
+    if complete:
+        _write_csv_bytes(csv_path, meta["csv_size"], payload)
+    os.remove(journal_path)
+
+
+def _is_complete_row(row):
+    """줄바꿈을 뺀 학습 기록 CSV 행(바이트)이 끝까지 쓰인 기록인지."""
+    try:
+        fields = next(csv.reader([row.decode("utf-8")]))
+        record = dict(zip(CSV_HEADER, fields))
+        datetime.strptime(record["날짜"], "%Y-%m-%d")
+        float(record["공부 시간(분)"])
+    except (UnicodeDecodeError, ValueError, KeyError, StopIteration):
+        return False
+    # 집중도는 한 자리 수이므로 마지막 필드까지 있으면 덜 쓰인 행이 아닙니다.
+    return (
+        len(fields) == len(CSV_HEADER)
+        and fields[0].isdigit()
+        and record["집중도"] in {"1", "2", "3", "4", "5"}
+    )
+
+
+def _repair_torn_row(csv_path):
+    """줄바꿈 없이 끝난 학습 기록 CSV 의 마지막 행을 정리합니다.
+
+    저널 없이 한 건을 덧붙이다 멈췄거나 밖에서 마지막 줄바꿈 없이 저장한
+    경우입니다. 마지막 행이 온전한 기록이면 줄바꿈을 붙이고, 덜 쓰인 행이면
+    잘라 냅니다. 머리글이 CSV_HEADER 가 아닌 파일(목표 파일 등)은 두지 않습니다.
+    """
+    try:
+        f = open(csv_path, "r+b")
+    except FileNotFoundError:
+        return
+    with f:
+        size = f.seek(0, os.SEEK_END)
+        if not size:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        f.seek(0)
+        header = f.readline().decode("utf-8-sig", errors="replace").rstrip("\r\n")
+        if next(csv.reader([header]), []) != CSV_HEADER:
+            return
+        start = size
+        while start > 0:
+            step = min(start, 1 << 16)
+            f.seek(start - step)
+            newline = f.read(step).rfind(b"\n")
+            if newline >= 0:
+                start += newline + 1 - step
+                break
+            start -= step
+        f.seek(start)
+        row = f.read()
+        if start == 0 or _is_complete_row(row.rstrip(b"\r")):
+            f.write(b"\n" if row.endswith(b"\r") else os.linesep.encode("ascii"))
+        else:
+            f.truncate(start)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def append_csv_bytes(csv_path, payload, journal=True):
+    """payload 를 CSV 끝에 덧붙이고(fsync) 덧붙인 위치를 돌려줍니다.
+
+    journal 이면 먼저 저널에 쓰고(fsync) 덧붙이므로, 중간에 멈춰도 다음에 잠글
+    때 payload 전체가 들어가거나 하나도 들어가지 않습니다. 학습 기록 CSV 에
+    기록 한 건만 덧붙일 때는 journal=False 로 fsync 를 한 번 줄일 수 있습니다.
+    그때 덜 쓰인 행은 다음에 잠글 때 잘라 냅니다(_repair_torn_row).
+    locked(csv_path) 안에서 불러야 합니다.
+    """
+    offset = os.path.getsize(csv_path) if os.path.exists(csv_path) else 0
+    if not journal:
+        _write_csv_bytes(csv_path, offset, payload)
+        return offset
+    journal_path = journal_path_for(csv_path)
+    with open(journal_path, "wb") as f:
+        meta = {"csv_size": offset, "length": len(payload)}
+        f.write(json.dumps(meta).encode("utf-8") + b"\n")
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    _write_csv_bytes(csv_path, offset, payload)
+    os.remove(journal_path)
+    return offset
+
+
+def has_record_ids(csv_path):
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        return RECORD_ID in next(csv.reader(f), [])
+
+
+def next_record_id(csv_path):
+    """새 기록에 붙일 ID. 삭제된 ID 도 다시 쓰지 않습니다."""
+    max_id = 0
+    if os.path.exists(csv_path):
+        # 색인은 ID 마다 한 칸이므로 파일 크기가 곧 가장 큰 ID 입니다.
+        refresh_index(csv_path)
+        max_id = os.path.getsize(index_path_for(csv_path)) // INDEX_SLOT.size - 1
+    return max([max_id, *read_tombstones(csv_path)]) + 1
+
+
+def read_tombstones(csv_path):
+    """삭제 표시된 기록 ID 집합."""
+    try:
+        with open(tombstone_path_for(csv_path), encoding="utf-8") as f:
+            return {int(line) for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def reset_index(csv_path):
+    """CSV 를 통째로 다시 쓴 뒤 색인을 지웁니다. 다음 조회 때 새로 만듭니다."""
+    try:
+        os.remove(index_path_for(csv_path))
+    except FileNotFoundError:
+        pass
+
+
+def refresh_index(csv_path):
+    """색인에 아직 반영되지 않은 CSV 끝부분만 읽어 색인을 늘립니다."""
+    index_path = index_path_for(csv_path)
+    csv_size = os.path.getsize(csv_path)
+    with open(index_path, "r+b" if os.path.exists(index_path) else "w+b") as index:
+        header = index.read(INDEX_SLOT.size)
+        covered = INDEX_SLOT.unpack(header)[0] if header else 0
+        if covered > csv_size:
+            # CSV 가 줄어들었다면 밖에서 다시 쓰인 것이므로 처음부터 만듭니다.
+            covered = 0
+            index.truncate(INDEX_SLOT.size)
+        if covered == csv_size:
+            return
+        with open(csv_path, "rb") as f:
+            if covered:
+                f.seek(covered)
+            else:
+                read_csv_row(f)  # 머리글
+            offset = f.tell()
+            for line in iter(lambda: read_csv_row(f), b""):
+                if not line.endswith(b"\n") or line.count(b'"') % 2:
+                    break  # 아직 쓰는 중인 행
+                first_field = line.split(b",", 1)[0]
+                if first_field.isdigit():
+                    index.seek(INDEX_SLOT.size * int(first_field))
+                    index.write(INDEX_SLOT.pack(offset))
+                offset += len(line)
+        index.seek(0)
+        index.write(INDEX_SLOT.pack(offset))
+
+
+def read_csv_row(f):
+    """바이너리 파일 f 의 지금 위치부터 CSV 행 하나의 바이트를 읽습니다.
+
+    따옴표 안의 줄바꿈은 행의 일부이므로, 따옴표 수가 짝수가 될 때까지 다음 줄을
+    이어 붙입니다. 파일 끝이면 b"" 이고, 덜 쓰인 행이면 줄바꿈 없이 끝납니다.
+    """
+    row = f.readline()
+    while row.endswith(b"\n") and row.count(b'"') % 2:
+        line = f.readline()
+        if not line:
+            break
+        row += line
+    return row
+
+
+def parse_record(raw, subjects, require_date=False):
+    """입력 한 건을 검사해 저장할 기록 dict 로 바꿉니다. 잘못되면 ValueError.
+
+    subjects 는 허용하는 과목 이름의 모음(보통 sss.SUBJECT_TO_CATEGORY_MAP)입니다.
+    날짜가 없으면 오늘로 보지만, require_date 면 ValueError 입니다.
+    한 기록은 CSV 한 줄이어야 하므로 공부 내용에 줄바꿈이 있으면 안 됩니다.
+    """
+    if not isinstance(raw, dict):
+        raise ValueError(f"기록은 객체(dict)여야 합니다: {raw!r}")
+    date = str(raw.get("날짜") or "").strip()
+    if not date:
+        if require_date:
+            raise ValueError("날짜가 없습니다.")
+        date = datetime.now().strftime("%Y-%m-%d")
+    datetime.strptime(date, "%Y-%m-%d")
+    subject = str(raw.get("과목") or "").strip()
+    if subject not in subjects:
+        raise ValueError(f"알 수 없는 과목입니다: {subject!r}")
+    minutes = float(raw.get("공부 시간(분)"))
+    if not minutes >= 0:
+        raise ValueError(f"공부 시간은 0 이상이어야 합니다: {minutes}")
+    concentration = int(raw.get("집중도"))
+    if not 1 <= concentration <= 5:
+        raise ValueError(f"집중도는 1~5 사이여야 합니다: {concentration}")
+    content = "" if raw.get("공부 내용") is None else str(raw.get("공부 내용"))
+    if "\n" in content or "\r" in content:
+        raise ValueError("공부 내용에는 줄바꿈을 쓸 수 없습니다.")
+    return {
+        "날짜": date,
+        "과목": subject,
+        "공부 시간(분)": minutes,
+        "공부 내용": content,
+        "집중도": concentration,
+    }
+
+
+def encode_records(records, first_id, header=False):
+    """기록들에 first_id 부터 ID 를 붙여 CSV 행(UTF-8 바이트)으로 만듭니다.
+
+    header 면 BOM 과 머리글 행을 앞에 붙입니다. 없는 값은 빈 칸이 됩니다.
+    """
+    text = io.StringIO()
+    writer = csv.writer(text, lineterminator=os.linesep)
+    if header:
+        text.write("\ufeff")
+        writer.writerow(CSV_HEADER)
+    writer.writerows(
+        [record_id, *map(record.get, RECORD_FIELDS)]
+        for record_id, record in enumerate(records, first_id)
+    )
+    return text.getvalue().encode("utf-8")
+
+
+# group commit: CSV 경로 → 아직 쓰지 않은 덧붙이기 요청 목록, 지금 쓰고 있는 CSV
+_commit_cond = threading.Condition()
+_commit_queues = {}
+_committing = set()
+
+
+def _commit_batches(csv_path, batches):
+    """여러 덧붙이기 요청을 한 번의 쓰기·fsync 로 CSV 에 덧붙이고 요청별 ID 목록을 돌려줍니다."""
+    records = [record for batch in batches for record in batch]
+    with locked(csv_path):
+        if os.path.exists(csv_path) and not has_record_ids(csv_path):
+            # 기록 ID 가 없는 예전 CSV 는 처음 한 번만 pandas 로 고쳐 씁니다.
+            import study_store
+
+            study_store.ensure_record_ids(csv_path)
+        first_id = next_record_id(csv_path)
+        new_file = not os.path.exists(csv_path) or not os.path.getsize(csv_path)
+        # 기록 한 건은 덜 쓰여도 다음 잠금 때 정리되므로 저널을 건너뜁니다.
+        append_csv_bytes(
+            csv_path,
+            encode_records(records, first_id, new_file),
+            journal=new_file or len(records) > 1,
+        )
+    record_ids = []
+    for batch in batches:
+        record_ids.append(list(range(first_id, first_id + len(batch))))
+        first_id += len(batch)
+    return record_ids
+
+
+@study_profile.profiled("store:append_csv_records")
+def append_csv_records(csv_path, records):
+    """기록 여러 개에 ID 를 붙여 CSV 에 한 번에 덧붙이고 ID 목록을 돌려줍니다.
+
+    records 는 기록 ID 를 뺀 컬럼을 가진 dict 목록입니다. 파일이 없으면 머리글과
+    함께 만듭니다. 같은 프로세스의 다른 스레드가 쓰는 동안 들어온 요청은 모아
+    두었다가, 앞의 쓰기가 끝나면 그중 한 스레드가 모두 한 번에 쓰고 한 번만
+    fsync 합니다. 다른 프로세스의 요청과는 묶지 않습니다.
+    """
+    if not records:
+        return []
+    study_profile.note_rows(len(records))
+    key = os.path.abspath(csv_path)
+    request = {"records": list(records), "ids": None, "error": None}
+    with _commit_cond:
+        _commit_queues.setdefault(key, []).append(request)
+        while request["ids"] is None and request["error"] is None:
+            if key not in _committing:
+                break
+            _commit_cond.wait()
+        else:
+            return _commit_result(request)
+        # 쓰는 스레드가 없으면 이 스레드가 쌓인 요청을 모두 맡아 씁니다.
+        _committing.add(key)
+        requests = _commit_queues.pop(key)
+    try:
+        results = _commit_batches(csv_path, [r["records"] for r in requests])
+        for pending, record_ids in zip(requests, results):
+            pending["ids"] = record_ids
+    except BaseException as e:
+        for pending in requests:
+            pending["error"] = e
+    finally:
+        with _commit_cond:
+            _committing.discard(key)
+            _commit_cond.notify_all()
+    return _commit_result(request)
+
+
+def _commit_result(request):
+    if request["error"] is not None:
+        raise request["error"]
+    return request["ids"]
+
+
+class RecordWriter:
+    """기록을 검사해 모아 두었다가 batch_size 건마다 CSV 에 한 번에 덧붙입니다.
+
+    with 문이 끝나거나 close() 하면 남은 기록을 씁니다. 덧붙인 기록의 ID 는
+    record_ids 에 차례로 쌓입니다. batch_size 가 None 이면 close() 때 한 번만
+    쓰고, 그 전에 discard() 하면 모은 기록을 버립니다. require_date 는
+    parse_record 에 그대로 넘깁니다.
+
+        with RecordWriter("study_log.csv", sss.SUBJECT_TO_CATEGORY_MAP) as writer:
+            for raw in rows:
+                writer.add(raw)
+    """
+
+    def __init__(
+        self, csv_path, subjects, batch_size=WRITE_BATCH_SIZE, require_date=False
+    ):
+        self.csv_path = csv_path
+        self.subjects = subjects
+        self.batch_size = batch_size
+        self.require_date = require_date
+        self.record_ids = []
+        self._pending = []
+
+    def add(self, raw):
+        """입력 한 건을 검사해 버퍼에 넣습니다. 잘못된 입력이면 ValueError."""
+        self._pending.append(parse_record(raw, self.subjects, self.require_date))
+        if self.batch_size is not None and len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        pending, self._pending = self._pending, []
+        self.record_ids.extend(append_csv_records(self.csv_path, pending))
+
+    def discard(self):
+        """아직 쓰지 않은 기록을 버립니다."""
+        self._pending = []
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 도중에 예외가 나도 이미 검사를 통과한 기록은 저장합니다.
+        self.close()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""여러 학생의 학습 기록 보고서(피드백·주간 목표 달성률)를 프로세스 풀로 만듭니다.
+
+학생마다 `<이름>.csv` 학습 기록 파일과, 있으면 주간 목표 파일을 둡니다. 목표
+파일은 sss.goal_file_for 로 찾으므로 보통 `<이름>_goals.csv` 이고, 기본 기록
+파일 study_log.csv 의 목표 파일은 study_goals.csv 입니다. 학생 하나의 보고서는
+한 작업자 프로세스에서 sss.py 의 계산 함수로 만들고, 부모 프로세스가 결과를
+모아 요약합니다.
+
+    python study_cli.py report batch logs/ --workers 8 --chunksize 16
+"""
+
+import contextlib
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import sss
+import study_store
+
+
+def find_student_logs(paths):
+    """파일·폴더·glob 패턴 목록에서 학생별 학습 기록 CSV 를 찾아 정렬해 돌려줍니다."""
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            matches = glob.glob(os.path.join(path, "*.csv"))
+        else:
+            matches = glob.glob(path) or [path]
+        found.update(
+            match
+            for match in matches
+            if not os.path.splitext(match)[0].endswith(sss.GOAL_FILE_SUFFIX)
+        )
+    return sorted(found)
+
+
+def student_name(csv_path):
+    return os.path.splitext(os.path.basename(csv_path))[0]
+
+
+@contextlib.contextmanager
+def student_files(csv_path):
+    """with 블록 동안 sss.py 의 계산 함수가 csv_path 학생의 기록·목표 파일을 쓰게 합니다."""
+    saved = sss.DATA_FILE, sss.GOAL_FILE, sss.STORE_DIR
+    sss.DATA_FILE = csv_path
+    sss.GOAL_FILE = sss.goal_file_for(csv_path)
+    sss.STORE_DIR = study_store.store_dir_for(csv_path)
+    try:
+        yield
+    finally:
+        sss.DATA_FILE, sss.GOAL_FILE, sss.STORE_DIR = saved
+
+
+def student_report(csv_path, week_start=None):
+    """학생 한 명의 피드백, 주간 목표 달성 현황과 지난 목표 기록 요약을 dict 로 만듭니다."""
+    report = {"student": student_name(csv_path)}
+    try:
+        with student_files(csv_path):
+            stats = sss.load_subject_stats()
+            report["feedback"] = (
+                {"records": 0}
+                if stats is None or stats.empty
+                else sss.analyze_feedback(stats)
+            )
+            report["goal"] = sss.goal_achievement(week_start)
+            report["goal_history"] = sss.goal_report_summary(sss.goal_history_report())
+    except (OSError, ValueError, KeyError) as e:
+        # 한 학생의 파일이 잘못되어도 나머지 학생의 보고서는 계속 만듭니다.
+        report["error"] = f"{type(e).__name__}: {e}"
+    return report
+
+
+def _report_task(task):
+    return student_report(*task)
+
+
+def run_reports(csv_paths, workers=None, chunksize=1, week_start=None):
+    """학생별 보고서를 만듭니다. 결과 순서는 csv_paths 순서와 같습니다.
+
+    workers 는 작업자 프로세스 수(기본: CPU 수)이고 1 이면 현재 프로세스에서
+    차례로 만듭니다. chunksize 는 작업자에게 한 번에 넘기는 학생 수입니다.
+    """
+    week_start = week_start or sss.week_start_of(datetime.now().date())
+    tasks = [(csv_path, week_start) for csv_path in csv_paths]
+    if workers == 1:
+        return [_report_task(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_report_task, tasks, chunksize=chunksize))
+
+
+def summarize_reports(reports):
+    """학생별 보고서를 합쳐 전체 요약을 만듭니다."""
+    summary = {
+        "students": len(reports),
+        "failed": [r["student"] for r in reports if "error" in r],
+        "records": 0,
+        "goal_status": {},
+        "average_achievement_rate": None,
+        "most_efficient_subjects": {},
+    }
+    rates = []
+    for report in reports:
+        if "error" in report:
+            continue
+        summary["records"] += report["feedback"]["records"]
+        status = report["goal"]["status"]
+        summary["goal_status"][status] = summary["goal_status"].get(status, 0) + 1
+        if status == "ok":
+            rates.append(report["goal"]["achievement_rate"])
+        subject = report["feedback"].get("most_efficient_subject")
+        if subject is not None:
+            counts = summary["most_efficient_subjects"]
+            counts[subject] = counts.get(subject, 0) + 1
+    if rates:
+        summary["average_achievement_rate"] = sum(rates) / len(rates)
+    return summary
@@ -0,0 +1,1091 @@
+# -*- coding: utf-8 -*-
+"""학습 기록용 추가 전용(append-only) 컬럼형 세그먼트 저장소.
+
+study_log.csv 옆의 `<이름>_store/` 폴더에 타입이 지정된 세그먼트 파일과
+manifest.json 을 둡니다. 원본은 언제나 CSV 이고 저장소는 CSV 에서 다시 만들 수
+있는 읽기용 사본이므로, 따로 가져오기·내보내기를 두지 않습니다(폴더를 지우면
+다음에 읽을 때 새로 만듭니다). 세그먼트는 날짜의 월(YYYY-MM) 단위 파티션으로 나뉘고,
+manifest 의 세그먼트 항목마다 파티션 이름이 적혀 있어 기간을 준 조회는 해당
+월의 세그먼트만 엽니다. 기록 추가는 새 세그먼트를 덧붙이기만 하고, 세그먼트가
+많아지면 파티션마다 하나로 합치는 압축(compaction)을 수행합니다.
+
+저장소는 CSV 의 크기·수정 시각·내용 해시를 기억해 두었다가, CSV 가 바뀌면
+뒤에 덧붙여진 부분만 다시 읽어 따라잡습니다(sync_csv). 처음 가져올 때와
+뒷부분을 읽을 때 모두 STREAM_CHUNK_ROWS 행씩 읽어 조각마다 세그먼트를 쓰고,
+압축은 한 번에 한 파티션만 읽으므로 기록이 커도 메모리에는 한 조각만 둡니다.
+
+기록 삭제는 CSV 를 고쳐 쓰지 않고 `<이름>.tombstones` 파일에 기록 ID 를
+덧붙이기만 합니다. 읽을 때 삭제된 ID 를 걸러 내고, 삭제 표시가 쌓이면
+CSV 를 임시 파일에 다시 쓴 뒤 이름을 바꾸는 방식으로 압축합니다.
+
+`<이름>.idx` 는 기록 ID → CSV 안의 바이트 위치를 담은 고정 폭 색인입니다.
+ID 가 곧 색인 안의 위치이므로 기록 하나를 찾을 때 파일 전체를 훑지 않고
+바로 찾아갑니다. 기록은 덧붙이거나 지우기만 하고 고치지 않으므로, 한 ID 는
+CSV 에 한 번만 나옵니다.
+
+manifest.json 의 rollups 는 과목별(기록 수·공부 시간 합·집중도 합·집중도×공부
+시간 합)과 날짜별(기록 수·공부 시간 합·집중도 합·집중도 1~5 의 기록 수) 누적
+통계입니다. 집중도별 기록 수는 기간별 최저·최고 집중도를 구하는 데 씁니다. 덧붙은 행은
+더하고 새 삭제 표시는 빼는 식으로만 갱신하므로, 피드백·추이 그래프·주간 목표
+계산이 전체 기록 수가 아니라 과목 수·날짜 수에 비례하는 시간에 끝납니다.
+
+세그먼트 옆의 `<세그먼트>.contents.json` 은 그 세그먼트의 과목별 공부 내용 요약
+(study_contents)입니다. 세그먼트는 한 번 쓰면 바뀌지 않으므로 처음 필요할 때 한 번만
+만들고, 기록이 덧붙으면 새 세그먼트의 요약만 만들어 합칩니다(content_summaries).
+
+iter_record_chunks 는 CSV 를 정해진 행 수씩 읽어 삭제되지 않은 최신 기록만
+차례로 돌려줍니다. 누적 통계를 처음부터 다시 셀 때와 메모리보다 큰 기록을
+분석할 때 쓰며, 메모리에는 한 조각만 둡니다.
+
+여러 터미널·프로세스가 같은 기록을 동시에 쓸 수 있도록, 쓰기와 저장소 동기화는
+`<이름>.lock` 파일의 권고 잠금(advisory lock) 안에서 합니다. 여러 기록을
+덧붙일 때는 먼저 `<이름>.journal` 에 쓰고 fsync 한 뒤 CSV 에 덧붙이므로, 중간에
+멈추더라도 다음에 잠글 때 저널로 CSV 를 복구합니다. 기록 한 건은 저널 없이 바로
+덧붙이고(fsync 한 번), 덜 쓰인 마지막 행은 다음에 잠글 때 잘라 냅니다. 같은
+프로세스에서 동시에 들어온 덧붙이기는 한 번의 쓰기와 fsync 로 묶어 처리하고
+(group commit), 다른 프로세스의 덧붙이기는 묶지 않고 파일 잠금으로 차례만
+지키므로 프로세스마다 덧붙이기 한 번에 fsync 한 번이 듭니다.
+잠금·저널·색인·덧붙이기는 pandas 없이 쓸 수 있도록 study_records.py 에 있습니다.
+"""
+
+import collections
+import contextlib
+import csv
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import study_contents
+import study_profile
+from study_records import (  # noqa: F401  append_csv_records 등은 다시 내보냅니다.
+    INDEX_SLOT,
+    RECORD_ID,
+    append_csv_records,
+    has_record_ids,
+    index_path_for,
+    locked,
+    read_csv_row,
+    read_tombstones,
+    refresh_index,
+    reset_index,
+    store_dir_for,
+    tombstone_path_for,
+)
+
+# 컬럼 이름 → 저장 타입
+SCHEMA = {
+    RECORD_ID: "int64",
+    "날짜": "datetime64[ns]",
+    "과목": "object",
+    "공부 시간(분)": "float64",
+    "공부 내용": "object",
+    "집중도": "int64",
+}
+COLUMNS = list(SCHEMA)
+
+MANIFEST_FILE = "manifest.json"
+CONTENT_SUMMARY_SUFFIX = ".contents.json"
+COMPACT_SEGMENT_LIMIT = 16
+COMPACT_TOMBSTONE_LIMIT = 100
+
+# rollups 의 과목별·날짜별 값 순서 (맨 앞은 언제나 기록 수)
+SUBJECT_STAT_COLUMNS = ["기록 수", "공부 시간(분)", "집중도 합", "효율성 점수 합"]
+CONCENTRATION_LEVELS = [1, 2, 3, 4, 5]
+DAILY_STAT_COLUMNS = ["기록 수", "공부 시간(분)", "집중도 합"] + [
+    f"집중도 {level}" for level in CONCENTRATION_LEVELS
+]
+# rollups 의 값 모양이 바뀌면 올립니다. 다른 버전의 rollups 는 다시 셉니다.
+ROLLUP_VERSION = 2
+
+# iter_record_chunks 가 한 번에 읽는 CSV 행 수
+STREAM_CHUNK_ROWS = 100_000
+
+# pyarrow 가 있으면 Feather, 없으면 pickle 세그먼트를 사용합니다.
+SEGMENT_FORMAT = "feather" if importlib.util.find_spec("pyarrow") else "pickle"
+
+
+def store_exists(store_dir):
+    return os.path.exists(os.path.join(store_dir, MANIFEST_FILE))
+
+
+def coerce_schema(df):
+    """SCHEMA 에 맞게 컬럼 순서와 타입을 맞춥니다."""
+    df = df[COLUMNS].copy()
+    df["날짜"] = pd.to_datetime(df["날짜"])
+    return df.astype(SCHEMA)
+
+
+def _read_manifest(store_dir):
+    with open(os.path.join(store_dir, MANIFEST_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _load_manifest(store_dir):
+    if store_exists(store_dir):
+        return _read_manifest(store_dir)
+    os.makedirs(store_dir, exist_ok=True)
+    return {
+        "format": SEGMENT_FORMAT,
+        "generation": 0,
+        "next_segment": 1,
+        "segments": [],
+        "source": None,
+    }
+
+
+def _write_manifest(store_dir, manifest):
+    manifest["generation"] += 1
+    path = os.path.join(store_dir, MANIFEST_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _write_segment(store_dir, manifest, df):
+    name = f"seg-{manifest['next_segment']:06d}.{manifest['format']}"
+    path = os.path.join(store_dir, name)
+    df = df.reset_index(drop=True)
+    if manifest["format"] == "feather":
+        df.to_feather(path)
+    else:
+        df.to_pickle(path)
+    manifest["next_segment"] += 1
+    return {"file": name, "rows": len(df)}
+
+
+def _read_segment(store_dir, manifest, segment, columns):
+    path = os.path.join(store_dir, segment["file"])
+    if manifest["format"] == "feather":
+        return pd.read_feather(path, columns=columns)
+    df = pd.read_pickle(path)
+    return df if columns is None else df[columns]
+
+
+def _remove_segments(store_dir, segments):
+    for segment in segments:
+        path = os.path.join(store_dir, segment["file"])
+        for name in (path, f"{path}{CONTENT_SUMMARY_SUFFIX}"):
+            try:
+                os.remove(name)
+            except FileNotFoundError:
+                pass
+
+
+def _append_segment(store_dir, manifest, df):
+    """df 를 월 파티션별 세그먼트로 나눠 덧붙입니다."""
+    if df.empty:
+        return
+    df = coerce_schema(df)
+    dates = df["날짜"]
+    months = (dates.dt.year * 100 + dates.dt.month).fillna(0).astype("int64")
+    for month, part in df.groupby(months, sort=True):
+        segment = _write_segment(store_dir, manifest, part)
+        segment["partition"] = f"{month // 100:04d}-{month % 100:02d}"
+        manifest["segments"].append(segment)
+
+
+def _extra_segments(manifest):
+    """파티션마다 하나씩을 넘는 세그먼트 수(압축 대상)."""
+    partitions = {segment.get("partition") for segment in manifest["segments"]}
+    return len(manifest["segments"]) - len(partitions)
+
+
+def _segments_in_range(manifest, start, end):
+    """start~end 기간과 겹치는 월 파티션의 세그먼트만 고릅니다."""
+    low = None if start is None else pd.Timestamp(start).strftime("%Y-%m")
+    high = None if end is None else pd.Timestamp(end).strftime("%Y-%m")
+    return [
+        segment
+        for segment in manifest["segments"]
+        # 파티션 이름이 없는 예전 세그먼트는 항상 읽습니다.
+        if segment.get("partition") is None
+        or (
+            (low is None or segment["partition"] >= low)
+            and (high is None or segment["partition"] <= high)
+        )
+    ]
+
+
+def _date_mask(dates, start, end):
+    """dates 가 start~end(양 끝 포함) 안에 드는지 나타내는 bool 배열."""
+    mask = pd.Series(True, index=dates.index)
+    if start is not None:
+        mask &= dates >= pd.Timestamp(start)
+    if end is not None:
+        mask &= dates <= pd.Timestamp(end)
+    return mask
+
+
+# 프로세스 안에서 한 번 읽은 프레임을 manifest 세대(generation)와 함께 기억합니다.
+# 가장 오래 쓰지 않은 것부터 버려 MEMO_ENTRIES 개까지만 둡니다.
+MEMO_ENTRIES = 2
+_MEMO = collections.OrderedDict()
+
+
+@study_profile.profiled("store:read_records")
+def read_records(store_dir, columns=None, start=None, end=None, memo=True):
+    """저장소의 기록을 기록 ID 순서로 읽습니다.
+
+    columns 를 주면 해당 컬럼만 읽고, start/end(날짜, 양 끝 포함)를 주면
+    그 기간에 걸친 월 파티션의 세그먼트만 열어 기간 안의 행만 돌려줍니다.
+    memo=False 면 읽은 프레임을 메모리 캐시에 남기지 않습니다.
+    """
+    manifest = _read_manifest(store_dir)
+    wanted = list(columns) if columns is not None else COLUMNS
+    memo_key = (os.path.abspath(store_dir), tuple(wanted), str(start), str(end))
+    cached = _MEMO.get(memo_key)
+    if cached is not None and cached[0] == manifest["generation"]:
+        _MEMO.move_to_end(memo_key)
+        return cached[1].copy()
+    ranged = start is not None or end is not None
+    needed = [RECORD_ID, "날짜"] if ranged else [RECORD_ID]
+    read_columns = wanted + [c for c in needed if c not in wanted]
+    frames = [
+        _read_segment(store_dir, manifest, segment, read_columns)
+        for segment in _segments_in_range(manifest, start, end)
+    ]
+    if not frames:
+        df = pd.DataFrame({col: pd.Series(dtype=SCHEMA[col]) for col in COLUMNS})
+    elif len(frames) == 1:
+        df = frames[0]
+    else:
+        df = pd.concat(frames, ignore_index=True)
+        # 파티션을 합치면 월 순서가 되므로 추가된 순서(ID 순)로 되돌립니다.
+        if not df[RECORD_ID].is_monotonic_increasing:
+            df = df.sort_values(RECORD_ID, kind="stable")
+    if ranged:
+        df = df[_date_mask(df["날짜"], start, end)]
+    df = df[wanted].reset_index(drop=True)
+    if not memo:
+        return df
+    _remember(memo_key, manifest["generation"], df)
+    return df.copy()
+
+
+def _remember(memo_key, generation, df):
+    # 저장소가 바뀌어 더는 맞지 않는 같은 저장소의 프레임은 바로 버립니다.
+    for key in [k for k, (g, _) in _MEMO.items() if k[0] == memo_key[0]]:
+        if _MEMO[key][0] != generation:
+            del _MEMO[key]
+    _MEMO[memo_key] = (generation, df)
+    _MEMO.move_to_end(memo_key)
+    while len(_MEMO) > MEMO_ENTRIES:
+        _MEMO.popitem(last=False)
+
+
+def append_records(store_dir, df):
+    """기록을 새 세그먼트로 덧붙이고, 필요하면 압축합니다."""
+    manifest = _load_manifest(store_dir)
+    _append_segment(store_dir, manifest, df)
+    _write_manifest(store_dir, manifest)
+    if _extra_segments(manifest) > COMPACT_SEGMENT_LIMIT:
+        compact(store_dir)
+
+
+def compact(store_dir):
+    """세그먼트를 월 파티션마다 하나로 합칩니다. 한 번에 한 파티션만 읽습니다."""
+    manifest = _read_manifest(store_dir)
+    if _extra_segments(manifest) == 0:
+        return
+    partitions = {}
+    for segment in manifest["segments"]:
+        partitions.setdefault(segment.get("partition"), []).append(segment)
+    segments, old_segments = [], []
+    for partition, group in partitions.items():
+        if len(group) == 1:
+            segments.extend(group)
+            continue
+        df = pd.concat(
+            [_read_segment(store_dir, manifest, segment, None) for segment in group],
+            ignore_index=True,
+        )
+        segment = _write_segment(store_dir, manifest, df)
+        if partition is not None:
+            segment["partition"] = partition
+        segments.append(segment)
+        old_segments.extend(group)
+    manifest["segments"] = segments
+    _write_manifest(store_dir, manifest)
+    _remove_segments(store_dir, old_segments)
+
+
+def _hash_file(path, limit=None):
+    """파일 앞부분 limit 바이트(기본: 전체)의 sha256 해시 객체와 마지막 바이트."""
+    digest = hashlib.sha256()
+    last_byte = b""
+    remaining = limit
+    with open(path, "rb") as f:
+        while remaining is None or remaining > 0:
+            size = 1 << 20 if remaining is None else min(1 << 20, remaining)
+            chunk = f.read(size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            last_byte = chunk[-1:]
+            if remaining is not None:
+                remaining -= len(chunk)
+    return digest, last_byte
+
+
+def _source_state(csv_path, digest):
+    stat = os.stat(csv_path)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest.hexdigest(),
+    }
+
+
+def _csv_chunks(f, names=None, first_id=1):
+    """열린 CSV 를 STREAM_CHUNK_ROWS 행씩 읽어 기록 ID 가 붙은 조각을 돌려줍니다.
+
+    names 를 주면 머리글 없이 그 컬럼 이름으로 읽습니다(CSV 뒷부분만 읽을 때).
+    기록 ID 컬럼이 없는 예전 CSV 면 first_id 부터 차례로 ID 를 붙입니다.
+    """
+    chunks = pd.read_csv(
+        f,
+        header=None if names else "infer",
+        names=names,
+        encoding="utf-8-sig",
+        chunksize=STREAM_CHUNK_ROWS,
+        float_precision="round_trip",
+    )
+    for chunk in chunks:
+        yield _with_record_ids(chunk, first_id)
+        first_id += len(chunk)
+
+
+def _with_record_ids(df, first_id=1):
+    """기록 ID 컬럼이 없으면 first_id 부터 행 순서대로 붙입니다(파일은 고치지 않음).
+
+    ensure_record_ids 가 나중에 CSV 를 고쳐 쓸 때와 같은 ID 가 됩니다.
+    """
+    if RECORD_ID not in df:
+        df.insert(0, RECORD_ID, np.arange(first_id, first_id + len(df), dtype="int64"))
+    return df
+
+
+def _note_max_id(manifest, df):
+    """저장소에 들어온 가장 큰 기록 ID 를 manifest 에 적습니다."""
+    if not df.empty:
+        manifest["max_id"] = max(manifest.get("max_id", 0), int(df[RECORD_ID].max()))
+
+
+def _rollup_totals(df):
+    """df 의 과목별·날짜별 누적 통계 {"subjects": {...}, "days": {...}}."""
+    minutes = df["공부 시간(분)"].astype("float64")
+    concentration = df["집중도"].astype("int64")
+    frame = pd.DataFrame(
+        {
+            "과목": df["과목"],
+            "날짜": pd.to_datetime(df["날짜"]).dt.normalize(),
+            "기록 수": 1,
+            "공부 시간(분)": minutes,
+            "집중도 합": concentration,
+            "효율성 점수 합": concentration * minutes,
+        }
+    )
+    levels = concentration.clip(CONCENTRATION_LEVELS[0], CONCENTRATION_LEVELS[-1])
+    for level in CONCENTRATION_LEVELS:
+        frame[f"집중도 {level}"] = (levels == level).astype("int64")
+    totals = {}
+    for table, key, columns in [
+        ("subjects", "과목", SUBJECT_STAT_COLUMNS),
+        ("days", "날짜", DAILY_STAT_COLUMNS),
+    ]:
+        grouped = frame.groupby(key, sort=False)[columns].sum()
+        if key == "날짜":
+            # 날짜 문자열은 행마다가 아니라 묶인 날짜마다 한 번만 만듭니다.
+            grouped.index = grouped.index.strftime("%Y-%m-%d")
+        totals[table] = {
+            name: [int(row[0]), *map(float, row[1:])]
+            for name, row in zip(grouped.index, grouped.itertuples(index=False))
+        }
+    return totals
+
+
+def _record_totals(record):
+    """기록 한 건의 누적 통계(_rollup_totals 와 같은 모양)."""
+    minutes = record["공부 시간(분)"]
+    concentration = record["집중도"]
+    day = pd.Timestamp(record["날짜"]).strftime("%Y-%m-%d")
+    return {
+        "subjects": {
+            record["과목"]: [1, minutes, concentration, concentration * minutes]
+        },
+        "days": {day: [1, minutes, concentration, *_level_counts(concentration)]},
+    }
+
+
+def _level_counts(concentration):
+    level = min(max(concentration, CONCENTRATION_LEVELS[0]), CONCENTRATION_LEVELS[-1])
+    return [int(level == each) for each in CONCENTRATION_LEVELS]
+
+
+def _add_rollups(rollups, totals, sign=1):
+    """rollups 에 totals 를 더하거나(sign=1) 뺍니다(sign=-1). 기록이 0건이면 지웁니다."""
+    for table, values_by_key in totals.items():
+        current_table = rollups[table]
+        for key, values in values_by_key.items():
+            current = current_table.setdefault(key, [0] * len(values))
+            for i, value in enumerate(values):
+                current[i] += sign * value
+            if current[0] <= 0:
+                del current_table[key]
+
+
+@study_profile.profiled("store:sync_csv")
+def sync_csv(csv_path, store_dir):
+    """저장소를 CSV 파일 내용과 맞춥니다.
+
+    CSV 의 크기와 수정 시각이 그대로면 아무것도 읽지 않습니다. 기존 내용 뒤에
+    행만 덧붙여졌다면(앞부분 해시가 같으면) 새 부분만 파싱해 세그먼트로 추가하고,
+    그 밖의 변경은 CSV 전체를 다시 가져옵니다.
+    """
+    with locked(csv_path):
+        _sync_csv(csv_path, store_dir)
+
+
+def _sync_csv(csv_path, store_dir):
+    if not os.path.exists(csv_path):
+        return
+    manifest = _load_manifest(store_dir)
+    source = manifest.get("source")
+    stat = os.stat(csv_path)
+    if (
+        source
+        and source["size"] == stat.st_size
+        and source["mtime_ns"] == stat.st_mtime_ns
+    ):
+        return
+    old_segments = []
+    appended_only = False
+    if source and 0 < source["size"] <= stat.st_size:
+        digest, last_byte = _hash_file(csv_path, source["size"])
+        appended_only = digest.hexdigest() == source["sha256"] and last_byte == b"\n"
+    if appended_only:
+        # 덧붙은 부분만 조각 단위로 읽어 조각마다 세그먼트를 덧붙입니다.
+        with open(csv_path, "rb") as f:
+            f.seek(source["size"])
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+            f.seek(source["size"])
+            rollups = _stored_rollups(manifest)
+            names = _csv_header(csv_path)
+            for df in _csv_chunks(f, names, manifest.get("max_id", 0) + 1):
+                study_profile.note_rows(len(df))
+                _append_segment(store_dir, manifest, df)
+                _note_max_id(manifest, df)
+                if rollups is not None:
+                    _add_rollups(rollups, _rollup_totals(df))
+    else:
+        # CSV 전체를 조각 단위로 다시 가져오면서 누적 통계도 함께 셉니다. 삭제
+        # 표시는 tombstone_offset 을 0 으로 두어 다음 조회 때 색인으로 뺍니다.
+        digest, _ = _hash_file(csv_path)
+        old_segments = manifest["segments"]
+        manifest["segments"] = []
+        manifest["max_id"] = 0
+        rollups = {"subjects": {}, "days": {}}
+        with open(csv_path, "rb") as f:
+            for df in _csv_chunks(f):
+                study_profile.note_rows(len(df))
+                _append_segment(store_dir, manifest, df)
+                _note_max_id(manifest, df)
+                _add_rollups(rollups, _rollup_totals(df))
+        manifest["rollups"] = {
+            **rollups,
+            "tombstone_offset": 0,
+            "version": ROLLUP_VERSION,
+        }
+    manifest["source"] = _source_state(csv_path, digest)
+    _write_manifest(store_dir, manifest)
+    _remove_segments(store_dir, old_segments)
+    if _extra_segments(manifest) > COMPACT_SEGMENT_LIMIT:
+        compact(store_dir)
+
+
+def ensure_record_ids(csv_path):
+    """기록 ID 컬럼이 없는 예전 CSV 에 1부터 차례로 ID 를 붙여 고쳐 씁니다.
+
+    기록 추가·삭제처럼 ID 를 파일에 남겨야 하는 쓰기에서만 부릅니다. 읽기는
+    _with_record_ids 로 메모리에서만 같은 ID 를 붙입니다.
+    """
+    if not os.path.exists(csv_path) or has_record_ids(csv_path):
+        return
+    with locked(csv_path):
+        if has_record_ids(csv_path):
+            return  # 잠금을 기다리는 동안 다른 프로세스가 바꿨습니다.
+        with open(csv_path, "rb") as f:
+            _rewrite_csv(csv_path, _csv_chunks(f))
+        reset_index(csv_path)
+
+
+def _rewrite_csv(csv_path, chunks):
+    """조각들을 임시 파일에 차례로 쓰고(fsync) 이름을 바꿔 csv_path 를 한 번에 교체합니다."""
+    tmp_path = f"{csv_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8-sig", newline="") as f:
+        header = True
+        for chunk in chunks:
+            if pd.api.types.is_datetime64_any_dtype(chunk["날짜"]):
+                chunk = chunk.assign(날짜=chunk["날짜"].dt.strftime("%Y-%m-%d"))
+            chunk.to_csv(f, index=False, header=header)
+            header = False
+        if header:
+            csv.writer(f, lineterminator=os.linesep).writerow(COLUMNS)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, csv_path)
+
+
+def delete_records(csv_path, record_ids):
+    """기록 ID 들을 삭제 표시 파일에 덧붙입니다. CSV 는 건드리지 않습니다."""
+    with locked(csv_path), open(
+        tombstone_path_for(csv_path), "a", encoding="utf-8"
+    ) as f:
+        f.writelines(f"{record_id}\n" for record_id in record_ids)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def needs_compaction(csv_path):
+    return len(read_tombstones(csv_path)) >= COMPACT_TOMBSTONE_LIMIT
+
+
+_compaction_thread = None
+
+
+def _live_records(csv_path, store_dir, columns=None, start=None, end=None, memo=True):
+    """저장소에서 삭제되지 않은 최신 기록만 읽습니다(잠금은 호출한 쪽에서)."""
+    tombstones = read_tombstones(csv_path)
+    if not tombstones:
+        return read_records(store_dir, columns, start, end, memo)
+    wanted = list(columns) if columns is not None else COLUMNS
+    read_columns = wanted + [RECORD_ID] if RECORD_ID not in wanted else wanted
+    df = read_records(store_dir, read_columns, start, end, memo)
+    df = df[~df[RECORD_ID].isin(tombstones)].reset_index(drop=True)
+    return df[wanted]
+
+
+def load_records(csv_path, store_dir, columns=None, start=None, end=None, memo=True):
+    """CSV 와 저장소를 맞춘 뒤 삭제되지 않은 기록만 읽습니다.
+
+    start/end(날짜, 양 끝 포함)를 주면 그 기간의 월 파티션만 엽니다.
+    memo=False 면 읽은 프레임을 메모리 캐시에 남기지 않습니다.
+    """
+    with locked(csv_path):
+        sync_csv(csv_path, store_dir)
+        return _live_records(csv_path, store_dir, columns, start, end, memo)
+
+
+def _tombstones_after(csv_path, offset):
+    """삭제 표시 파일의 offset 바이트 뒤에 덧붙은 ID 목록과 읽은 끝 위치.
+
+    파일이 offset 보다 짧으면(밖에서 다시 쓰였으면) (None, 0) 을 돌려줍니다.
+    """
+    try:
+        with open(tombstone_path_for(csv_path), "rb") as f:
+            if f.seek(0, os.SEEK_END) < offset:
+                return None, 0
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return (None, 0) if offset else ([], 0)
+    complete = data[: data.rfind(b"\n") + 1]
+    return [int(field) for field in complete.split()], offset + len(complete)
+
+
+def _apply_new_tombstones(csv_path, rollups):
+    """rollups 에 아직 빼지 않은 삭제 기록을 색인으로 찾아 뺍니다.
+
+    변경이 있으면 True, 색인이나 파일이 맞지 않아 다시 세야 하면 None.
+    """
+    new_ids, end = _tombstones_after(csv_path, rollups["tombstone_offset"])
+    if new_ids is None:
+        return None
+    if not new_ids:
+        return False
+    with open(tombstone_path_for(csv_path), "rb") as f:
+        earlier = {int(field) for field in f.read(rollups["tombstone_offset"]).split()}
+    header = _csv_header(csv_path)
+    for record_id in dict.fromkeys(new_ids):
+        if record_id in earlier or record_id < 1:
+            continue
+        _, fields = _read_indexed_line(csv_path, record_id)
+        if not fields:
+            continue  # 없는 ID 를 지운 경우
+        if fields[0] != str(record_id):
+            return None
+        _add_rollups(rollups, _record_totals(_typed_record(header, fields)), -1)
+    rollups["tombstone_offset"] = end
+    return True
+
+
+def _tombstone_size(csv_path):
+    try:
+        return os.path.getsize(tombstone_path_for(csv_path))
+    except FileNotFoundError:
+        return 0
+
+
+def _stored_rollups(manifest):
+    """manifest 의 rollups. 없거나 예전 모양(ROLLUP_VERSION 이 다름)이면 None."""
+    rollups = manifest.get("rollups")
+    if rollups is None or rollups.get("version") != ROLLUP_VERSION:
+        return None
+    return rollups
+
+
+class _PrefixReader(io.RawIOBase):
+    """파일의 앞 limit 바이트만 읽히는 읽기 전용 스트림."""
+
+    def __init__(self, f, limit):
+        self._file = f
+        self._remaining = limit
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = self._file.readinto(memoryview(buffer)[: self._remaining])
+        self._remaining -= count
+        return count
+
+
+@contextlib.contextmanager
+def _open_csv_prefix(csv_path, size):
+    """CSV 의 앞 size 바이트만 여는 파일 객체. 그 뒤에 덧붙는 행은 보지 않습니다."""
+    with open(csv_path, "rb") as f:
+        yield io.BufferedReader(_PrefixReader(f, size))
+
+
+def iter_record_chunks(
+    csv_path,
+    columns=None,
+    start=None,
+    end=None,
+    chunk_rows=STREAM_CHUNK_ROWS,
+    tombstones=None,
+):
+    """CSV 를 chunk_rows 행씩 읽어 삭제되지 않은 기록을 조각(DataFrame)으로 돌려줍니다.
+
+    전체를 메모리에 올리지 않으며 조각은 CSV 순서대로 나옵니다. start/end(날짜,
+    양 끝 포함)를 주면 그 기간의 행만 돌려줍니다. tombstones 를 주면 삭제 표시
+    파일 대신 그 ID 집합으로 거릅니다. 읽기 시작할 때의 CSV 끝까지만 읽으므로,
+    읽는 동안 다른 프로세스가 덧붙이는 행은 보지 않습니다. 기록 ID 가 없는 예전
+    CSV 는 행 순서대로 ID 를 붙여 돌려줍니다.
+    """
+    if not os.path.exists(csv_path):
+        return
+    with locked(csv_path):
+        size = os.path.getsize(csv_path)
+        if tombstones is None:
+            tombstones = read_tombstones(csv_path)
+    wanted = list(columns) if columns is not None else COLUMNS
+    ranged = start is not None or end is not None
+    needed = [RECORD_ID, "날짜"] if ranged else [RECORD_ID]
+    read_columns = wanted + [c for c in needed if c not in wanted]
+    has_ids = has_record_ids(csv_path)
+    if not has_ids:
+        read_columns.remove(RECORD_ID)
+
+    def live(chunk):
+        if "날짜" in chunk:
+            chunk["날짜"] = pd.to_datetime(chunk["날짜"])
+        if ranged:
+            chunk = chunk[_date_mask(chunk["날짜"], start, end)]
+        if tombstones:
+            chunk = chunk[~chunk[RECORD_ID].isin(tombstones)]
+        return chunk[wanted]
+
+    first_id = 1
+    with _open_csv_prefix(csv_path, size) as f:
+        chunks = pd.read_csv(
+            f,
+            encoding="utf-8-sig",
+            usecols=read_columns,
+            chunksize=chunk_rows,
+            float_precision="round_trip",
+        )
+        for chunk in chunks:
+            if not has_ids:
+                chunk = _with_record_ids(chunk, first_id)
+                first_id += len(chunk)
+            chunk = live(chunk)
+            if not chunk.empty:
+                yield chunk.reset_index(drop=True)
+
+
+def stream_rollups(csv_path, chunk_rows=STREAM_CHUNK_ROWS, tombstones=None):
+    """CSV 를 조각으로 읽으며 과목별·날짜별 누적 통계를 처음부터 셉니다."""
+    totals = {"subjects": {}, "days": {}}
+    for chunk in iter_record_chunks(
+        csv_path,
+        ["날짜", "과목", "공부 시간(분)", "집중도"],
+        chunk_rows=chunk_rows,
+        tombstones=tombstones,
+    ):
+        study_profile.note_rows(len(chunk))
+        _add_rollups(totals, _rollup_totals(chunk))
+    return totals
+
+
+@study_profile.profiled("store:read_rollups")
+def read_rollups(csv_path, store_dir):
+    """과목별·날짜별 누적 통계 {"subjects": {과목: [...]}, "days": {날짜: [...]}}.
+
+    manifest 에 저장된 값에 새로 덧붙은 행과 새 삭제 표시만 반영하므로 전체
+    기록을 다시 읽지 않습니다. 저장된 값이 없거나 믿을 수 없을 때만 다시 셉니다.
+    """
+    if not os.path.exists(csv_path):
+        return {"subjects": {}, "days": {}}
+    with locked(csv_path):
+        sync_csv(csv_path, store_dir)
+        manifest = _read_manifest(store_dir)
+        rollups = _stored_rollups(manifest)
+        changed = None if rollups is None else _apply_new_tombstones(csv_path, rollups)
+        if changed is None:
+            # 조각 단위로 다시 세므로 기록이 아무리 커도 메모리 사용량이 일정합니다.
+            # 센 뒤에 덧붙은 삭제 표시는 다음 조회 때 빼도록 읽은 위치를 기억합니다.
+            tombstone_ids, tombstone_offset = _tombstones_after(csv_path, 0)
+            rollups = {
+                **stream_rollups(csv_path, tombstones=set(tombstone_ids)),
+                "tombstone_offset": tombstone_offset,
+                "version": ROLLUP_VERSION,
+            }
+        if changed is not False:
+            manifest["rollups"] = rollups
+            _write_manifest(store_dir, manifest)
+        return rollups
+
+
+def subject_stats(csv_path, store_dir):
+    """과목별 [기록 수, 공부 시간 합, 집중도 합, 집중도×공부 시간 합]."""
+    return read_rollups(csv_path, store_dir)["subjects"]
+
+
+def daily_stats(csv_path, store_dir):
+    """날짜(YYYY-MM-DD)별 [기록 수, 공부 시간 합, 집중도 합, 집중도 1~5 의 기록 수]."""
+    return read_rollups(csv_path, store_dir)["days"]
+
+
+def _segment_summaries(store_dir, manifest, segments):
+    """세그먼트별 과목별 공부 내용 요약. 없는 요약은 만들어 세그먼트 옆에 저장합니다.
+
+    요약이 없는 세그먼트는 STREAM_CHUNK_ROWS 행 정도씩 묶어 읽고 한 번에 요약하므로,
+    처음 요약할 때도 세그먼트 수만큼 groupby 를 되풀이하지 않습니다.
+    """
+    summaries = [None] * len(segments)
+    missing = []
+    for position, segment in enumerate(segments):
+        path = os.path.join(store_dir, f"{segment['file']}{CONTENT_SUMMARY_SUFFIX}")
+        try:
+            with open(path, encoding="utf-8") as f:
+                summaries[position] = json.load(f)
+        except (FileNotFoundError, ValueError):
+            missing.append(position)
+
+    def summarize_batch(batch):
+        frames = [
+            _read_segment(
+                store_dir, manifest, segments[position], study_contents.CONTENT_COLUMNS
+            )
+            for position in batch
+        ]
+        df = pd.concat(frames, ignore_index=True)
+        study_profile.note_rows(len(df))
+        parts = np.repeat(batch, [len(frame) for frame in frames])
+        by_part = study_contents.summarize_parts(df, parts)
+        for position in batch:
+            summary = by_part.get(position, {})
+            path = os.path.join(
+                store_dir, f"{segments[position]['file']}{CONTENT_SUMMARY_SUFFIX}"
+            )
+            # json.dump 는 순수 파이썬 인코더로 조금씩 쓰므로 한 번에 인코딩해 씁니다.
+            text = json.dumps(summary, ensure_ascii=False)
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(f"{path}.tmp", path)
+            summaries[position] = summary
+
+    batch, batch_rows = [], 0
+    for position in missing:
+        batch.append(position)
+        batch_rows += segments[position].get("rows", 0)
+        if batch_rows >= STREAM_CHUNK_ROWS:
+            summarize_batch(batch)
+            batch, batch_rows = [], 0
+    if batch:
+        summarize_batch(batch)
+    return summaries
+
+
+def _covers(segment, start, end):
+    """segment 의 월 파티션 전체가 start~end 안에 드는지."""
+    if start is None and end is None:
+        return True
+    try:
+        first = pd.Timestamp(f"{segment['partition']}-01")
+    except (KeyError, TypeError, ValueError):
+        return False  # 파티션 이름이 없는 예전 세그먼트·날짜 없는 기록
+    last = first + pd.offsets.MonthEnd(0)
+    return (start is None or pd.Timestamp(start) <= first) and (
+        end is None or pd.Timestamp(end) >= last
+    )
+
+
+@study_profile.profiled("store:content_summaries")
+def content_summaries(csv_path, store_dir, start=None, end=None):
+    """start~end(양 끝 포함) 기록의 과목별 공부 내용 요약(study_contents).
+
+    기간 안에 통째로 드는 월 세그먼트는 저장해 둔 요약을 더하고, 기간에 걸친
+    세그먼트만 읽어 그 기간의 행으로 요약합니다. 삭제 표시된 기록은 색인으로
+    찾아 뺍니다.
+    """
+    if not os.path.exists(csv_path):
+        return {}
+    with locked(csv_path):
+        sync_csv(csv_path, store_dir)
+        manifest = _read_manifest(store_dir)
+        segments = _segments_in_range(manifest, start, end)
+        covered = [segment for segment in segments if _covers(segment, start, end)]
+        parts = _segment_summaries(store_dir, manifest, covered)
+        for segment in segments:
+            if _covers(segment, start, end):
+                continue
+            df = _read_segment(
+                store_dir, manifest, segment, study_contents.CONTENT_COLUMNS + ["날짜"]
+            )
+            study_profile.note_rows(len(df))
+            parts.append(
+                study_contents.summarize(df[_date_mask(df["날짜"], start, end)])
+            )
+        summaries = study_contents.merge(parts)
+        header = None
+        for record_id in sorted(read_tombstones(csv_path)):
+            if record_id < 1:
+                continue
+            _, fields = _read_indexed_line(csv_path, record_id)
+            if not fields:
+                continue  # 압축으로 이미 빠진 기록
+            if fields[0] != str(record_id):
+                return _live_content_summaries(csv_path, store_dir, start, end)
+            header = header or _csv_header(csv_path)
+            record = _typed_record(header, fields)
+            day = pd.Timestamp(record["날짜"])
+            if (start is None or day >= pd.Timestamp(start)) and (
+                end is None or day <= pd.Timestamp(end)
+            ):
+                study_contents.subtract(
+                    summaries,
+                    record["과목"],
+                    record["공부 내용"],
+                    record["공부 시간(분)"],
+                )
+        return summaries
+
+
+def _live_content_summaries(csv_path, store_dir, start, end):
+    df = _live_records(
+        csv_path, store_dir, study_contents.CONTENT_COLUMNS, start, end, memo=False
+    )
+    study_profile.note_rows(len(df))
+    return study_contents.summarize(df)
+
+
+@study_profile.profiled("store:compact_csv")
+def compact_csv(csv_path, store_dir):
+    """삭제된 기록을 빼고 CSV 를 다시 씁니다(임시 파일 + 이름 바꾸기).
+
+    CSV 를 조각 단위로 읽어 남은 기록을 새 CSV 와 새 세그먼트에 나눠 쓰고
+    누적 통계도 함께 세므로, 메모리에는 한 조각만 둡니다.
+    """
+    with locked(csv_path):
+        sync_csv(csv_path, store_dir)
+        tombstones = read_tombstones(csv_path)
+        if not tombstones:
+            return
+        manifest = _read_manifest(store_dir)
+        old_segments = manifest["segments"]
+        manifest["segments"] = []
+        manifest["max_id"] = 0
+        rollups = {"subjects": {}, "days": {}}
+
+        def live_chunks():
+            for chunk in iter_record_chunks(csv_path, tombstones=tombstones):
+                _append_segment(store_dir, manifest, chunk)
+                _note_max_id(manifest, chunk)
+                _add_rollups(rollups, _rollup_totals(chunk))
+                yield chunk
+
+        _rewrite_csv(csv_path, live_chunks())
+        reset_index(csv_path)
+        # 가장 큰 삭제 ID 는 남겨 두어 ID 가 다시 쓰이지 않게 합니다.
+        max_deleted = max(tombstones)
+        tmp_path = f"{tombstone_path_for(csv_path)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            if max_deleted > manifest["max_id"]:
+                f.write(f"{max_deleted}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, tombstone_path_for(csv_path))
+        # 방금 쓴 CSV 를 기준 상태로 기록해 다음 동기화 때 다시 읽지 않게 합니다.
+        manifest["source"] = _source_state(csv_path, _hash_file(csv_path)[0])
+        manifest["rollups"] = {
+            **rollups,
+            "tombstone_offset": _tombstone_size(csv_path),
+            "version": ROLLUP_VERSION,
+        }
+        _write_manifest(store_dir, manifest)
+        _remove_segments(store_dir, old_segments)
+        compact(store_dir)
+
+
+def compact_in_background(csv_path, store_dir):
+    """압축을 백그라운드 스레드에서 실행합니다."""
+    global _compaction_thread
+    if _compaction_thread is not None and _compaction_thread.is_alive():
+        return
+    _compaction_thread = threading.Thread(
+        target=compact_csv, args=(csv_path, store_dir), name="study-log-compaction"
+    )
+    _compaction_thread.start()
+
+
+def _read_indexed_line(csv_path, record_id):
+    """색인으로 기록 ID 의 행을 찾아 (바이트 위치, 필드 목록)을 돌려줍니다."""
+    refresh_index(csv_path)
+    with open(index_path_for(csv_path), "rb") as index:
+        index.seek(INDEX_SLOT.size * record_id)
+        slot = index.read(INDEX_SLOT.size)
+    offset = INDEX_SLOT.unpack(slot)[0] if len(slot) == INDEX_SLOT.size else 0
+    if not offset:
+        return None, None
+    with open(csv_path, "rb") as f:
+        f.seek(offset)
+        row = read_csv_row(f).decode("utf-8")
+    return offset, next(csv.reader(io.StringIO(row, newline="")), [])
+
+
+def _csv_header(csv_path):
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def _typed_record(header, fields):
+    record = dict(zip(header, fields))
+    record[RECORD_ID] = int(record[RECORD_ID])
+    record["공부 시간(분)"] = float(record["공부 시간(분)"])
+    record["집중도"] = int(record["집중도"])
+    return record
+
+
+def lookup_record(csv_path, record_id):
+    """기록 ID 로 기록 하나를 찾습니다. 없거나 삭제된 기록이면 None."""
+    with locked(csv_path):
+        return _lookup_record(csv_path, record_id)
+
+
+def _lookup_record(csv_path, record_id):
+    if (
+        record_id < 1
+        or not os.path.exists(csv_path)
+        or record_id in read_tombstones(csv_path)
+    ):
+        return None
+    _, fields = _read_indexed_line(csv_path, record_id)
+    if fields is not None and fields[0] != str(record_id):
+        # 색인이 가리키는 행이 다르면 CSV 가 밖에서 바뀐 것이므로 다시 만듭니다.
+        reset_index(csv_path)
+        _, fields = _read_indexed_line(csv_path, record_id)
+    if not fields or fields[0] != str(record_id):
+        return None
+    return _typed_record(_csv_header(csv_path), fields)
+
+
+def _indexed_ids(csv_path):
+    """색인에 위치가 있는 기록 ID 를 오름차순 배열로 돌려줍니다."""
+    refresh_index(csv_path)
+    slots = np.fromfile(index_path_for(csv_path), dtype="<u8", offset=INDEX_SLOT.size)
+    return np.flatnonzero(slots) + 1
+
+
+def _matching_ids(csv_path, store_dir, start, end, subject, concentration):
+    """조건에 맞는 삭제되지 않은 기록 ID 를 오름차순 배열로 돌려줍니다.
+
+    조건이 없으면 색인만 읽고, 있으면 저장소에서 조건에 쓰는 컬럼만 읽습니다.
+    """
+    filtered = start is not None or end is not None
+    filtered = filtered or bool(subject) or concentration is not None
+    if not filtered and has_record_ids(csv_path):
+        ids = _indexed_ids(csv_path)
+        tombstones = read_tombstones(csv_path)
+        if tombstones:
+            ids = ids[~np.isin(ids, list(tombstones))]
+        return ids
+    columns = [RECORD_ID]
+    if subject:
+        columns.append("과목")
+    if concentration is not None:
+        columns.append("집중도")
+    df = _live_records(csv_path, store_dir, columns, start, end)
+    mask = pd.Series(True, index=df.index)
+    if subject:
+        mask &= df["과목"].str.contains(subject, regex=False, na=False)
+    if concentration is not None:
+        low, high = concentration
+        mask &= df["집중도"].between(low, high)
+    return np.sort(df[RECORD_ID].to_numpy()[mask.to_numpy()])
+
+
+def _page_frame(csv_path, store_dir, page_ids, columns):
+    """page_ids 의 기록을 그 순서대로 읽습니다. 색인이 있으면 그 행만 엽니다."""
+    if has_record_ids(csv_path):
+        rows = [_lookup_record(csv_path, int(record_id)) for record_id in page_ids]
+        df = pd.DataFrame([row for row in rows if row is not None], columns=COLUMNS)
+        # 저장소처럼 빈 공부 내용은 NaN 으로 둡니다.
+        df["공부 내용"] = df["공부 내용"].replace("", np.nan)
+        return coerce_schema(df)[columns]
+    # 기록 ID 가 없는 예전 CSV 는 첫 쓰기 전까지 저장소에서 찾습니다.
+    read_columns = columns + [RECORD_ID] if RECORD_ID not in columns else columns
+    df = _live_records(csv_path, store_dir, read_columns).set_index(
+        RECORD_ID, drop=False
+    )
+    return df.loc[page_ids, columns].reset_index(drop=True)
+
+
+@study_profile.profiled("store:query_records")
+def query_records(
+    csv_path,
+    store_dir,
+    start=None,
+    end=None,
+    subject=None,
+    concentration=None,
+    page=0,
+    page_size=20,
+    columns=None,
+):
+    """조건에 맞는 기록 중 한 페이지만 최신순(기록 ID 역순)으로 돌려줍니다.
+
+    조건이 없으면 색인만으로 ID 를 세고, 있으면 조건에 쓰는 컬럼만 저장소에서
+    훑습니다(기간 조건은 해당 월 파티션만). 전체 행을 읽는 것은 해당 페이지의
+    기록뿐이며 색인의 위치로 CSV 에서 바로 꺼냅니다.
+    반환값은 (페이지 DataFrame, 조건에 맞는 전체 건수).
+    """
+    columns = list(columns) if columns is not None else COLUMNS
+    if not os.path.exists(csv_path):
+        return pd.DataFrame(columns=columns), 0
+    with locked(csv_path):
+        sync_csv(csv_path, store_dir)
+        ids = _matching_ids(csv_path, store_dir, start, end, subject, concentration)
+        page_ids = ids[::-1][page * page_size : (page + 1) * page_size]
+        return _page_frame(csv_path, store_dir, page_ids, columns), len(ids)
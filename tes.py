@@ -1,13 +1,18 @@
 import plotly.graph_objects as go
 import webbrowser
 
+from sss import write_chart_html
+
 # 가장 단순한 막대 그래프를 만듭니다.
-fig = go.Figure(go.Bar(x=['A', 'B', 'C'], y=[10, 20, 15]))
+data = {"x": ["A", "B", "C"], "y": [10, 20, 15]}
 
-# 인터넷 연결 없이도 열리도록 HTML 파일로 저장합니다.
-fig.write_html("test.html", include_plotlyjs='inline')
+# 차트 폴더의 공용 plotly.js 를 쓰므로 인터넷 연결 없이도 열립니다.
+# 같은 데이터로 이미 만든 파일이 있으면 다시 쓰지 않습니다.
+chart_path, _ = write_chart_html(
+    lambda: go.Figure(go.Bar(x=data["x"], y=data["y"])), data, "test"
+)
 
 # 저장된 파일을 브라우저에서 엽니다.
-webbrowser.open_new_tab("test.html")
+webbrowser.open_new_tab(chart_path)
 
-print("'test.html' 파일을 생성하고 브라우저에서 열었습니다.")
\ No newline at end of file
+print(f"'{chart_path}' 파일을 생성하고 브라우저에서 열었습니다.")
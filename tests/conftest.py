@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""테스트 공용 준비물. 저장소 루트의 모듈을 불러올 수 있게 하고, 기록 파일을 임시 폴더에 둡니다."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sss  # noqa: E402
+import study_store  # noqa: E402
+
+
+@pytest.fixture
+def log_files(tmp_path, monkeypatch):
+    """sss 가 임시 폴더의 기록·목표 파일을 쓰게 하고 기록 CSV 경로를 돌려줍니다."""
+    csv_path = str(tmp_path / "study_log.csv")
+    monkeypatch.setattr(sss, "DATA_FILE", csv_path)
+    monkeypatch.setattr(sss, "GOAL_FILE", str(tmp_path / "study_goals.csv"))
+    monkeypatch.setattr(sss, "STORE_DIR", study_store.store_dir_for(csv_path))
+    study_store._MEMO.clear()
+    return csv_path
+
+
+@pytest.fixture
+def store_dir(log_files):
+    return study_store.store_dir_for(log_files)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import os
+import sys
+
+import pytest
+
+import sss
+import study_cli
+import study_store
+
+CSV_HEADER = "날짜,과목,공부 시간(분),공부 내용,집중도\n"
+
+
+@pytest.fixture
+def run_cli(log_files, monkeypatch, capsys):
+    monkeypatch.setattr(sss, "console", sss.console)
+
+    def run(*argv, stdin=None):
+        if stdin is not None:
+            monkeypatch.setattr(
+                sys, "stdin", io.TextIOWrapper(io.BytesIO(stdin.encode("utf-8")))
+            )
+        code = study_cli.main(["--data", log_files, *argv])
+        return code, json.loads(capsys.readouterr().out)
+
+    return run
+
+
+def test_import_stdin_with_bom(run_cli, log_files):
+    code, result = run_cli(
+        "import", stdin="\ufeff" + CSV_HEADER + "2026-01-05,수학1,30,수열,4\n"
+    )
+    assert (code, result["imported"], result["errors"]) == (0, 1, [])
+    assert study_store.lookup_record(log_files, 1)["과목"] == "수학1"
+
+
+def test_import_rejects_missing_date(run_cli, log_files, tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_text(
+        CSV_HEADER + "2026-01-05,수학1,30,,4\n,화학1,20,,3\n", encoding="utf-8"
+    )
+    code, result = run_cli("import", str(path))
+    assert (code, result["imported"]) == (1, 0)
+    assert [error["line"] for error in result["errors"]] == [2]
+
+
+def test_import_reports_non_object_jsonl(run_cli, log_files, tmp_path):
+    path = tmp_path / "rows.jsonl"
+    rows = [
+        {"날짜": "2026-01-05", "과목": "수학1", "공부 시간(분)": 30, "집중도": 4},
+        [1, 2],
+        3,
+    ]
+    path.write_text(
+        "\n".join(json.dumps(row, ensure_ascii=False) for row in rows) + "\n{\n",
+        encoding="utf-8",
+    )
+    code, result = run_cli("import", str(path), "--format", "jsonl")
+    assert (code, result["imported"]) == (1, 0)
+    assert [error["line"] for error in result["errors"]] == [2, 3, 4]
+
+    code, result = run_cli("import", str(path), "--format", "jsonl", "--skip-invalid")
+    assert (code, result["imported"], result["first_id"]) == (0, 1, 1)
+    assert len(result["errors"]) == 3
+
+
+def test_import_reports_invalid_values(run_cli, log_files, tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_text(
+        CSV_HEADER
+        + "2026-01-05,없는과목,30,,4\n"
+        + "2026-01-05,수학1,30,,9\n"
+        + "2026-01-05,수학1,-1,,3\n"
+        + "2026/01/05,수학1,30,,3\n"
+        + "2026-01-05,수학1,,,3\n",
+        encoding="utf-8",
+    )
+    code, result = run_cli("import", str(path))
+    assert (code, result["imported"]) == (1, 0)
+    assert [error["line"] for error in result["errors"]] == [1, 2, 3, 4, 5]
+    assert not os.path.exists(log_files)
+
+
+def test_import_missing_file(run_cli, tmp_path):
+    code, result = run_cli("import", str(tmp_path / "없는 파일.csv"))
+    assert code == 1
+    assert "error" in result
+
+
+def test_import_skip_invalid_writes_in_batches(
+    run_cli, log_files, tmp_path, monkeypatch
+):
+    import study_records
+
+    appended = []
+    append = study_records.append_csv_records
+    monkeypatch.setattr(study_records, "WRITE_BATCH_SIZE", 2)
+    monkeypatch.setattr(
+        study_records,
+        "append_csv_records",
+        lambda path, records: appended.append(len(records)) or append(path, records),
+    )
+    path = tmp_path / "rows.csv"
+    path.write_text(
+        CSV_HEADER
+        + "".join(f"2026-01-0{day},수학1,30,,4\n" for day in range(1, 5))
+        + "2026-01-05,없는과목,30,,4\n"
+        + "2026-01-06,화학1,20,,3\n",
+        encoding="utf-8",
+    )
+    code, result = run_cli("import", str(path), "--skip-invalid")
+    assert (code, result["imported"], result["first_id"], result["last_id"]) == (
+        0,
+        5,
+        1,
+        5,
+    )
+    assert appended == [2, 2, 1]
+
+    appended.clear()
+    code, result = run_cli("import", str(path))
+    assert (code, result["imported"], appended) == (1, 0, [])
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+import copy
+
+import numpy as np
+import pandas as pd
+
+import study_contents
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=study_contents.CONTENT_COLUMNS)
+
+
+def many_contents(subject, count, seed=0):
+    rng = np.random.default_rng(seed)
+    return frame(
+        [
+            (subject, f"단원 {i}", float(minutes))
+            for i, minutes in enumerate(rng.integers(1, 10, count))
+        ]
+    )
+
+
+def test_merge_of_parts_matches_whole_when_exact():
+    df = frame(
+        [
+            ("수학1", "수열", 30.0),
+            ("수학1", "극한", 20.0),
+            ("화학1", "몰", 40.0),
+            ("수학1", "수열", 10.0),
+            ("화학1", None, 5.0),
+        ]
+    )
+    parts = [
+        study_contents.summarize(df.iloc[:2]),
+        study_contents.summarize(df.iloc[2:]),
+    ]
+    before = copy.deepcopy(parts)
+    merged = study_contents.merge(parts)
+    assert parts == before
+    assert merged == study_contents.summarize(df)
+    assert merged["수학1"]["contents"]["수열"] == [2, 40.0]
+    assert merged["화학1"]["records"] == 2
+
+
+def test_merge_keeps_totals_exact_and_heavy_contents():
+    heavy = frame([("수학1", "미적분", 500.0)])
+    parts = [
+        study_contents.summarize(many_contents("수학1", 300, seed)) for seed in range(3)
+    ]
+    parts.append(study_contents.summarize(heavy))
+    expected = pd.concat([many_contents("수학1", 300, seed) for seed in range(3)])
+    merged = study_contents.merge(parts)["수학1"]
+    assert not merged["exact"]
+    assert merged["records"] == len(expected) + 1
+    assert merged["minutes"] == expected["공부 시간(분)"].sum() + 500.0
+    assert len(merged["contents"]) <= study_contents.SKETCH_SIZE
+    # 과목 시간의 1/(SKETCH_SIZE+1) 보다 많이 공부한 내용은 남고, 값은 실제 이하입니다.
+    assert 0 < merged["contents"]["미적분"][1] <= 500.0
+    top = study_contents.top_contents(merged, 1)
+    assert top[0][0] == "미적분"
+
+
+def test_distinct_contents_estimate():
+    summary = study_contents.summarize(many_contents("수학1", 5000))["수학1"]
+    distinct, exact = study_contents.distinct_contents(summary)
+    assert not exact
+    assert abs(distinct - 5000) / 5000 < 0.2
+
+    small = study_contents.summarize(many_contents("수학1", 10))["수학1"]
+    assert study_contents.distinct_contents(small) == (10, True)
+
+
+def test_subtract_undoes_a_record_in_exact_summaries():
+    df = frame(
+        [("수학1", "수열", 30.0), ("수학1", "극한", 20.0), ("화학1", "몰", 40.0)]
+    )
+    summaries = study_contents.summarize(df)
+    study_contents.subtract(summaries, "수학1", "극한", 20.0)
+    assert summaries == study_contents.summarize(df.iloc[[0, 2]])
+    study_contents.subtract(summaries, "화학1", "몰", 40.0)
+    assert "화학1" not in summaries
+
+
+def test_subtract_marks_sketches_approximate():
+    summaries = study_contents.summarize(many_contents("수학1", 300))
+    summary = summaries["수학1"]
+    records, minutes = summary["records"], summary["minutes"]
+    content, _, _ = study_contents.top_contents(summary, 1)[0]
+    study_contents.subtract(summaries, "수학1", content, 9.0)
+    assert summary["subtracted"]
+    assert (summary["records"], summary["minutes"]) == (records - 1, minutes - 9.0)
+    assert study_contents.distinct_contents(summary)[1] is False
+
+
+def test_summarize_parts_matches_summarize_per_part():
+    df = pd.concat(
+        [
+            many_contents("수학1", 200, seed=1),
+            frame(
+                [("화학1", "몰", 40.0), ("화학1", None, 5.0), (None, "빈 과목", 9.0)]
+            ),
+            many_contents("수학1", 30, seed=2),
+        ],
+        ignore_index=True,
+    )
+    parts = [3] * 200 + [7] * 3 + [5] * 30
+    by_part = study_contents.summarize_parts(df, parts)
+    assert by_part == {
+        3: study_contents.summarize(df.iloc[:200]),
+        7: study_contents.summarize(df.iloc[200:203]),
+        5: study_contents.summarize(df.iloc[203:]),
+    }
+    assert by_part[3]["수학1"]["exact"] is False
+    assert by_part[7]["화학1"] == {
+        "records": 2,
+        "minutes": 45.0,
+        "contents": {"몰": [1, 40.0]},
+        "exact": True,
+    }
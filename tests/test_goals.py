@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+
+import study_goals
+
+WEEK = date(2025, 8, 11)
+NEXT_WEEK = date(2025, 8, 18)
+
+
+def test_set_goal_upserts_and_keeps_history(tmp_path):
+    goal_path = str(tmp_path / "study_goals.csv")
+    assert study_goals.get_goal(goal_path, WEEK) is None
+    study_goals.set_goal(goal_path, WEEK, 3)
+    study_goals.set_goal(goal_path, NEXT_WEEK, 4)
+    study_goals.set_goal(goal_path, WEEK, 5.5)
+    assert study_goals.get_goal(goal_path, WEEK) == 5.5
+    assert study_goals.weekly_goals(goal_path) == {WEEK: 5.5, NEXT_WEEK: 4.0}
+    history = study_goals.goal_history(goal_path)
+    assert [(entry["week_start"], entry["goal_hours"]) for entry in history] == [
+        (WEEK, 3.0),
+        (NEXT_WEEK, 4.0),
+        (WEEK, 5.5),
+    ]
+    assert study_goals.goal_history(goal_path, start=NEXT_WEEK) == [history[1]]
+    # 캐시 없이 처음부터 읽어도 같은 값입니다.
+    study_goals._GOAL_CACHE.clear()
+    assert study_goals.weekly_goals(goal_path) == {WEEK: 5.5, NEXT_WEEK: 4.0}
+
+
+def test_goals_are_kept_per_student(tmp_path):
+    goal_path = str(tmp_path / "study_goals.csv")
+    study_goals.set_goal(goal_path, WEEK, 3, student="김철수")
+    study_goals.set_goal(goal_path, WEEK, 6, student="이영희")
+    assert study_goals.get_goal(goal_path, WEEK, student="김철수") == 3.0
+    assert study_goals.get_goal(goal_path, WEEK, student="이영희") == 6.0
+    assert study_goals.get_goal(goal_path, WEEK) is None
+    assert study_goals.weekly_goals(goal_path, student="이영희") == {WEEK: 6.0}
+    assert len(study_goals.goal_history(goal_path, student="김철수")) == 1
+
+
+def test_legacy_goal_file_is_read_and_upgraded(tmp_path):
+    goal_path = tmp_path / "study_goals.csv"
+    goal_path.write_bytes(
+        "\ufeff주 시작일,목표 시간(시간)\n2025-08-04 00:00:00,2.0\n".encode("utf-8")
+    )
+    assert study_goals.get_goal(str(goal_path), date(2025, 8, 4)) == 2.0
+    study_goals.set_goal(str(goal_path), WEEK, 3)
+    header = goal_path.read_text(encoding="utf-8-sig").splitlines()[0]
+    assert header.split(",") == study_goals.GOAL_COLUMNS
+    study_goals._GOAL_CACHE.clear()
+    assert study_goals.weekly_goals(str(goal_path)) == {
+        date(2025, 8, 4): 2.0,
+        WEEK: 3.0,
+    }
+
+
+def test_last_row_without_newline_is_read_and_kept(tmp_path):
+    goal_path = tmp_path / "study_goals.csv"
+    goal_path.write_bytes(
+        "\ufeff주 시작일,목표 시간(시간)\n2025-08-11,3.0".encode("utf-8")
+    )
+    assert study_goals.get_goal(str(goal_path), WEEK) == 3.0
+    study_goals.set_goal(str(goal_path), NEXT_WEEK, 4)
+    study_goals._GOAL_CACHE.clear()
+    assert study_goals.weekly_goals(str(goal_path)) == {WEEK: 3.0, NEXT_WEEK: 4.0}
+
+    # 새 형식 파일이 줄바꿈 없이 끝나도 다음 목표가 같은 줄에 붙지 않습니다.
+    with open(goal_path, "rb+") as f:
+        f.truncate(f.seek(0, 2) - len(b"\n"))
+    study_goals.set_goal(str(goal_path), date(2025, 8, 25), 5)
+    study_goals._GOAL_CACHE.clear()
+    assert study_goals.get_goal(str(goal_path), NEXT_WEEK) == 4.0
+    assert study_goals.get_goal(str(goal_path), date(2025, 8, 25)) == 5.0
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import json
+import tracemalloc
+
+import pytest
+
+import study_profile
+
+
+@pytest.fixture
+def profiling(tmp_path, monkeypatch):
+    """측정을 켜고 추적 파일 경로를 돌려줍니다. 시계는 테스트가 정한 값을 씁니다."""
+    trace_path = tmp_path / "trace.jsonl"
+    monkeypatch.setattr(
+        study_profile,
+        "_state",
+        {"enabled": True, "trace_path": str(trace_path), "session": "test"},
+    )
+    monkeypatch.setattr(study_profile, "_summary", {})
+    clock = [0.0]
+    monkeypatch.setattr(study_profile.time, "perf_counter", lambda: clock[0])
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    yield trace_path, clock
+    if not tracing:
+        tracemalloc.stop()
+
+
+def _traces(trace_path):
+    lines = trace_path.read_text(encoding="utf-8").splitlines()
+    return {trace["phase"]: trace for trace in map(json.loads, lines)}
+
+
+def test_nested_phases_record_parent_and_self_time(profiling):
+    trace_path, clock = profiling
+
+    @study_profile.profiled("load")
+    def load():
+        clock[0] += 3.0
+        return [1, 2]
+
+    with study_profile.phase("menu"):
+        clock[0] += 1.0
+        load()
+        with study_profile.phase("draw"):
+            clock[0] += 2.0
+            study_profile.note_rows(5)
+        clock[0] += 4.0
+
+    traces = _traces(trace_path)
+    assert traces["menu"]["parent"] is None
+    assert traces["load"]["parent"] == traces["draw"]["parent"] == "menu"
+    assert (traces["menu"]["seconds"], traces["menu"]["self_seconds"]) == (10.0, 5.0)
+    assert traces["load"]["self_seconds"] == 3.0
+    # shape 가 없는 결과는 행 수를 세지 않습니다.
+    assert traces["load"]["rows"] is None
+    assert traces["draw"]["rows"] == 5
+    rows = {row[0]: row[1:] for row in study_profile.summary_rows()}
+    assert rows["menu"][:3] == (1, 10.0, 5.0)
+    assert [row[0] for row in study_profile.summary_rows()] == ["menu", "load", "draw"]
+
+
+def test_phase_records_errors_and_restores_the_stack(profiling):
+    trace_path, clock = profiling
+    with study_profile.phase("menu"):
+        with pytest.raises(ValueError):
+            with study_profile.phase("parse"):
+                clock[0] += 1.0
+                raise ValueError
+        clock[0] += 1.0
+
+    traces = _traces(trace_path)
+    assert traces["parse"]["error"] == "ValueError"
+    assert traces["menu"]["self_seconds"] == 1.0
+    assert "error" not in traces["menu"]
+    assert study_profile._stack() == []
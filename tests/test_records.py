@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+import csv
+import json
+import os
+import threading
+
+import pytest
+
+import sss
+import study_records
+import study_store
+
+
+def test_parse_record_rejects_newline_in_content():
+    raw = {"날짜": "2026-01-05", "과목": "수학1", "공부 시간(분)": 30, "집중도": 3}
+    for content in ["수열\n극한", "수열\r극한"]:
+        with pytest.raises(ValueError):
+            study_records.parse_record(
+                {**raw, "공부 내용": content}, sss.SUBJECT_TO_CATEGORY_MAP
+            )
+
+
+def test_index_skips_quoted_newlines(log_files):
+    # 밖에서 만든 CSV 는 공부 내용에 줄바꿈이 있을 수 있습니다.
+    with open(log_files, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(study_records.CSV_HEADER)
+        writer.writerow([1, "2026-01-05", "수학1", 30.0, "수열\n극한", 3])
+        writer.writerow([2, "2026-01-06", "화학1", 40.0, "몰 농도", 4])
+    study_records.append_csv_records(
+        log_files,
+        [
+            {
+                "날짜": "2026-01-07",
+                "과목": "물리학1",
+                "공부 시간(분)": 50.0,
+                "공부 내용": "역학",
+                "집중도": 5,
+            }
+        ],
+    )
+    assert study_store.lookup_record(log_files, 1)["공부 내용"] == "수열\n극한"
+    assert study_store.lookup_record(log_files, 2)["과목"] == "화학1"
+    assert study_store.lookup_record(log_files, 3)["과목"] == "물리학1"
+    assert study_records.next_record_id(log_files) == 4
+
+
+RECORD = {
+    "날짜": "2026-01-05",
+    "과목": "수학1",
+    "공부 시간(분)": 30.0,
+    "공부 내용": "수열",
+    "집중도": 4,
+}
+
+
+def _write_journal(csv_path, csv_size, payload):
+    with open(study_records.journal_path_for(csv_path), "wb") as f:
+        meta = {"csv_size": csv_size, "length": len(payload)}
+        f.write(json.dumps(meta).encode("utf-8") + b"\n" + payload)
+
+
+def _record_ids(csv_path):
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        return [int(row[study_records.RECORD_ID]) for row in csv.DictReader(f)]
+
+
+def test_complete_journal_is_replayed_once(log_files):
+    study_records.append_csv_records(log_files, [RECORD])
+    size = os.path.getsize(log_files)
+    payload = study_records.encode_records([RECORD, RECORD], 2)
+    # CSV 에 일부만 덧붙인 채 멈춘 경우와 다 쓰고 저널만 못 지운 경우
+    for written in [payload[:10], payload]:
+        with open(log_files, "ab") as f:
+            f.write(written)
+        _write_journal(log_files, size, payload)
+        assert study_store.lookup_record(log_files, 3)["과목"] == "수학1"
+        assert _record_ids(log_files) == [1, 2, 3]
+        assert not os.path.exists(study_records.journal_path_for(log_files))
+        with open(log_files, "r+b") as f:
+            f.truncate(size)
+
+
+def test_torn_journal_is_discarded(log_files):
+    study_records.append_csv_records(log_files, [RECORD])
+    size = os.path.getsize(log_files)
+    payload = study_records.encode_records([RECORD, RECORD], 2)
+    _write_journal(log_files, size, payload)
+    with open(study_records.journal_path_for(log_files), "r+b") as f:
+        f.truncate(f.seek(0, os.SEEK_END) - 5)
+    assert study_records.append_csv_records(log_files, [RECORD]) == [2]
+    assert _record_ids(log_files) == [1, 2]
+    assert not os.path.exists(study_records.journal_path_for(log_files))
+
+
+def test_single_record_append_skips_journal(log_files, monkeypatch):
+    study_records.append_csv_records(log_files, [RECORD])
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: fsyncs.append(fd) or real_fsync(fd))
+    study_records.append_csv_records(log_files, [RECORD])
+    assert len(fsyncs) == 1
+    study_records.append_csv_records(log_files, [RECORD, RECORD])
+    assert len(fsyncs) == 3
+
+
+def test_torn_row_is_cut_and_complete_row_kept(log_files):
+    study_records.append_csv_records(log_files, [RECORD])
+    size = os.path.getsize(log_files)
+    row = study_records.encode_records([RECORD], 2)
+    with open(log_files, "ab") as f:
+        f.write(row[:-8])
+    assert study_records.append_csv_records(log_files, [RECORD]) == [2]
+    assert _record_ids(log_files) == [1, 2]
+
+    with open(log_files, "r+b") as f:
+        f.truncate(size)
+        f.seek(size)
+        f.write(row.rstrip(b"\r\n"))
+    assert study_store.lookup_record(log_files, 2)["공부 내용"] == "수열"
+    assert _record_ids(log_files) == [1, 2]
+    assert study_records.next_record_id(log_files) == 3
+
+
+def test_locks_on_different_files_do_not_wait(tmp_path):
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with study_records.locked(str(tmp_path / "a.csv")):
+            held.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    try:
+        assert held.wait(5)
+        acquired = []
+
+        def acquire():
+            with study_records.locked(str(tmp_path / "b.csv")):
+                acquired.append(True)
+
+        other = threading.Thread(target=acquire)
+        other.start()
+        other.join(2)
+        assert acquired == [True]
+    finally:
+        release.set()
+        thread.join()
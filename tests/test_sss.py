@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import shutil
+
+import matplotlib
+import pandas as pd
+
+import sss
+
+
+def test_setup_korean_font_registers_cached_file(tmp_path, monkeypatch):
+    from matplotlib import font_manager
+
+    source = os.path.join(matplotlib.get_data_path(), "fonts", "ttf", "DejaVuSans.ttf")
+    font_path = str(tmp_path / "CachedFont.ttf")
+    shutil.copy(source, font_path)
+    cache_file = tmp_path / "korean_font.json"
+    monkeypatch.setattr(sss, "FONT_CACHE_FILE", str(cache_file))
+    monkeypatch.setattr(sss, "LINUX_FONT_DIRS", [str(tmp_path / "fonts")])
+    monkeypatch.setattr(sss.platform, "system", lambda: "Linux")
+    monkeypatch.setattr(sss, "_korean_font_ready", False)
+    cache_file.write_text(
+        json.dumps(
+            {
+                "name": "DejaVu Sans",
+                "path": font_path,
+                "signature": sss._font_dirs_signature(),
+            }
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setitem(matplotlib.rcParams, "font.family", ["sans-serif"])
+    monkeypatch.setitem(matplotlib.rcParams, "axes.unicode_minus", True)
+
+    sss.setup_korean_font()
+
+    assert font_path in {font.fname for font in font_manager.fontManager.ttflist}
+    assert matplotlib.rcParams["font.family"] == ["DejaVu Sans"]
+    assert matplotlib.rcParams["axes.unicode_minus"] is False
+
+
+def test_goal_file_for_matches_default_files(tmp_path):
+    assert sss.goal_file_for(sss.DEFAULT_DATA_FILE) == sss.DEFAULT_GOAL_FILE
+    logs = str(tmp_path)
+    assert sss.goal_file_for(os.path.join(logs, "study_log.csv")) == os.path.join(
+        logs, "study_goals.csv"
+    )
+    assert sss.goal_file_for(os.path.join(logs, "김철수.csv")) == os.path.join(
+        logs, "김철수_goals.csv"
+    )
+
+
+def test_student_files_use_default_goal_file(tmp_path):
+    import study_reports
+
+    csv_path = str(tmp_path / "study_log.csv")
+    for name in ["study_log.csv", "study_goals.csv"]:
+        (tmp_path / name).write_text("", encoding="utf-8")
+    assert study_reports.find_student_logs([str(tmp_path)]) == [csv_path]
+    with study_reports.student_files(csv_path):
+        assert sss.GOAL_FILE == str(tmp_path / "study_goals.csv")
+
+
+def test_load_compact_data_keeps_values_in_small_types(log_files):
+    import study_records
+
+    study_records.append_csv_records(
+        log_files,
+        [
+            {
+                "날짜": "2026-01-05",
+                "과목": "수학1",
+                "공부 시간(분)": 30.5,
+                "공부 내용": "수열",
+                "집중도": 4,
+            },
+            {
+                "날짜": "2026-01-06",
+                "과목": "동아리",
+                "공부 시간(분)": 15.0,
+                "공부 내용": "",
+                "집중도": 2,
+            },
+        ],
+    )
+    compact = sss.load_compact_data(with_content=True)
+    assert str(compact["기록 ID"].dtype) == "int32"
+    assert str(compact["집중도"].dtype) == "int8"
+    assert str(compact["공부 시간(분)"].dtype) == "float32"
+    assert compact["기록 ID"].tolist() == [1, 2]
+    assert compact["날짜"].tolist() == [20458, 20459]
+    assert compact["공부 시간(분)"].tolist() == [30.5, 15.0]
+    # 목록에 없는 과목은 버리지 않고 범주 끝에 덧붙이며, 대분류는 비워 둡니다.
+    assert compact["과목"].tolist() == ["수학1", "동아리"]
+    assert compact["과목"].cat.categories[-1] == "동아리"
+    assert compact["대분류"].tolist()[0] == sss.SUBJECT_TO_CATEGORY_MAP["수학1"]
+    assert pd.isna(compact["대분류"].tolist()[1])
+    assert compact["공부 내용"].tolist()[0] == "수열"
+    assert "공부 내용" not in sss.load_compact_data()
+
+
+def test_goal_history_report_streaks_and_trend(log_files):
+    from datetime import date
+
+    import study_records
+
+    weeks = {
+        date(2026, 1, 5): (1, 60.0),
+        date(2026, 1, 12): (1, 90.0),
+        date(2026, 1, 19): (1, 30.0),
+        date(2026, 1, 26): (2, 120.0),
+        # 2026-02-02 주에는 목표가 없습니다.
+        date(2026, 2, 9): (1, 60.0),
+    }
+    for week, (goal_hours, minutes) in weeks.items():
+        sss.save_weekly_goal(goal_hours, week)
+        # 주 중간(수요일) 기록도 그 주 월요일로 묶여야 합니다.
+        day = pd.Timestamp(week) + pd.Timedelta(days=2)
+        study_records.append_csv_records(
+            log_files,
+            [
+                {
+                    "날짜": day.strftime("%Y-%m-%d"),
+                    "과목": "수학1",
+                    "공부 시간(분)": minutes,
+                    "공부 내용": "",
+                    "집중도": 3,
+                }
+            ],
+        )
+
+    report = sss.goal_history_report()
+    assert report["달성률(%)"].tolist() == [100.0, 150.0, 50.0, 100.0, 100.0]
+    assert report["달성"].tolist() == [True, True, False, True, True]
+    # 못 한 주와 목표가 없는 주에서 연속 달성이 끊깁니다.
+    assert report["연속 달성(주)"].tolist() == [1, 2, 0, 1, 1]
+    assert report["달성률 추세(%)"].tolist() == [100.0, 125.0, 100.0, 100.0, 100.0]
+
+    summary = sss.goal_report_summary(report)
+    assert summary["weeks"] == 5
+    assert summary["achieved_weeks"] == 4
+    assert summary["current_streak"] == 1
+    assert summary["longest_streak"] == 2
+    assert summary["average_achievement_rate"] == 100.0
+
+    # 기록이 바뀌면 계산해 둔 표를 쓰지 않습니다.
+    study_records.append_csv_records(
+        log_files,
+        [
+            {
+                "날짜": "2026-01-21",
+                "과목": "수학1",
+                "공부 시간(분)": 30.0,
+                "공부 내용": "",
+                "집중도": 3,
+            }
+        ],
+    )
+    assert sss.goal_history_report()["연속 달성(주)"].tolist() == [1, 2, 3, 4, 1]
+
+
+def test_choose_trend_resolution_keeps_bars_under_limit():
+    first = pd.Timestamp("2026-01-01")
+    days = pd.Timedelta(days=1)
+    assert sss.choose_trend_resolution(first, first + 89 * days) == "day"
+    assert sss.choose_trend_resolution(first, first + 90 * days) == "week"
+    assert sss.choose_trend_resolution(first, first + 7 * 90 * days) == "month"
+    # 월 단위로도 넘치면 가장 성긴 단위를 씁니다.
+    assert sss.choose_trend_resolution(first, first + 10_000 * days) == "month"
+
+
+def test_trend_window_sums_partial_edge_periods_from_days(log_files):
+    import study_records
+
+    # 2026-01-01 부터 2026-02-28 까지 날마다 (그해 몇째 날)분씩 기록합니다.
+    days = pd.date_range("2026-01-01", "2026-02-28")
+    study_records.append_csv_records(
+        log_files,
+        [
+            {
+                "날짜": day.strftime("%Y-%m-%d"),
+                "과목": "수학1",
+                "공부 시간(분)": float(day.dayofyear),
+                "공부 내용": "",
+                "집중도": 3,
+            }
+            for day in days
+        ],
+    )
+
+    # 2026-01-07(수)~2026-02-10(화): 처음·마지막 주는 범위 안의 날짜만 더합니다.
+    resolution, window = sss.trend_window(
+        pd.Timestamp("2026-01-07"), pd.Timestamp("2026-02-10"), "week"
+    )
+    assert resolution == "week"
+    minutes = window["공부 시간(분)"]
+    assert minutes.index[0] == pd.Timestamp("2026-01-05")
+    assert minutes.iloc[0] == sum(range(7, 12))
+    assert minutes.iloc[1] == sum(range(12, 19))
+    assert minutes.index[-1] == pd.Timestamp("2026-02-09")
+    assert minutes.iloc[-1] == 40 + 41
+    assert minutes.sum() == sum(range(7, 42))
+    assert window["기록 수"].sum() == 35
+
+    resolution, window = sss.trend_window(
+        start=pd.Timestamp("2026-01-15"), resolution="month"
+    )
+    assert window["공부 시간(분)"].tolist() == [sum(range(15, 32)), sum(range(32, 60))]
+
+    # 범위가 기간 경계와 맞으면 미리 묶어 둔 값과 같습니다.
+    _, window = sss.trend_window(
+        pd.Timestamp("2026-01-05"), pd.Timestamp("2026-02-22"), "week"
+    )
+    assert window.equals(sss.trend_aggregates()["week"].loc["2026-01-05":"2026-02-16"])
+    # 단위를 주지 않으면 기간 길이(59일)로 날짜별을 고릅니다.
+    assert sss.trend_window()[0] == "day"
+
+
+def test_write_chart_html_reuses_file_for_same_data(tmp_path):
+    import plotly.graph_objects as go
+
+    chart_dir = str(tmp_path / "charts")
+    built = []
+
+    def build_figure():
+        built.append(True)
+        return go.Figure()
+
+    path, reused = sss.write_chart_html(build_figure, [1, 2], "chart", chart_dir)
+    assert not reused
+    assert sss.write_chart_html(build_figure, [1, 2], "chart", chart_dir) == (
+        path,
+        True,
+    )
+    assert len(built) == 1
+    # HTML 은 plotly.js 를 싣지 않고 차트 폴더의 공용 파일을 가리킵니다.
+    js_name = sss.ensure_plotly_js(chart_dir)
+    assert f'src="{js_name}"' in open(path, encoding="utf-8").read()
+    assert os.path.getsize(path) < os.path.getsize(os.path.join(chart_dir, js_name))
+
+
+def test_write_chart_image_reuses_files_and_removes_old_charts(tmp_path):
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    chart_dir = tmp_path / "charts"
+    chart_dir.mkdir()
+    # 다른 이름의 차트와 해시가 아닌 꼬리가 붙은 파일은 지우지 않습니다.
+    keep = [
+        "other-0123456789abcdef.png",
+        "trend-notes.png",
+        "trend-0123456789abcdef.txt",
+    ]
+    for name in keep:
+        (chart_dir / name).write_bytes(b"")
+    built = []
+
+    def build_figure():
+        built.append(True)
+        fig, _ = plt.subplots()
+        return fig
+
+    first, reused = sss.write_chart_image(
+        build_figure, [1], "trend", ("png", "svg"), str(chart_dir)
+    )
+    assert not reused
+    again = sss.write_chart_image(
+        build_figure, [1], "trend", ("png", "svg"), str(chart_dir)
+    )
+    assert again == (first, True)
+    assert len(built) == 1
+
+    # 형식 하나가 빠지면 다시 그립니다.
+    os.remove(first[1])
+    assert not sss.write_chart_image(
+        build_figure, [1], "trend", ("png", "svg"), str(chart_dir)
+    )[1]
+
+    # 데이터가 바뀌면 새 해시로 그리고, 같은 이름의 예전 차트만 지웁니다.
+    second, _ = sss.write_chart_image(
+        build_figure, [2], "trend", ("png", "svg"), str(chart_dir)
+    )
+    assert second != first
+    assert sorted(os.listdir(chart_dir)) == sorted(
+        keep + [os.path.basename(path) for path in second]
+    )
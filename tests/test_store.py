@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+import tracemalloc
+
+import pandas as pd
+
+import study_records
+import study_store
+from benchmarks.workload import write_synthetic_log
+
+
+def record(day, subject="수학1", minutes=30.0, content="", concentration=3):
+    return {
+        "날짜": day,
+        "과목": subject,
+        "공부 시간(분)": minutes,
+        "공부 내용": content,
+        "집중도": concentration,
+    }
+
+
+def test_memo_keeps_only_recent_frames(log_files, store_dir):
+    study_records.append_csv_records(
+        log_files, [record("2026-01-05"), record("2026-02-05")]
+    )
+    for start in ["2026-01-01", "2026-01-02", "2026-01-03", "2026-01-04"]:
+        study_store.load_records(log_files, store_dir, start=start)
+    assert len(study_store._MEMO) == study_store.MEMO_ENTRIES
+
+
+def test_memo_drops_frames_of_old_generation(log_files, store_dir):
+    study_records.append_csv_records(log_files, [record("2026-01-05")])
+    study_store.load_records(log_files, store_dir)
+    study_store.load_records(log_files, store_dir, columns=["기록 ID"])
+    study_records.append_csv_records(log_files, [record("2026-01-06")])
+    df = study_store.load_records(log_files, store_dir)
+    assert df["기록 ID"].tolist() == [1, 2]
+    generation = study_store._read_manifest(store_dir)["generation"]
+    assert [entry[0] for entry in study_store._MEMO.values()] == [generation]
+
+
+def test_memo_returns_copies(log_files, store_dir):
+    study_records.append_csv_records(log_files, [record("2026-01-05")])
+    df = study_store.load_records(log_files, store_dir)
+    df["과목"] = "바뀐 값"
+    assert study_store.load_records(log_files, store_dir)["과목"].tolist() == ["수학1"]
+
+
+LEGACY_CSV = (
+    "\ufeff날짜,과목,공부 시간(분),공부 내용,집중도\n"
+    "2024-01-02,수학1,50.0,수열,4\n"
+    "2024-01-03,화학1,30.0,,2\n"
+)
+
+
+def test_reads_do_not_rewrite_legacy_csv(log_files, store_dir, tmp_path):
+    import sss
+
+    with open(log_files, "w", encoding="utf-8", newline="") as f:
+        f.write(LEGACY_CSV)
+    before = open(log_files, "rb").read()
+
+    df = sss.load_data()
+    assert df["기록 ID"].tolist() == [1, 2]
+    assert sss.load_subject_stats()["기록 수"].sum() == 2
+    assert sss.load_daily_stats()["공부 시간(분)"].sum() == 80.0
+    assert sss.sunburst_payload() is not None
+    assert list(study_store.iter_record_chunks(log_files))[0]["기록 ID"].tolist() == [
+        1,
+        2,
+    ]
+
+    assert open(log_files, "rb").read() == before
+    assert not (tmp_path / "study_log.idx").exists()
+
+
+def test_legacy_tail_gets_next_ids_in_memory(log_files, store_dir):
+    with open(log_files, "w", encoding="utf-8", newline="") as f:
+        f.write(LEGACY_CSV)
+    study_store.load_records(log_files, store_dir)
+    with open(log_files, "a", encoding="utf-8", newline="") as f:
+        f.write("2024-01-04,물리학1,20.0,역학,5\n")
+    df = study_store.load_records(log_files, store_dir)
+    assert df["기록 ID"].tolist() == [1, 2, 3]
+    assert df["과목"].tolist() == ["수학1", "화학1", "물리학1"]
+
+
+def test_first_write_migrates_legacy_csv_with_same_ids(log_files, store_dir):
+    with open(log_files, "w", encoding="utf-8", newline="") as f:
+        f.write(LEGACY_CSV)
+    before = study_store.load_records(log_files, store_dir)
+    assert study_records.append_csv_records(log_files, [record("2024-01-05")]) == [3]
+    assert study_records.has_record_ids(log_files)
+    after = study_store.load_records(log_files, store_dir)
+    assert after["기록 ID"].tolist() == [1, 2, 3]
+    assert after.iloc[:2].equals(before)
+
+
+def _query_fixture(log_files):
+    study_records.append_csv_records(
+        log_files,
+        [
+            record("2026-01-05", "수학1", concentration=2),
+            record("2026-02-05", "화학1", concentration=4),
+            record("2026-01-20", "수학2", concentration=5),
+            record("2026-03-01", "수학1", concentration=4),
+        ],
+    )
+    study_store.delete_records(log_files, [3])
+
+
+def test_query_records_pages_newest_first(log_files, store_dir):
+    _query_fixture(log_files)
+    page, total = study_store.query_records(log_files, store_dir, page_size=2)
+    assert total == 3
+    assert page["기록 ID"].tolist() == [4, 2]
+    page, _ = study_store.query_records(log_files, store_dir, page=1, page_size=2)
+    assert page["기록 ID"].tolist() == [1]
+    assert page["날짜"].tolist() == [pd.Timestamp("2026-01-05")]
+
+
+def test_query_records_filters(log_files, store_dir):
+    _query_fixture(log_files)
+    page, total = study_store.query_records(
+        log_files, store_dir, subject="수학", concentration=(3, 5)
+    )
+    assert (page["기록 ID"].tolist(), total) == ([4], 1)
+    page, total = study_store.query_records(
+        log_files, store_dir, start="2026-01-01", end="2026-02-28"
+    )
+    assert (page["기록 ID"].tolist(), total) == ([2, 1], 2)
+
+
+def test_query_records_reads_only_page_rows(log_files, store_dir, monkeypatch):
+    _query_fixture(log_files)
+    study_store.sync_csv(log_files, store_dir)
+    read_columns = []
+    real_read_records = study_store.read_records
+
+    def read_records(store_dir, columns=None, *args, **kwargs):
+        read_columns.append(columns)
+        return real_read_records(store_dir, columns, *args, **kwargs)
+
+    monkeypatch.setattr(study_store, "read_records", read_records)
+    study_store.query_records(log_files, store_dir)
+    assert read_columns == []
+    study_store.query_records(log_files, store_dir, subject="수학")
+    assert read_columns == [["기록 ID", "과목"]]
+
+
+def test_query_records_on_legacy_csv(log_files, store_dir):
+    with open(log_files, "w", encoding="utf-8") as f:
+        f.write(LEGACY_CSV)
+    page, total = study_store.query_records(log_files, store_dir)
+    assert total == 2
+    assert page["기록 ID"].tolist() == [2, 1]
+    assert page["과목"].tolist() == ["화학1", "수학1"]
+
+
+def test_appends_update_stored_rollups_in_place(log_files, store_dir):
+    study_records.append_csv_records(log_files, [record("2026-01-05", minutes=30.0)])
+    study_store.read_rollups(log_files, store_dir)
+    study_records.append_csv_records(log_files, [record("2026-01-05", minutes=20.0)])
+    study_store.sync_csv(log_files, store_dir)
+    manifest = study_store._read_manifest(store_dir)
+    assert manifest["max_id"] == 2
+    assert manifest["rollups"]["subjects"]["수학1"][:2] == [2, 50.0]
+
+
+def _peak_bytes(func):
+    tracemalloc.start()
+    try:
+        result = func()
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_cold_read_rollups_reads_the_log_in_chunks(log_files, store_dir, monkeypatch):
+    # 작은 기록에서는 인터프리터 안의 표가 한 번 커지는 것(수 MB)만으로도 비율이
+    # 흔들리므로, 그보다 충분히 큰 기록으로 잽니다.
+    rows = 200_000
+    write_synthetic_log(log_files, rows)
+    _, whole = _peak_bytes(lambda: pd.read_csv(log_files, encoding="utf-8-sig"))
+    monkeypatch.setattr(study_store, "STREAM_CHUNK_ROWS", 5_000)
+    rollups, peak = _peak_bytes(lambda: study_store.read_rollups(log_files, store_dir))
+    assert sum(values[0] for values in rollups["subjects"].values()) == rows
+    assert peak < whole / 2
+
+
+def test_chunked_sync_and_compaction_keep_records(log_files, store_dir, monkeypatch):
+    monkeypatch.setattr(study_store, "STREAM_CHUNK_ROWS", 3)
+    days = ["2026-01-05", "2026-02-05", "2026-01-06", "2026-03-01"] * 3
+    study_records.append_csv_records(log_files, [record(day) for day in days[:7]])
+    study_store.sync_csv(log_files, store_dir)
+    study_records.append_csv_records(log_files, [record(day) for day in days[7:]])
+    study_store.delete_records(log_files, [2, 12])
+    study_store.compact_csv(log_files, store_dir)
+
+    manifest = study_store._read_manifest(store_dir)
+    assert study_store._extra_segments(manifest) == 0
+    df = study_store.load_records(log_files, store_dir)
+    assert df["기록 ID"].tolist() == [1, 3, 4, 5, 6, 7, 8, 9, 10, 11]
+    assert pd.read_csv(log_files)["기록 ID"].tolist() == df["기록 ID"].tolist()
+    assert study_store.read_rollups(log_files, store_dir)["subjects"]["수학1"][:2] == [
+        10,
+        300.0,
+    ]
+    assert study_records.next_record_id(log_files) == 13
+
+
+def test_append_delete_compact_round_trip(log_files, store_dir):
+    ids = study_records.append_csv_records(
+        log_files,
+        [
+            record("2026-01-05", "수학1", 30.0, "수열"),
+            record("2026-01-06", "화학1", 40.0, "몰"),
+            record("2026-02-01", "수학1", 50.0, "극한"),
+        ],
+    )
+    assert ids == [1, 2, 3]
+    study_store.delete_records(log_files, [3])
+    assert study_store.lookup_record(log_files, 3) is None
+    assert study_store.lookup_record(log_files, 2)["공부 내용"] == "몰"
+    assert study_store.load_records(log_files, store_dir)["기록 ID"].tolist() == [1, 2]
+
+    study_store.compact_csv(log_files, store_dir)
+    assert study_records.read_tombstones(log_files) == {3}
+    df = study_store.load_records(log_files, store_dir)
+    assert df["공부 시간(분)"].tolist() == [30.0, 40.0]
+    assert study_store.lookup_record(log_files, 1)["과목"] == "수학1"
+    # 지운 ID 는 압축한 뒤에도 다시 쓰지 않습니다.
+    assert study_records.append_csv_records(log_files, [record("2026-02-02")]) == [4]
+    assert study_store.load_records(log_files, store_dir)["기록 ID"].tolist() == [
+        1,
+        2,
+        4,
+    ]
+
+
+def test_store_is_rebuilt_from_the_csv(log_files, store_dir):
+    import shutil
+
+    study_records.append_csv_records(
+        log_files,
+        [record("2026-01-05", "수학1", 30.0, "수열"), record("2026-02-06", "화학1")],
+    )
+    study_store.delete_records(log_files, [1])
+    before = study_store.load_records(log_files, store_dir)
+    rollups = study_store.read_rollups(log_files, store_dir)
+    # 저장소는 CSV 에서 다시 만들 수 있으므로 지워도 같은 기록과 통계를 읽습니다.
+    shutil.rmtree(store_dir)
+    study_store._MEMO.clear()
+    assert study_store.load_records(log_files, store_dir).equals(before)
+    assert study_store.read_rollups(log_files, store_dir) == rollups
+
+
+def test_rollups_subtract_tombstones_like_a_recount(log_files, store_dir):
+    study_records.append_csv_records(
+        log_files,
+        [
+            record("2026-01-05", "수학1", 30.0, concentration=2),
+            record("2026-01-05", "수학1", 20.0, concentration=5),
+            record("2026-01-06", "화학1", 40.0, concentration=3),
+        ],
+    )
+    study_store.read_rollups(log_files, store_dir)
+    study_store.delete_records(log_files, [2, 3])
+    rollups = study_store.read_rollups(log_files, store_dir)
+    recount = study_store.stream_rollups(log_files)
+    assert rollups["subjects"] == recount["subjects"] == {"수학1": [1, 30.0, 2, 60.0]}
+    assert rollups["days"] == recount["days"]
+    assert rollups["days"]["2026-01-05"][3:] == [0, 1, 0, 0, 0]
+    assert "2026-01-06" not in rollups["days"]
+
+
+def test_segments_in_range_prunes_month_partitions():
+    manifest = {
+        "segments": [
+            {"file": "a", "partition": "2025-12"},
+            {"file": "b", "partition": "2026-01"},
+            {"file": "c", "partition": "2026-02"},
+            {"file": "d"},
+        ]
+    }
+
+    def files(start, end):
+        segments = study_store._segments_in_range(manifest, start, end)
+        return [segment["file"] for segment in segments]
+
+    assert files(None, None) == ["a", "b", "c", "d"]
+    # 월 중간 날짜라도 그 달 파티션을 고르고, 파티션이 없는 예전 세그먼트는 늘 읽습니다.
+    assert files("2026-01-20", None) == ["b", "c", "d"]
+    assert files(None, "2026-01-01") == ["a", "b", "d"]
+    assert files("2026-01-31", "2026-01-31") == ["b", "d"]
+
+
+def test_ranged_read_opens_only_overlapping_partitions(
+    log_files, store_dir, monkeypatch
+):
+    study_records.append_csv_records(
+        log_files,
+        [
+            record("2025-12-31"),
+            record("2026-01-05"),
+            record("2026-02-05"),
+            record("2026-01-31"),
+        ],
+    )
+    study_store.sync_csv(log_files, store_dir)
+    opened = []
+    real_read_segment = study_store._read_segment
+
+    def read_segment(store_dir, manifest, segment, columns):
+        opened.append(segment["partition"])
+        return real_read_segment(store_dir, manifest, segment, columns)
+
+    monkeypatch.setattr(study_store, "_read_segment", read_segment)
+    df = study_store.read_records(store_dir, start="2026-01-01", end="2026-01-31")
+    assert opened == ["2026-01"]
+    assert df["기록 ID"].tolist() == [2, 4]